@@ -1,8 +1,9 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from app.config.settings import Config
-from app.config.database import get_database
+from app.config.database import get_database, get_pool_stats
 import os
+import threading
 
 def create_app():
     app = Flask(__name__)
@@ -48,6 +49,28 @@ def create_app():
     except ImportError as e:
         print(f"Warning: Some API routes not found: {e}")
     
+    # Start background workers with the first request, so they run in the
+    # serving process (not the reloader parent or a pre-fork master)
+    background_started = threading.Event()
+    
+    @app.before_request
+    def start_background_workers():
+        if background_started.is_set():
+            return
+        background_started.set()
+        
+        try:
+            from app.services.weather_prewarmer import start_weather_prewarmer
+            start_weather_prewarmer()
+        except Exception as e:
+            print(f"Warning: Weather prewarmer not started: {e}")
+        
+        try:
+            from app.services.suggestion_answers import start_suggestion_answers
+            start_suggestion_answers()
+        except Exception as e:
+            print(f"Warning: Suggestion answer refresher not started: {e}")
+    
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
     def health_check():
@@ -61,9 +84,20 @@ def create_app():
         return jsonify({
             'success': True,
             'status': 'healthy',
-            'database': db_status
+            'database': db_status,
+            'pool': get_pool_stats()
         }), 200
     
+    # Metrics endpoint
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        from app.utils.metrics import metrics
+
+        return jsonify({
+            'success': True,
+            'metrics': metrics.snapshot()
+        }), 200
+
     # Root endpoint
     @app.route('/', methods=['GET'])
     def root():
@@ -78,7 +112,8 @@ def create_app():
                 'itinerary': '/api/itinerary',
                 'emergency': '/api/emergency',
                 'activity': '/api/activity',
-                'health': '/api/health'
+                'health': '/api/health',
+                'metrics': '/api/metrics'
             }
         }), 200
     
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from app.config.database import get_database
 from app.models.activity import Activity
 from app.utils.auth import require_auth
+from app.utils.pagination import InvalidCursorError, encode_cursor
 
 activity_bp = Blueprint('activity', __name__, url_prefix='/api/activity')
 
@@ -98,14 +99,18 @@ def get_activity_history(current_user):
     Query Parameters:
         limit: Number of activities (default: 50, max: 100)
         skip: Number of activities to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces skip)
         service_type: Filter by service type (optional)
         days: Number of days to look back (optional)
+        full: Include request_data/response_data when "true" (default: false)
     """
     try:
         limit = min(int(request.args.get('limit', 50)), 100)
         skip = int(request.args.get('skip', 0))
+        cursor = request.args.get('cursor')
         service_type = request.args.get('service_type')
         days = request.args.get('days')
+        full = request.args.get('full', 'false').lower() == 'true'
         
         start_date = None
         end_date = None
@@ -121,15 +126,22 @@ def get_activity_history(current_user):
         db = get_database()
         activity_model = Activity(db)
         
+        # Fetch one extra row to know whether another page exists
         activities = activity_model.get_user_activities(
             user_id=current_user['user_id'],
-            limit=limit,
+            limit=limit + 1,
             skip=skip,
             service_type=service_type,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            cursor=cursor,
+            projection=None if full else Activity.LIST_PROJECTION
         )
         
+        has_more = len(activities) > limit
+        activities = activities[:limit]
+        next_cursor = encode_cursor(activities[-1]) if has_more else None
+        
         # Convert ObjectIds to strings
         for activity in activities:
             activity['_id'] = str(activity['_id'])
@@ -140,7 +152,9 @@ def get_activity_history(current_user):
                 'activities': activities,
                 'count': len(activities),
                 'limit': limit,
-                'skip': skip,
+                'skip': 0 if cursor else skip,
+                'next_cursor': next_cursor,
+                'has_more': has_more,
                 'filters': {
                     'service_type': service_type,
                     'days': days
@@ -148,6 +162,11 @@ def get_activity_history(current_user):
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1,15 +1,106 @@
 """Chat API endpoints"""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+from app.config.settings import Config
 from app.services.gemini_service import get_gemini_service
+from app.services.session_context import get_session_context
+from app.services.suggestion_answers import CHAT_SUGGESTIONS, get_suggestion_answers
 from app.services.translation_service import get_translation_service
 from app.utils.validators import validate_language, sanitize_input
 from app.utils.logger import logger
 from app.utils.activity_helper import log_chat_interaction
 from app.utils.auth import get_current_user_id
+from app.utils.concurrency import OverloadedError
+from app.utils.metrics import metrics
+from app.utils.sse import sse_event
 import time
 
 chat_bp = Blueprint('chat_ai', __name__)
 
+
+def _parse_chat_request(data):
+    """
+    Validate a chat request body
+    
+    Returns:
+        (message, language, conversation_history, session_id, error_response)
+    """
+    if not data:
+        return None, None, None, None, (jsonify({
+            'success': False,
+            'message': 'Request body is required'
+        }), 400)
+    
+    message = data.get('message', '').strip()
+    if not message:
+        return None, None, None, None, (jsonify({
+            'success': False,
+            'message': 'Message is required'
+        }), 400)
+    
+    # Sanitize input
+    message = sanitize_input(message, max_length=1000)
+    
+    # Validate and get language
+    language = data.get('language', 'english').lower()
+    if not validate_language(language):
+        language = 'english'
+    
+    # Get conversation history
+    conversation_history = data.get('conversation_history', [])
+    
+    # Optional; lets older turns be summarised per conversation
+    session_id = data.get('session_id') or None
+    
+    return message, language, conversation_history, session_id, None
+
+
+def _precomputed_answer(message, language, conversation_history):
+    """Get the background-computed answer for a first message that is a suggestion chip"""
+    if conversation_history:
+        return None
+    suggestion_answers = get_suggestion_answers()
+    if suggestion_answers is None:
+        return None
+    return suggestion_answers.lookup(message, language)
+
+
+def _start_session_turn(user_id, session_id, message, language, conversation_history):
+    """
+    Use server-side context when an authenticated client sends a session_id without history
+    
+    Returns:
+        (conversation_history, user_message_id, stored); user_message_id is None
+        when the request is not in session mode or the store is unavailable, and
+        stored is True when this turn saved the user message
+    """
+    if not (user_id and session_id) or conversation_history:
+        return conversation_history, None, False
+    try:
+        return get_session_context().start_turn(user_id, session_id, message, {'language': language})
+    except Exception as e:
+        logger.warning(f"Session context unavailable, continuing without history: {str(e)}")
+        return [], None, False
+
+
+def _discard_session_turn(user_id, session_id, user_message_id, stored):
+    """Remove the user message of a session-mode turn that got no reply"""
+    if not (user_message_id and stored):
+        return
+    try:
+        get_session_context().discard_turn(user_id, session_id, user_message_id)
+    except Exception as e:
+        logger.warning(f"Failed to discard unanswered message: {str(e)}")
+
+
+def _save_session_reply(user_id, session_id, reply, metadata):
+    """Persist the assistant reply of a session-mode turn; returns its id or None"""
+    try:
+        message = get_session_context().append(user_id, session_id, 'assistant', reply, metadata)
+        return str(message['_id'])
+    except Exception as e:
+        logger.warning(f"Failed to save assistant reply: {str(e)}")
+        return None
+
 @chat_bp.route('/message', methods=['POST'])
 def send_message():
     """
@@ -19,35 +110,19 @@ def send_message():
     {
         "message": "string",
         "language": "english|hindi|garhwali|kumaoni",
-        "conversation_history": [{"role": "user|assistant", "content": "string"}]
+        "conversation_history": [{"role": "user|assistant", "content": "string"}],
+        "session_id": "string (optional)"
     }
+    
+    Authenticated clients may send session_id and omit conversation_history:
+    context is then assembled from stored messages, and both the message and
+    the reply are saved (their ids are returned in message_ids).
     """
+    current_user_id = session_id = user_message_id = stored = None
     try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'Request body is required'
-            }), 400
-        
-        message = data.get('message', '').strip()
-        if not message:
-            return jsonify({
-                'success': False,
-                'message': 'Message is required'
-            }), 400
-        
-        # Sanitize input
-        message = sanitize_input(message, max_length=1000)
-        
-        # Validate and get language
-        language = data.get('language', 'english').lower()
-        if not validate_language(language):
-            language = 'english'
-        
-        # Get conversation history
-        conversation_history = data.get('conversation_history', [])
+        message, language, conversation_history, session_id, error = _parse_chat_request(request.get_json())
+        if error:
+            return error
         
         # Get Gemini service
         try:
@@ -61,18 +136,31 @@ def send_message():
         # Track start time
         start_time = time.time()
         
-        # Get AI response
-        response = gemini_service.chat_with_context(
-            message=message,
-            language=language,
-            conversation_history=conversation_history
+        current_user_id = get_current_user_id()
+        conversation_history, user_message_id, stored = _start_session_turn(
+            current_user_id, session_id, message, language, conversation_history
         )
         
+        # Suggestion chips are answered ahead of time; everything else goes to Gemini
+        response = _precomputed_answer(message, language, conversation_history)
+        if response is not None:
+            response['success'] = True
+            response['cached'] = True
+            language = response['language']
+        else:
+            response = gemini_service.chat_with_context(
+                message=message,
+                language=language,
+                conversation_history=conversation_history,
+                user_id=current_user_id,
+                session_id=session_id
+            )
+        
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
         
         # Log activity
-        user_id = get_current_user_id() or 'anonymous'
+        user_id = current_user_id or 'anonymous'
         try:
             log_chat_interaction(
                 user_id=user_id,
@@ -84,12 +172,33 @@ def send_message():
         except Exception as log_error:
             logger.warning(f"Failed to log activity: {str(log_error)}")
         
-        if response.get('success'):
+        if not response.get('success'):
+            # Keep the unanswered message out of the session's history
+            _discard_session_turn(current_user_id, session_id, user_message_id, stored)
+        
+        if response.get('overloaded'):
             return jsonify({
+                'success': False,
+                'message': response['message']
+            }), 503, {'Retry-After': str(response['retry_after'])}
+        
+        if response.get('success'):
+            result = {
                 'success': True,
                 'response': response.get('message', ''),
-                'language': language
-            }), 200
+                'language': language,
+                'cached': response.get('cached', False)
+            }
+            if user_message_id:
+                result['session_id'] = session_id
+                result['message_ids'] = {
+                    'user': user_message_id,
+                    'assistant': _save_session_reply(current_user_id, session_id, result['response'], {
+                        'language': language,
+                        'response_time': round(duration_ms / 1000, 2)
+                    })
+                }
+            return jsonify(result), 200
         else:
             return jsonify({
                 'success': False,
@@ -98,11 +207,144 @@ def send_message():
             
     except Exception as e:
         logger.error(f"Error in send_message: {str(e)}")
+        _discard_session_turn(current_user_id, session_id, user_message_id, stored)
         return jsonify({
             'success': False,
             'message': 'Internal server error'
         }), 500
 
+@chat_bp.route('/message/stream', methods=['POST'])
+def stream_message():
+    """
+    Send a chat message and stream the reply as server-sent events
+    
+    Request body: same as /message
+    
+    Events:
+        meta:  {"language": "..."} once, before any text
+               (plus "session_id" and "user_message_id" in session mode)
+        (default): {"delta": "..."} for each chunk of the reply
+        done:  {"response_length", "ttft_ms", "duration_ms"} on completion
+               (plus "assistant_message_id" in session mode)
+        error: {"message": "..."} if generation fails mid-stream
+    """
+    current_user_id = session_id = user_message_id = stored = None
+    try:
+        message, language, conversation_history, session_id, error = _parse_chat_request(request.get_json())
+        if error:
+            return error
+        
+        try:
+            gemini_service = get_gemini_service()
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'AI service is not configured. Please check GEMINI_API_KEY.'
+            }), 500
+        
+        # Resolve the user now; the request context is gone once streaming starts
+        current_user_id = get_current_user_id()
+        user_id = current_user_id or 'anonymous'
+        start_time = time.time()
+        conversation_history, user_message_id, stored = _start_session_turn(
+            current_user_id, session_id, message, language, conversation_history
+        )
+        precomputed = _precomputed_answer(message, language, conversation_history)
+        if precomputed is not None:
+            # Sent as a single delta; a generator so it can be closed like a live stream
+            chunks = (text for text in [precomputed['message']])
+            language = precomputed['language']
+        else:
+            chunks, language = gemini_service.stream_chat_with_context(
+                message=message,
+                language=language,
+                conversation_history=conversation_history,
+                user_id=current_user_id,
+                session_id=session_id
+            )
+    except OverloadedError as e:
+        logger.warning(f"Chat stream rejected: {str(e)}")
+        _discard_session_turn(current_user_id, session_id, user_message_id, stored)
+        return jsonify({
+            'success': False,
+            'message': 'The AI service is busy right now. Please try again in a moment.'
+        }), 503, {'Retry-After': str(e.retry_after)}
+    except Exception as e:
+        logger.error(f"Error in stream_message: {str(e)}")
+        _discard_session_turn(current_user_id, session_id, user_message_id, stored)
+        return jsonify({
+            'success': False,
+            'message': 'Internal server error'
+        }), 500
+    
+    def generate():
+        parts = []
+        ttft_ms = None
+        completed = False
+        try:
+            meta = {'language': language}
+            if user_message_id:
+                meta.update({'session_id': session_id, 'user_message_id': user_message_id})
+            yield sse_event(meta, event='meta')
+            
+            # Each chunk is pulled from Gemini only after the previous one was
+            # written, and a client disconnect closes this generator (and with
+            # it the upstream stream) at the next yield
+            for text in chunks:
+                if ttft_ms is None:
+                    ttft_ms = (time.time() - start_time) * 1000
+                    metrics.record_timing('chat.stream.ttft', ttft_ms)
+                parts.append(text)
+                yield sse_event({'delta': text})
+            
+            completed = True
+            done = {
+                'response_length': sum(len(part) for part in parts),
+                'ttft_ms': round(ttft_ms or 0, 1),
+                'duration_ms': round((time.time() - start_time) * 1000, 1)
+            }
+            if user_message_id:
+                done['assistant_message_id'] = _save_session_reply(current_user_id, session_id, ''.join(parts), {
+                    'language': language,
+                    'response_time': round(done['duration_ms'] / 1000, 2)
+                })
+            yield sse_event(done, event='done')
+        except GeneratorExit:
+            metrics.increment('chat.stream.cancelled')
+            raise
+        except Exception as e:
+            logger.error(f"Error while streaming chat response: {str(e)}")
+            metrics.increment('chat.stream.failed')
+            yield sse_event({'message': 'Sorry, I encountered an error. Please try again.'}, event='error')
+        finally:
+            chunks.close()
+            duration_ms = (time.time() - start_time) * 1000
+            if completed:
+                metrics.increment('chat.stream.completed')
+                metrics.record_timing('chat.stream.duration', duration_ms)
+            else:
+                # Failed or cancelled before a reply was saved
+                _discard_session_turn(current_user_id, session_id, user_message_id, stored)
+            try:
+                log_chat_interaction(
+                    user_id=user_id,
+                    query=message,
+                    response=''.join(parts),
+                    language=language,
+                    duration_ms=duration_ms
+                )
+            except Exception as log_error:
+                logger.warning(f"Failed to log activity: {str(log_error)}")
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Stop reverse proxies (nginx) from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
+    # Frees the chat slot even if the client leaves before generate() starts
+    response.call_on_close(chunks.close)
+    return response
+
 @chat_bp.route('/translate', methods=['POST'])
 def translate():
     """
@@ -150,6 +392,9 @@ def translate():
             target_language=target_language
         )
         
+        if result.get('overloaded'):
+            return jsonify(result), 503, {'Retry-After': str(result['retry_after'])}
+        
         return jsonify(result), 200 if result.get('success') else 500
         
     except Exception as e:
@@ -159,6 +404,71 @@ def translate():
             'message': 'Translation failed'
         }), 500
 
+@chat_bp.route('/translate/batch', methods=['POST'])
+def translate_batch():
+    """
+    Translate many strings in one request
+    
+    Request body:
+    {
+        "texts": ["string", ...],
+        "source_language": "english|hindi|garhwali|kumaoni",
+        "target_language": "english|hindi|garhwali|kumaoni"
+    }
+    
+    Response: translations in input order; indices listed in "failed" keep
+    their original text.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'Request body is required'
+            }), 400
+        
+        texts = data.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({
+                'success': False,
+                'message': 'texts must be a list of strings'
+            }), 400
+        
+        if len(texts) > Config.TRANSLATION_BATCH_MAX_TEXTS:
+            return jsonify({
+                'success': False,
+                'message': f'At most {Config.TRANSLATION_BATCH_MAX_TEXTS} texts per request'
+            }), 400
+        
+        source_language = data.get('source_language', 'english').lower()
+        target_language = data.get('target_language', 'hindi').lower()
+        
+        # Validate languages
+        if not validate_language(source_language):
+            source_language = 'english'
+        if not validate_language(target_language):
+            target_language = 'hindi'
+        
+        translation_service = get_translation_service()
+        result = translation_service.translate_batch(
+            texts=texts,
+            source_language=source_language,
+            target_language=target_language
+        )
+        
+        if result.get('overloaded'):
+            return jsonify(result), 503, {'Retry-After': str(result['retry_after'])}
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        logger.error(f"Error in translate_batch: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Translation failed'
+        }), 500
+
 @chat_bp.route('/suggestions', methods=['GET'])
 def get_suggestions():
     """
@@ -172,48 +482,9 @@ def get_suggestions():
         if not validate_language(language):
             language = 'english'
         
-        suggestions = {
-            'english': [
-                "Best places to visit in Uttarakhand",
-                "Adventure activities",
-                "Best time to visit",
-                "Local food recommendations",
-                "Trekking routes",
-                "Temple information",
-                "Weather conditions"
-            ],
-            'hindi': [
-                "उत्तराखंड में घूमने की जगहें",
-                "रोमांचक गतिविधियाँ",
-                "सबसे अच्छा समय",
-                "स्थानीय भोजन",
-                "ट्रेकिंग रूट",
-                "मंदिर जानकारी",
-                "मौसम की स्थिति"
-            ],
-            'garhwali': [
-                "उत्तराखंड मा घूमण कि जगह",
-                "रोमांचक गतिविधि",
-                "सबसे अच्छा समय",
-                "स्थानीय खाना",
-                "ट्रेकिंग रूट",
-                "मंदिर जानकारी",
-                "मौसम"
-            ],
-            'kumaoni': [
-                "उत्तराखंड मा घूमण कि जगह",
-                "रोमांचक गतिविधि",
-                "सबसे अच्छा समय",
-                "स्थानीय खाना",
-                "ट्रेकिंग रूट",
-                "मंदिर जानकारी",
-                "मौसम"
-            ]
-        }
-        
         return jsonify({
             'success': True,
-            'suggestions': suggestions.get(language, suggestions['english']),
+            'suggestions': CHAT_SUGGESTIONS.get(language, CHAT_SUGGESTIONS['english']),
             'language': language
         }), 200
         
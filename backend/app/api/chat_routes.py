@@ -9,6 +9,7 @@ from app.config.database import get_database
 from app.models.chat import Chat
 from app.models.user import User
 from app.utils.auth import require_auth
+from app.utils.pagination import InvalidCursorError, encode_cursor
 
 chat_bp = Blueprint('chat_history', __name__, url_prefix='/api/history')
 
@@ -96,23 +97,32 @@ def get_history(current_user):
     Query Parameters:
         limit: Number of messages (default: 50, max: 100)
         skip: Number of messages to skip (default: 0)
+        cursor: next_cursor from the previous page (optional, replaces skip)
         session_id: Filter by session ID (optional)
     """
     try:
         limit = min(int(request.args.get('limit', 50)), 100)
         skip = int(request.args.get('skip', 0))
+        cursor = request.args.get('cursor')
         session_id = request.args.get('session_id')
         
         db = get_database()
         chat_model = Chat(db)
         
+        # Fetch one extra row to know whether another page exists
         chats = chat_model.get_user_chats(
             user_id=current_user['user_id'],
-            limit=limit,
+            limit=limit + 1,
             skip=skip,
-            session_id=session_id
+            session_id=session_id,
+            cursor=cursor,
+            projection=Chat.LIST_PROJECTION
         )
         
+        has_more = len(chats) > limit
+        chats = chats[:limit]
+        next_cursor = encode_cursor(chats[-1]) if has_more else None
+        
         # Convert ObjectIds to strings
         for chat in chats:
             chat['_id'] = str(chat['_id'])
@@ -123,10 +133,17 @@ def get_history(current_user):
                 'chats': chats,
                 'count': len(chats),
                 'limit': limit,
-                'skip': skip
+                'skip': 0 if cursor else skip,
+                'next_cursor': next_cursor,
+                'has_more': has_more
             }
         }), 200
         
+    except InvalidCursorError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
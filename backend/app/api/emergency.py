@@ -1,85 +1,72 @@
 """Emergency API endpoints"""
-from flask import Blueprint, request, jsonify
-from app.services.gemini_service import get_gemini_service
+import time
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request, jsonify
+from app.config.settings import Config
+from app.models.alert import Alert
+from app.services.alert_hub import get_alert_hub
+from app.services.alert_service import get_alert_service
+from app.services.contact_directory import get_contact_directory
+from app.services.emergency_advisor import get_emergency_advisor
+from app.services.place_matcher import get_place_matcher
 from app.services.weather_service import get_weather_service
 from app.utils.validators import validate_language
 from app.utils.logger import logger
 from app.utils.activity_helper import get_activity_logger
-from app.utils.auth import get_current_user_id
+from app.utils.auth import get_current_user_id, require_auth
+from app.utils.concurrency import OverloadedError
+from app.utils.geo import valid_coordinates
+from app.utils.sse import sse_comment, sse_event, sse_retry
 
 emergency_bp = Blueprint('emergency', __name__)
 
-# Emergency contacts data
-EMERGENCY_CONTACTS = {
-    'police': {
-        'name': 'Police',
-        'number': '100',
-        'description': 'Emergency police assistance'
-    },
-    'ambulance': {
-        'name': 'Ambulance',
-        'number': '108',
-        'description': 'Medical emergency'
-    },
-    'fire': {
-        'name': 'Fire Department',
-        'number': '101',
-        'description': 'Fire emergency'
-    },
-    'disaster': {
-        'name': 'Disaster Management',
-        'number': '1070',
-        'description': 'Natural disaster assistance'
-    },
-    'women_helpline': {
-        'name': 'Women Helpline',
-        'number': '1091',
-        'description': 'Women safety and support'
-    },
-    'child_helpline': {
-        'name': 'Child Helpline',
-        'number': '1098',
-        'description': 'Child protection services'
-    },
-    'tourist_helpline': {
-        'name': 'Tourist Helpline',
-        'number': '1363',
-        'description': 'Tourism assistance and information'
-    },
-    'dehradun_police': {
-        'name': 'Dehradun Police Control',
-        'number': '0135-2656666',
-        'description': 'Dehradun district police'
-    },
-    'nainital_police': {
-        'name': 'Nainital Police Control',
-        'number': '05942-231100',
-        'description': 'Nainital district police'
-    },
-    'haridwar_police': {
-        'name': 'Haridwar Police Control',
-        'number': '01334-223344',
-        'description': 'Haridwar district police'
-    }
-}
-
 @emergency_bp.route('/contacts', methods=['GET'])
 def get_contacts():
     """
     Get emergency contact numbers
     
+    Statewide numbers are always included. With a position, the k nearest
+    police stations, hospitals, SDRF posts and helipads are added with
+    their distance; with only a district, that district's contacts.
+    
     Query params:
-    - category: optional filter (police, ambulance, fire, etc.)
+    - category: optional filter (police, ambulance, fire, disaster, helpline, helipad, other)
+    - lat, lon: optional, position to find the nearest contacts to
+    - location: optional, place name (used when lat/lon are not given)
+    - district: optional, district name
+    - k: optional, number of nearest contacts (1-20, default 5)
     """
     try:
         category = request.args.get('category', '').lower()
+        district = request.args.get('district', '').strip()
+        location = request.args.get('location', '').strip()
+        lat = request.args.get('lat', type=float)
+        lon = request.args.get('lon', type=float)
+        k = request.args.get('k', default=Config.EMERGENCY_CONTACTS_NEAREST_K, type=int)
         
-        if category:
-            # Filter by category
-            filtered = {k: v for k, v in EMERGENCY_CONTACTS.items() if category in k.lower()}
-            contacts = list(filtered.values())
-        else:
-            contacts = list(EMERGENCY_CONTACTS.values())
+        if (lat is None) != (lon is None) or (lat is not None and not valid_coordinates(lat, lon)):
+            return jsonify({
+                'success': False,
+                'message': 'lat and lon must be given together and be valid coordinates'
+            }), 400
+        if not 1 <= k <= 20:
+            return jsonify({
+                'success': False,
+                'message': 'k must be between 1 and 20'
+            }), 400
+        
+        if lat is None and location:
+            coordinates = get_place_matcher().get_coordinates(location)
+            if coordinates:
+                lat, lon = coordinates
+        
+        contacts = get_contact_directory().lookup(
+            category=category or None,
+            district=district or None,
+            lat=lat,
+            lon=lon,
+            k=k
+        )
         
         # Log activity
         user_id = get_current_user_id() or 'anonymous'
@@ -93,7 +80,7 @@ def get_contacts():
                     'description': f'Viewed emergency contacts',
                     'category': category or 'all'
                 },
-                request_data={'category': category},
+                request_data={'category': category, 'district': district, 'location': location, 'lat': lat, 'lon': lon},
                 response_data={'success': True, 'count': len(contacts)}
             )
         except Exception as log_error:
@@ -115,7 +102,11 @@ def get_contacts():
 @emergency_bp.route('/advice', methods=['POST'])
 def get_advice():
     """
-    Get emergency advice using AI
+    Get emergency advice
+    
+    Advice comes from the offline knowledge base and is returned at once.
+    Situations it does not recognise also get an 'enrichment' id; the AI
+    answer can be fetched from /advice/enriched/<id> once it is ready.
     
     Request body:
     {
@@ -145,17 +136,8 @@ def get_advice():
         if not validate_language(language):
             language = 'english'
         
-        # Get Gemini service
-        try:
-            gemini_service = get_gemini_service()
-        except ValueError as e:
-            return jsonify({
-                'success': False,
-                'message': 'AI service is not configured. Please check GEMINI_API_KEY.'
-            }), 500
-        
-        # Get advice
-        result = gemini_service.get_emergency_advice(
+        # Local advice never waits on the AI service
+        result = get_emergency_advisor().advise(
             situation=situation,
             location=location,
             language=language
@@ -180,24 +162,16 @@ def get_advice():
                 },
                 response_data={
                     'success': result.get('success', False),
-                    'advice_length': len(result.get('advice', ''))
+                    'advice_length': len(result.get('advice', '')),
+                    'situation_type': result['situation_type'],
+                    'matched': result['matched']
                 },
                 metadata={'language': language}
             )
         except Exception as log_error:
             logger.warning(f"Failed to log activity: {str(log_error)}")
         
-        if result.get('success'):
-            return jsonify({
-                'success': True,
-                'advice': result.get('advice', ''),
-                'language': language
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'message': result.get('message', 'Failed to get advice')
-            }), 500
+        return jsonify(result), 200
             
     except Exception as e:
         logger.error(f"Error in get_advice: {str(e)}")
@@ -206,6 +180,24 @@ def get_advice():
             'message': 'Internal server error'
         }), 500
 
+@emergency_bp.route('/advice/enriched/<enrichment_id>', methods=['GET'])
+def get_enriched_advice(enrichment_id):
+    """
+    Get the AI-enriched advice for a situation the knowledge base did not match
+    
+    Status is 'ready' (with advice), 'pending', or 'unavailable'.
+    """
+    try:
+        result = get_emergency_advisor().get_enrichment(enrichment_id)
+        return jsonify({'success': True, **result}), 200
+        
+    except Exception as e:
+        logger.error(f"Error in get_enriched_advice: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Internal server error'
+        }), 500
+
 @emergency_bp.route('/weather', methods=['GET'])
 def get_weather():
     """
@@ -259,70 +251,52 @@ def get_weather():
             'message': 'Internal server error'
         }), 500
 
+def _parse_alert_query():
+    """
+    Read the region filter shared by the alert endpoints
+    
+    Returns:
+        (location, lat, lon, radius_km, error_response)
+    """
+    location = request.args.get('location', '').strip()
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    radius_km = request.args.get('radius_km', type=float)
+    
+    if (lat is None) != (lon is None) or (lat is not None and not valid_coordinates(lat, lon)):
+        return None, None, None, None, (jsonify({
+            'success': False,
+            'message': 'lat and lon must be given together and be valid coordinates'
+        }), 400)
+    if radius_km is not None and not 0 <= radius_km <= Alert.MAX_RADIUS_KM:
+        return None, None, None, None, (jsonify({
+            'success': False,
+            'message': f'radius_km must be between 0 and {Alert.MAX_RADIUS_KM:g}'
+        }), 400)
+    return location, lat, lon, radius_km, None
+
 @emergency_bp.route('/alerts', methods=['GET'])
 def get_alerts():
     """
     Get active travel alerts and warnings
     
     Query params:
-    - location: optional, filter by location
+    - lat, lon: optional, only alerts affecting this point
+    - location: optional, place name (used when lat/lon are not given)
+    - radius_km: optional, also include alerts this close to the point
     """
     try:
-        location = request.args.get('location', '').strip()
-        
-        # In a real application, this would fetch from a database or external API
-        # For now, return sample alerts
-        alerts = [
-            {
-                'id': 1,
-                'type': 'weather',
-                'severity': 'high',
-                'title': 'Heavy Snowfall Alert',
-                'message': 'Heavy snowfall expected in higher altitude areas including Kedarnath, Badrinath, and Gangotri. Roads may be blocked. Carry warm clothing and emergency supplies.',
-                'location': 'Char Dham Region',
-                'valid_until': '2025-12-15'
-            },
-            {
-                'id': 2,
-                'type': 'road',
-                'severity': 'high',
-                'title': 'Road Closure - Landslide',
-                'message': 'NH-58 closed between Rishikesh and Devprayag due to landslide. Use alternate route via Chamba. Expected clearance in 48 hours.',
-                'location': 'Rishikesh-Devprayag',
-                'valid_until': '2025-11-25'
-            },
-            {
-                'id': 3,
-                'type': 'weather',
-                'severity': 'moderate',
-                'title': 'Dense Fog Warning',
-                'message': 'Dense fog expected in valley areas during early morning hours. Drive carefully and use fog lights. Visibility may drop below 50 meters.',
-                'location': 'Dehradun Valley',
-                'valid_until': '2025-12-31'
-            },
-            {
-                'id': 4,
-                'type': 'safety',
-                'severity': 'moderate',
-                'title': 'Wildlife Activity Alert',
-                'message': 'Increased wildlife movement reported in Jim Corbett National Park buffer zones. Avoid night travel and maintain safe distance from animals.',
-                'location': 'Jim Corbett Area',
-                'valid_until': '2025-12-01'
-            },
-            {
-                'id': 5,
-                'type': 'event',
-                'severity': 'low',
-                'title': 'Festival Rush Expected',
-                'message': 'Heavy tourist influx expected during upcoming festivals. Book accommodations in advance. Traffic congestion likely in Haridwar and Rishikesh.',
-                'location': 'Haridwar-Rishikesh',
-                'valid_until': '2025-11-30'
-            }
-        ]
+        location, lat, lon, radius_km, error = _parse_alert_query()
+        if error:
+            return error
         
-        # Filter by location if provided
-        if location:
-            alerts = [a for a in alerts if location.lower() in a['location'].lower()]
+        result = get_alert_service().get_alerts(
+            lat=lat,
+            lon=lon,
+            place=location or None,
+            radius_km=radius_km
+        )
+        alerts = result['alerts']
         
         # Log activity
         user_id = get_current_user_id() or 'anonymous'
@@ -336,7 +310,7 @@ def get_alerts():
                     'description': 'Checked travel alerts',
                     'location': location or 'all'
                 },
-                request_data={'location': location},
+                request_data={'location': location, 'lat': lat, 'lon': lon},
                 response_data={'success': True, 'alerts_count': len(alerts)}
             )
         except Exception as log_error:
@@ -344,8 +318,7 @@ def get_alerts():
         
         return jsonify({
             'success': True,
-            'alerts': alerts,
-            'count': len(alerts)
+            **result
         }), 200
         
     except Exception as e:
@@ -355,3 +328,159 @@ def get_alerts():
             'message': 'Failed to get alerts'
         }), 500
 
+@emergency_bp.route('/alerts/stream', methods=['GET'])
+def stream_alerts():
+    """
+    Subscribe to travel alerts as server-sent events
+    
+    Takes the same query params as GET /alerts. Events:
+        snapshot: {"alerts": [...], "count": n} current alerts, sent first
+        alert: one alert that was published or updated in the region
+        withdrawn: {"id": "..."} an alert that was removed or expired
+    Keepalive comments are sent while idle; the server ends the stream
+    after ALERTS_STREAM_MAX_DURATION and the client reconnects.
+    """
+    location, lat, lon, radius_km, error = _parse_alert_query()
+    if error:
+        return error
+    
+    try:
+        alert_service = get_alert_service()
+        place = location or None
+        if lat is None and place:
+            coordinates = get_place_matcher().get_coordinates(place)
+            if coordinates:
+                lat, lon = coordinates
+                place = None
+        
+        hub = get_alert_hub()
+        # Subscribe before taking the snapshot so no change falls in between
+        subscription = hub.subscribe(lat=lat, lon=lon, radius_km=radius_km, place=place)
+    except OverloadedError as e:
+        return jsonify({
+            'success': False,
+            'message': 'Too many alert subscribers right now. Please try again shortly.'
+        }), 503, {'Retry-After': str(e.retry_after)}
+    except Exception as e:
+        logger.error(f"Error in stream_alerts: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to subscribe to alerts'
+        }), 500
+    
+    try:
+        initial = alert_service.get_alerts(lat=lat, lon=lon, place=place, radius_km=radius_km)
+    except Exception as e:
+        hub.unsubscribe(subscription)
+        logger.error(f"Error in stream_alerts: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to get alerts'
+        }), 500
+    
+    def generate():
+        try:
+            yield sse_retry(Config.ALERTS_STREAM_RETRY_MS)
+            yield sse_event(initial, event='snapshot')
+            deadline = time.time() + Config.ALERTS_STREAM_MAX_DURATION
+            while not subscription.closed and time.time() < deadline:
+                event = subscription.next_event(Config.ALERTS_STREAM_HEARTBEAT)
+                if event is None:
+                    yield sse_comment()
+                    continue
+                event_id, name, data = event
+                if name == 'closed':
+                    break
+                yield sse_event(data, event=name, event_id=event_id)
+        finally:
+            hub.unsubscribe(subscription)
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Stop reverse proxies (nginx) from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
+    # Frees the subscriber slot even if the client leaves before generate() starts
+    response.call_on_close(lambda: hub.unsubscribe(subscription))
+    return response
+
+def _is_alerts_admin(current_user):
+    return current_user['email'].lower() in Config.ALERTS_ADMIN_EMAILS
+
+@emergency_bp.route('/alerts', methods=['POST'])
+@require_auth
+def create_alert(current_user):
+    """
+    Publish a travel alert (alert admins only)
+    
+    Request body:
+    {
+        "type": "weather|road|safety|event",
+        "severity": "low|moderate|high",
+        "title": "string",
+        "message": "string",
+        "location": "string",
+        "lat": number,
+        "lon": number,
+        "radius_km": number,
+        "valid_until": "YYYY-MM-DD or ISO datetime (UTC)"
+    }
+    """
+    if not _is_alerts_admin(current_user):
+        return jsonify({
+            'success': False,
+            'message': 'Not allowed to publish alerts'
+        }), 403
+    
+    try:
+        data = dict(request.get_json() or {})
+        try:
+            valid_until = datetime.fromisoformat(str(data.get('valid_until', '')))
+            if valid_until.tzinfo is not None:
+                valid_until = valid_until.astimezone(timezone.utc).replace(tzinfo=None)
+            data['valid_until'] = valid_until
+        except ValueError:
+            data['valid_until'] = None
+        
+        alert = get_alert_service().create_alert(data)
+        return jsonify({
+            'success': True,
+            'alert': alert
+        }), 201
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in create_alert: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to create alert'
+        }), 500
+
+@emergency_bp.route('/alerts/<alert_id>', methods=['DELETE'])
+@require_auth
+def delete_alert(alert_id, current_user):
+    """Withdraw a travel alert (alert admins only)"""
+    if not _is_alerts_admin(current_user):
+        return jsonify({
+            'success': False,
+            'message': 'Not allowed to withdraw alerts'
+        }), 403
+    
+    try:
+        if not get_alert_service().delete_alert(alert_id):
+            return jsonify({
+                'success': False,
+                'message': 'Alert not found'
+            }), 404
+        return jsonify({'success': True}), 200
+        
+    except Exception as e:
+        logger.error(f"Error in delete_alert: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to delete alert'
+        }), 500
@@ -1,6 +1,8 @@
 """Itinerary API endpoints"""
 from flask import Blueprint, request, jsonify
+from app.config.settings import Config
 from app.services.gemini_service import get_gemini_service
+from app.services.itinerary_planner import get_itinerary_planner
 from app.models.itinerary import get_itinerary_model
 from app.utils.validators import validate_itinerary_request, validate_language
 from app.utils.logger import logger
@@ -13,7 +15,12 @@ itinerary_bp = Blueprint('itinerary', __name__)
 @itinerary_bp.route('/generate', methods=['POST'])
 def generate_itinerary():
     """
-    Generate AI-powered itinerary
+    Generate an itinerary
+    
+    Plans are built locally from the place catalogue in milliseconds. When
+    the AI service is configured the response also carries a 'narrative'
+    id; the written overview can be fetched from /narrative/<id> once ready.
+    With ITINERARY_GENERATOR=ai the AI writes the whole plan instead.
     
     Request body:
     {
@@ -22,6 +29,8 @@ def generate_itinerary():
         "interests": ["temples", "trekking"],
         "start_location": "Dehradun",
         "travel_style": "moderate",
+        "accommodation_type": "hotel",
+        "transport_mode": "mixed",
         "language": "english"
     }
     """
@@ -77,23 +86,24 @@ def generate_itinerary():
             'transport_mode': data.get('transport_mode', 'mixed')
         }
         
-        # Get Gemini service
-        try:
-            gemini_service = get_gemini_service()
-        except ValueError as e:
-            return jsonify({
-                'success': False,
-                'message': 'AI service is not configured. Please check GEMINI_API_KEY.'
-            }), 500
-        
         # Track start time for activity logging
         start_time = time.time()
         
-        # Generate itinerary
-        result = gemini_service.generate_itinerary(
-            preferences=preferences,
-            language=language
-        )
+        # Plan itinerary
+        if Config.ITINERARY_GENERATOR == 'ai':
+            try:
+                gemini_service = get_gemini_service()
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'message': 'AI service is not configured. Please check GEMINI_API_KEY.'
+                }), 500
+            result = gemini_service.generate_itinerary(
+                preferences=preferences,
+                language=language
+            )
+        else:
+            result = {'success': True, 'itinerary': get_itinerary_planner().plan(preferences, language)}
         
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
@@ -110,33 +120,47 @@ def generate_itinerary():
         except Exception as log_error:
             logger.warning(f"Failed to log activity: {str(log_error)}")
         
-        if result.get('success'):
-            itinerary_data = result.get('itinerary', {})
-            
-            # Optionally save to database
-            save_to_db = data.get('save', False)
-            if save_to_db:
-                itinerary_model = get_itinerary_model()
-                saved = itinerary_model.create_itinerary({
-                    'user_id': user_id,
-                    'duration': preferences['duration'],
-                    'budget': preferences['budget'],
-                    'preferences': preferences,
-                    'itinerary': itinerary_data
-                })
-                if saved.get('success'):
-                    itinerary_data['_id'] = saved['data']['_id']
-            
+        if result.get('overloaded'):
             return jsonify({
-                'success': True,
-                'itinerary': itinerary_data,
-                'language': language
-            }), 200
-        else:
+                'success': False,
+                'message': result['message']
+            }), 503, {'Retry-After': str(result['retry_after'])}
+        
+        if not result.get('success'):
             return jsonify({
                 'success': False,
                 'message': result.get('message', 'Failed to generate itinerary')
             }), 500
+        
+        itinerary_data = result.get('itinerary', {})
+        
+        # Narrative is written in the background; the plan is complete without it
+        narrative = None
+        if itinerary_data.get('source') == 'local':
+            narrative = get_itinerary_planner().request_narrative(itinerary_data, language)
+        
+        # Optionally save to database
+        save_to_db = data.get('save', False)
+        if save_to_db:
+            itinerary_model = get_itinerary_model()
+            saved = itinerary_model.create_itinerary({
+                'user_id': user_id,
+                'duration': preferences['duration'],
+                'budget': preferences['budget'],
+                'preferences': preferences,
+                'itinerary': itinerary_data
+            })
+            if saved.get('success'):
+                itinerary_data['_id'] = saved['data']['_id']
+        
+        response = {
+            'success': True,
+            'itinerary': itinerary_data,
+            'language': language
+        }
+        if narrative:
+            response['narrative'] = narrative
+        return jsonify(response), 200
             
     except Exception as e:
         logger.error(f"Error in generate_itinerary: {str(e)}")
@@ -145,6 +169,23 @@ def generate_itinerary():
             'message': 'Internal server error'
         }), 500
 
+@itinerary_bp.route('/narrative/<narrative_id>', methods=['GET'])
+def get_itinerary_narrative(narrative_id: str):
+    """
+    Get the AI-written narrative for a generated itinerary
+    
+    Status is 'ready' (with the narrative), 'pending' or 'unavailable'.
+    """
+    try:
+        result = get_itinerary_planner().get_narrative(narrative_id)
+        return jsonify({'success': True, **result}), 200
+    except Exception as e:
+        logger.error(f"Error in get_itinerary_narrative: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to get itinerary narrative'
+        }), 500
+
 @itinerary_bp.route('/suggestions', methods=['GET'])
 def get_suggestions():
     """
@@ -95,6 +95,12 @@ def analyze_image():
         except Exception as log_error:
             logger.warning(f"Failed to log activity: {str(log_error)}")
         
+        if result.get('overloaded'):
+            return jsonify({
+                'success': False,
+                'message': result['message']
+            }), 503, {'Retry-After': str(result['retry_after'])}
+        
         if result.get('success'):
             return jsonify({
                 'success': True,
@@ -244,6 +250,12 @@ def analyze_image_base64():
             language=language
         )
         
+        if result.get('overloaded'):
+            return jsonify({
+                'success': False,
+                'message': result['message']
+            }), 503, {'Retry-After': str(result['retry_after'])}
+        
         if result.get('success'):
             return jsonify({
                 'success': True,
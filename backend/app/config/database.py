@@ -1,12 +1,99 @@
 """
 MongoDB Database Configuration and Connection
 """
-import os
-from pymongo import MongoClient
+import threading
+from pymongo import MongoClient, ReadPreference, monitoring
 from pymongo.errors import ConnectionFailure
-from dotenv import load_dotenv
+from pymongo.write_concern import WriteConcern
+from app.config.settings import Config
+from app.utils.metrics import metrics
 
-load_dotenv()
+
+# Per-collection overrides applied by get_collection()
+COLLECTION_OPTIONS = {
+    # Activity logs are high-volume and losing one on failover is acceptable
+    'activities': {'write_concern': WriteConcern(w=1)},
+    # Account data must survive a primary failover
+    'users': {'write_concern': WriteConcern(w='majority')},
+    # Reference data tolerates slightly stale reads from a secondary
+    'places': {'read_preference': ReadPreference.SECONDARY_PREFERRED},
+    # Stored translations never change once written
+    'translation_memory': {'read_preference': ReadPreference.SECONDARY_PREFERRED},
+}
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collects connection pool counters from pymongo pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            'pools': 0,
+            'pool_cleared': 0,
+            'connections_created': 0,
+            'connections_closed': 0,
+            'checkouts': 0,
+            'checkout_failures': 0,
+            'checkout_timeouts': 0,
+            'in_use': 0,
+            'max_in_use': 0,
+            'waiting': 0,
+            'max_waiting': 0
+        }
+
+    def _incr(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def pool_created(self, event):
+        self._incr('pools')
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr('pool_cleared')
+
+    def pool_closed(self, event):
+        self._incr('pools', -1)
+
+    def connection_created(self, event):
+        self._incr('connections_created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr('connections_closed')
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._stats['waiting'] += 1
+            self._stats['max_waiting'] = max(self._stats['max_waiting'], self._stats['waiting'])
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._stats['waiting'] -= 1
+            self._stats['checkout_failures'] += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self._stats['checkout_timeouts'] += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self._stats['waiting'] -= 1
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['max_in_use'] = max(self._stats['max_in_use'], self._stats['in_use'])
+
+    def connection_checked_in(self, event):
+        self._incr('in_use', -1)
+
+    def stats(self):
+        """Get a copy of the pool counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['open_connections'] = stats['connections_created'] - stats['connections_closed']
+        return stats
 
 
 class Database:
@@ -15,6 +102,7 @@ class Database:
     _instance = None
     _client = None
     _db = None
+    _pool_listener = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -28,16 +116,23 @@ class Database:
     def connect(self):
         """Establish MongoDB connection"""
         try:
-            # Get MongoDB URI from environment
-            mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
-            db_name = os.getenv('MONGODB_DB_NAME', 'uttarakhand_tourism')
+            db_name = Config.DB_NAME
+            
+            if self._pool_listener is None:
+                self._pool_listener = PoolStatsListener()
             
-            # Create MongoDB client
+            # Create the one MongoDB client (and connection pool) for this process
             self._client = MongoClient(
-                mongo_uri,
+                Config.MONGODB_URI,
+                maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+                minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=Config.MONGO_MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                readPreference=Config.MONGO_READ_PREFERENCE,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
-                socketTimeoutMS=10000
+                socketTimeoutMS=10000,
+                event_listeners=[self._pool_listener]
             )
             
             # Test connection
@@ -59,25 +154,16 @@ class Database:
             raise
     
     def _initialize_collections(self):
-        """Initialize collections and create indexes"""
-        # Users collection
-        users = self._db.users
-        users.create_index("email", unique=True)
-        users.create_index("created_at")
+        """Reconcile registered indexes once per process"""
+        from app.config.indexes import ensure_indexes
         
-        # Chats collection
-        chats = self._db.chats
-        chats.create_index([("user_id", 1), ("timestamp", -1)])
-        chats.create_index("session_id")
-        chats.create_index("feedback.rating")
-        
-        # Create text index for content search
         try:
-            chats.create_index([("content", "text")])
-        except:
-            pass  # Index might already exist
-        
-        print("✓ Database collections and indexes initialized")
+            created = ensure_indexes(self._db)
+            created_count = sum(len(names) for names in created.values())
+            print(f"✓ Database indexes reconciled ({created_count} created)")
+        except Exception as e:
+            # Missing indexes slow queries down but should not stop the app
+            print(f"⚠ Index reconciliation failed: {e}")
     
     def get_db(self):
         """Get database instance"""
@@ -91,6 +177,29 @@ class Database:
             self.connect()
         return self._client
     
+    def get_collection(self, name, db=None):
+        """
+        Get a collection with its configured read preference and write concern
+        
+        Args:
+            name: Collection name
+            db: Database to use (defaults to the shared database)
+        """
+        if db is None:
+            db = self.get_db()
+        return db.get_collection(name, **COLLECTION_OPTIONS.get(name, {}))
+    
+    def get_pool_stats(self):
+        """Get connection pool configuration and counters"""
+        stats = self._pool_listener.stats() if self._pool_listener else {}
+        stats.update({
+            'max_pool_size': Config.MONGO_MAX_POOL_SIZE,
+            'min_pool_size': Config.MONGO_MIN_POOL_SIZE,
+            'wait_queue_timeout_ms': Config.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            'read_preference': Config.MONGO_READ_PREFERENCE
+        })
+        return stats
+    
     def close(self):
         """Close database connection"""
         if self._client:
@@ -110,6 +219,7 @@ class Database:
 
 # Global database instance
 db_instance = Database()
+metrics.register_collector('mongo_pool', db_instance.get_pool_stats)
 
 
 def get_database():
@@ -120,3 +230,13 @@ def get_database():
 def get_client():
     """Get MongoDB client"""
     return db_instance.get_client()
+
+
+def get_collection(name, db=None):
+    """Get a collection from the shared client with its per-collection options"""
+    return db_instance.get_collection(name, db)
+
+
+def get_pool_stats():
+    """Get connection pool statistics"""
+    return db_instance.get_pool_stats()
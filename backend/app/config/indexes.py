@@ -0,0 +1,98 @@
+"""
+MongoDB Index Registry
+Declares every collection's indexes once and reconciles them against the server
+"""
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+
+
+# Collection name -> indexes that collection should have
+INDEXES: Dict[str, List[IndexModel]] = {
+    'users': [
+        IndexModel([('email', ASCENDING)], unique=True),
+        IndexModel([('created_at', ASCENDING)], name='idx_created_at'),
+        IndexModel([('is_active', ASCENDING)], name='idx_is_active'),
+    ],
+    'chats': [
+        # _id breaks timestamp ties for keyset pagination
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], name='idx_user_timestamp_id'),
+        IndexModel([('session_id', ASCENDING)], name='idx_session'),
+        # Newest messages of one session, for server-side chat context
+        IndexModel([('user_id', ASCENDING), ('session_id', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], name='idx_user_session_timestamp'),
+        IndexModel([('feedback.rating', ASCENDING)], name='idx_feedback_rating'),
+        IndexModel([('role', ASCENDING)], name='idx_role'),
+        IndexModel([('content', TEXT)], name='idx_content_text'),
+        IndexModel([('feedback.rating', ASCENDING), ('timestamp', DESCENDING)], name='idx_feedback_timestamp'),
+    ],
+    'activities': [
+        IndexModel([('user_id', ASCENDING), ('timestamp', DESCENDING), ('_id', DESCENDING)], name='idx_user_timestamp_id'),
+        IndexModel([('service_type', ASCENDING)], name='idx_service_type'),
+        IndexModel([('action', ASCENDING)], name='idx_action'),
+        IndexModel([('user_id', ASCENDING), ('service_type', ASCENDING)], name='idx_user_service'),
+    ],
+    'activity_rollups': [
+        IndexModel([('user_id', ASCENDING), ('day', ASCENDING)], name='idx_user_day'),
+        IndexModel([('user_id', ASCENDING), ('service_type', ASCENDING), ('day', ASCENDING)], name='idx_user_service_day'),
+    ],
+    'alerts': [
+        IndexModel([('region', GEOSPHERE)], name='idx_region_2dsphere'),
+        # Alerts are reaped once valid_until passes
+        IndexModel([('valid_until', ASCENDING)], name='idx_valid_until', expireAfterSeconds=0),
+        # Newest edit, for alert snapshot change detection
+        IndexModel([('updated_at', DESCENDING)], name='idx_updated_at'),
+    ],
+    'response_cache': [
+        # Documents are reaped as soon as expires_at passes
+        IndexModel([('expires_at', ASCENDING)], name='idx_expires_at', expireAfterSeconds=0),
+    ],
+}
+
+
+def _key_signature(key) -> tuple:
+    """
+    Normalize an index key pattern for comparison
+
+    Text indexes are stored server-side as {_fts: 'text', _ftsx: 1}, and a
+    collection can only have one, so they all share a single signature.
+    """
+    items = list(key.items())
+    if any(value == TEXT for _, value in items) or any(field == '_fts' for field, _ in items):
+        return ('$text',)
+    return tuple((field, value) for field, value in items)
+
+
+def ensure_indexes(db, collections: List[str] = None) -> Dict[str, List[str]]:
+    """
+    Create any registered indexes that are missing
+
+    Indexes are matched by key pattern rather than name, so indexes created
+    earlier under a different name (e.g. by older migration scripts) are
+    kept as they are instead of failing with an options conflict.
+
+    Args:
+        db: Database instance
+        collections: Restrict to these collections (defaults to all registered)
+
+    Returns:
+        Dictionary of collection name to names of indexes created
+    """
+    created = {}
+    for name in collections or INDEXES:
+        collection = db[name]
+        existing = {
+            _key_signature(index['key']): index
+            for index in collection.list_indexes()
+        }
+
+        missing = []
+        for model in INDEXES.get(name, []):
+            spec = model.document
+            current = existing.get(_key_signature(spec['key']))
+            if current is None:
+                missing.append(model)
+            elif (current.get('unique', False) != spec.get('unique', False)
+                  or current.get('expireAfterSeconds') != spec.get('expireAfterSeconds')):
+                print(f"⚠ Index {current['name']} on '{name}' differs from the registry; leaving it unchanged")
+
+        created[name] = collection.create_indexes(missing) if missing else []
+    return created
@@ -5,25 +5,29 @@ Tracks user's service usage history and activities
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.config.database import get_collection
+from app.models.activity_rollup import ActivityRollup
+from app.utils.logger import logger
+from app.utils.pagination import KEYSET_SORT, keyset_filter
 
 
 class Activity:
     """Activity model for tracking user service usage"""
     
+    # Fields list views do not need; the full payloads can be large
+    LIST_PROJECTION = {"request_data": 0, "response_data": 0}
+    
     def __init__(self, db):
-        self.collection = db.activities
-        self._ensure_indexes()
+        self.collection = get_collection('activities', db)
+        self.rollups = ActivityRollup(db)
     
-    def _ensure_indexes(self):
-        """Create indexes for efficient queries"""
-        # Compound index for user_id and timestamp
-        self.collection.create_index([("user_id", 1), ("timestamp", -1)])
-        # Index on service_type for filtering
-        self.collection.create_index("service_type")
-        # Index on action for analytics
-        self.collection.create_index("action")
-        # Compound index for service usage analytics
-        self.collection.create_index([("user_id", 1), ("service_type", 1)])
+    def _update_rollups(self, activities: List[Dict[str, Any]]):
+        # Rollups are derived data; a failed update must not fail the write
+        try:
+            self.rollups.record(activities)
+        except Exception as e:
+            logger.error(f"Failed to update activity rollups: {str(e)}")
     
     def log_activity(self, user_id: str, service_type: str, action: str,
                     details: Optional[Dict] = None, 
@@ -51,7 +55,33 @@ class Activity:
             - weather: Weather queries
             - translation: Translation requests
         """
-        activity_data = {
+        activity_data = self.build_activity(
+            user_id, service_type, action,
+            details=details,
+            request_data=request_data,
+            response_data=response_data,
+            metadata=metadata
+        )
+        
+        result = self.collection.insert_one(activity_data)
+        activity_data['_id'] = result.inserted_id
+        self._update_rollups([activity_data])
+        return activity_data
+    
+    @staticmethod
+    def build_activity(user_id: str, service_type: str, action: str,
+                       details: Optional[Dict] = None,
+                       request_data: Optional[Dict] = None,
+                       response_data: Optional[Dict] = None,
+                       metadata: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Build an activity document without writing it
+        
+        The _id is assigned here so the document can be returned to the
+        caller before a background writer inserts it.
+        """
+        return {
+            "_id": ObjectId(),
             "user_id": user_id,
             "service_type": service_type,
             "action": action,
@@ -63,25 +93,48 @@ class Activity:
             "status": "success",  # success, failed, partial
             "duration_ms": metadata.get('duration_ms', 0) if metadata else 0
         }
+    
+    def insert_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of prebuilt activity documents
         
-        result = self.collection.insert_one(activity_data)
-        activity_data['_id'] = result.inserted_id
-        return activity_data
+        Args:
+            activities: Documents from build_activity()
+            
+        Returns:
+            Number of documents inserted
+        """
+        if not activities:
+            return 0
+        try:
+            self.collection.insert_many(activities, ordered=False)
+            inserted = activities
+        except BulkWriteError as e:
+            # Unordered inserts keep going past failures; roll up only what landed
+            failed = {error['index'] for error in e.details.get('writeErrors', [])}
+            inserted = [a for i, a in enumerate(activities) if i not in failed]
+        
+        self._update_rollups(inserted)
+        return len(inserted)
     
     def get_user_activities(self, user_id: str, limit: int = 50, skip: int = 0,
                            service_type: Optional[str] = None,
                            start_date: Optional[datetime] = None,
-                           end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                           end_date: Optional[datetime] = None,
+                           cursor: Optional[str] = None,
+                           projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
         Get user's activity history with pagination and filtering
         
         Args:
             user_id: User ID
             limit: Number of activities to return
-            skip: Number of activities to skip
+            skip: Number of activities to skip (ignored when cursor is given)
             service_type: Optional filter by service type
             start_date: Optional start date filter
             end_date: Optional end date filter
+            cursor: Token from encode_cursor() for the last activity of the previous page
+            projection: Optional field projection
         """
         query = {"user_id": user_id}
         
@@ -95,9 +148,13 @@ class Activity:
             if end_date:
                 query["timestamp"]["$lte"] = end_date
         
+        if cursor:
+            query = {"$and": [query, keyset_filter(cursor)]}
+            skip = 0
+        
         activities = list(
-            self.collection.find(query)
-            .sort("timestamp", -1)
+            self.collection.find(query, projection)
+            .sort(KEYSET_SORT)
             .skip(skip)
             .limit(limit)
         )
@@ -110,43 +167,9 @@ class Activity:
         Get summary of service usage over a period
         
         Returns count by service type, most used services, etc.
+        Read from daily rollups, so the period is counted in whole days.
         """
-        start_date = datetime.utcnow()
-        from datetime import timedelta
-        start_date = start_date - timedelta(days=days)
-        
-        pipeline = [
-            {
-                "$match": {
-                    "user_id": user_id,
-                    "timestamp": {"$gte": start_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$service_type",
-                    "count": {"$sum": 1},
-                    "last_used": {"$max": "$timestamp"},
-                    "avg_duration": {"$avg": "$duration_ms"}
-                }
-            },
-            {"$sort": {"count": -1}}
-        ]
-        
-        services = list(self.collection.aggregate(pipeline))
-        
-        # Get total count
-        total_activities = self.collection.count_documents({
-            "user_id": user_id,
-            "timestamp": {"$gte": start_date}
-        })
-        
-        return {
-            "total_activities": total_activities,
-            "period_days": days,
-            "services": services,
-            "most_used_service": services[0]["_id"] if services else None
-        }
+        return self.rollups.get_usage_summary(user_id, days=days)
     
     def get_activity_timeline(self, user_id: str, 
                              group_by: str = "day",
@@ -159,40 +182,7 @@ class Activity:
             group_by: day, week, or month
             days: Number of days to look back
         """
-        from datetime import timedelta
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Date format based on grouping
-        date_format = {
-            "day": "%Y-%m-%d",
-            "week": "%Y-W%V",
-            "month": "%Y-%m"
-        }.get(group_by, "%Y-%m-%d")
-        
-        pipeline = [
-            {
-                "$match": {
-                    "user_id": user_id,
-                    "timestamp": {"$gte": start_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": date_format,
-                            "date": "$timestamp"
-                        }
-                    },
-                    "count": {"$sum": 1},
-                    "services": {"$addToSet": "$service_type"}
-                }
-            },
-            {"$sort": {"_id": 1}}
-        ]
-        
-        timeline = list(self.collection.aggregate(pipeline))
-        return timeline
+        return self.rollups.get_timeline(user_id, group_by=group_by, days=days)
     
     def get_recent_activities(self, user_id: str, 
                              limit: int = 10) -> List[Dict[str, Any]]:
@@ -209,67 +199,17 @@ class Activity:
         """
         Get detailed analytics for a specific service
         """
-        pipeline = [
-            {
-                "$match": {
-                    "user_id": user_id,
-                    "service_type": service_type
-                }
-            },
-            {
-                "$group": {
-                    "_id": None,
-                    "total_uses": {"$sum": 1},
-                    "unique_actions": {"$addToSet": "$action"},
-                    "avg_duration": {"$avg": "$duration_ms"},
-                    "first_used": {"$min": "$timestamp"},
-                    "last_used": {"$max": "$timestamp"}
-                }
-            }
-        ]
-        
-        result = list(self.collection.aggregate(pipeline))
-        if result:
-            data = result[0]
-            data['unique_actions'] = list(data['unique_actions'])
-            return data
-        
-        return {
-            "total_uses": 0,
-            "unique_actions": [],
-            "avg_duration": 0,
-            "first_used": None,
-            "last_used": None
-        }
+        return self.rollups.get_service_analytics(user_id, service_type)
     
     def delete_user_activities(self, user_id: str) -> int:
         """Delete all activities for a user"""
         try:
             result = self.collection.delete_many({"user_id": user_id})
+            self.rollups.delete_user_rollups(user_id)
             return result.deleted_count
         except:
             return 0
     
     def get_popular_services(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular services across all users (for admin analytics)"""
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$service_type",
-                    "total_uses": {"$sum": 1},
-                    "unique_users": {"$addToSet": "$user_id"}
-                }
-            },
-            {
-                "$project": {
-                    "service_type": "$_id",
-                    "total_uses": 1,
-                    "unique_users": {"$size": "$unique_users"}
-                }
-            },
-            {"$sort": {"total_uses": -1}},
-            {"$limit": limit}
-        ]
-        
-        services = list(self.collection.aggregate(pipeline))
-        return services
+        return self.rollups.get_popular_services(limit=limit)
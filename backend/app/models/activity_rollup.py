@@ -0,0 +1,227 @@
+"""
+Activity Rollup Model for MongoDB
+Per user/service/day counters maintained as activities are written
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from pymongo import UpdateOne
+from app.config.database import get_collection
+
+
+class ActivityRollup:
+    """Daily usage counters so analytics read O(days) documents instead of O(events)"""
+
+    def __init__(self, db):
+        self.collection = get_collection('activity_rollups', db)
+
+    @staticmethod
+    def _day(timestamp: datetime) -> datetime:
+        return datetime(timestamp.year, timestamp.month, timestamp.day)
+
+    @staticmethod
+    def _action_key(action: str) -> str:
+        # Field names cannot contain '.' or start with '$'
+        return str(action).replace('.', '_').lstrip('$') or 'unknown'
+
+    def record(self, activities: Iterable[Dict[str, Any]]) -> None:
+        """
+        Fold activity documents into their daily rollups
+
+        Activities for the same user/service/day are combined first, so a
+        batch costs one upsert per rollup document rather than per event.
+        """
+        groups = {}
+        for activity in activities:
+            day = self._day(activity['timestamp'])
+            key = (activity['user_id'], activity['service_type'], day)
+            group = groups.setdefault(key, {
+                'count': 0,
+                'duration_ms': 0,
+                'actions': Counter(),
+                'first_used': activity['timestamp'],
+                'last_used': activity['timestamp']
+            })
+            group['count'] += 1
+            group['duration_ms'] += activity.get('duration_ms') or 0
+            group['actions'][self._action_key(activity.get('action'))] += 1
+            group['first_used'] = min(group['first_used'], activity['timestamp'])
+            group['last_used'] = max(group['last_used'], activity['timestamp'])
+
+        if not groups:
+            return
+
+        operations = []
+        for (user_id, service_type, day), group in groups.items():
+            increments = {
+                'count': group['count'],
+                'duration_ms': group['duration_ms']
+            }
+            for action, count in group['actions'].items():
+                increments[f'actions.{action}'] = count
+
+            operations.append(UpdateOne(
+                {'_id': f"{user_id}:{service_type}:{day.strftime('%Y-%m-%d')}"},
+                {
+                    '$inc': increments,
+                    '$min': {'first_used': group['first_used']},
+                    '$max': {'last_used': group['last_used']},
+                    '$setOnInsert': {
+                        'user_id': user_id,
+                        'service_type': service_type,
+                        'day': day
+                    }
+                },
+                upsert=True
+            ))
+
+        self.collection.bulk_write(operations, ordered=False)
+
+    def get_rollups(self, user_id: str, service_type: Optional[str] = None,
+                    start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get a user's daily rollups, oldest first"""
+        query = {'user_id': user_id}
+        if service_type:
+            query['service_type'] = service_type
+        if start_date:
+            query['day'] = {'$gte': self._day(start_date)}
+        return list(self.collection.find(query).sort('day', 1))
+
+    def get_usage_summary(self, user_id: str, days: int = 30) -> Dict[str, Any]:
+        """Get usage per service over the last N days"""
+        start_date = datetime.utcnow() - timedelta(days=days)
+
+        services = {}
+        for rollup in self.get_rollups(user_id, start_date=start_date):
+            service = services.setdefault(rollup['service_type'], {
+                '_id': rollup['service_type'],
+                'count': 0,
+                'duration_ms': 0,
+                'last_used': None
+            })
+            service['count'] += rollup['count']
+            service['duration_ms'] += rollup.get('duration_ms', 0)
+            if service['last_used'] is None or rollup['last_used'] > service['last_used']:
+                service['last_used'] = rollup['last_used']
+
+        summary = []
+        for service in services.values():
+            duration_ms = service.pop('duration_ms')
+            service['avg_duration'] = duration_ms / service['count'] if service['count'] else 0
+            summary.append(service)
+        summary.sort(key=lambda s: s['count'], reverse=True)
+
+        return {
+            'total_activities': sum(s['count'] for s in summary),
+            'period_days': days,
+            'services': summary,
+            'most_used_service': summary[0]['_id'] if summary else None
+        }
+
+    def get_timeline(self, user_id: str, group_by: str = 'day',
+                     days: int = 30) -> List[Dict[str, Any]]:
+        """Get activity counts grouped by day, week or month"""
+        start_date = datetime.utcnow() - timedelta(days=days)
+        date_format = {
+            'day': '%Y-%m-%d',
+            'week': '%Y-W%V',
+            'month': '%Y-%m'
+        }.get(group_by, '%Y-%m-%d')
+
+        buckets = {}
+        for rollup in self.get_rollups(user_id, start_date=start_date):
+            key = rollup['day'].strftime(date_format)
+            bucket = buckets.setdefault(key, {'_id': key, 'count': 0, 'services': []})
+            bucket['count'] += rollup['count']
+            if rollup['service_type'] not in bucket['services']:
+                bucket['services'].append(rollup['service_type'])
+
+        return [buckets[key] for key in sorted(buckets)]
+
+    def get_service_analytics(self, user_id: str, service_type: str) -> Dict[str, Any]:
+        """Get lifetime totals for one service"""
+        rollups = self.get_rollups(user_id, service_type=service_type)
+        if not rollups:
+            return {
+                'total_uses': 0,
+                'unique_actions': [],
+                'avg_duration': 0,
+                'first_used': None,
+                'last_used': None
+            }
+
+        total_uses = sum(r['count'] for r in rollups)
+        duration_ms = sum(r.get('duration_ms', 0) for r in rollups)
+        actions = set()
+        for rollup in rollups:
+            actions.update(rollup.get('actions', {}).keys())
+
+        return {
+            '_id': None,
+            'total_uses': total_uses,
+            'unique_actions': sorted(actions),
+            'avg_duration': duration_ms / total_uses if total_uses else 0,
+            'first_used': min(r['first_used'] for r in rollups),
+            'last_used': max(r['last_used'] for r in rollups)
+        }
+
+    def get_popular_services(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get most used services across all users"""
+        pipeline = [
+            {
+                '$group': {
+                    '_id': {'service_type': '$service_type', 'user_id': '$user_id'},
+                    'total_uses': {'$sum': '$count'}
+                }
+            },
+            {
+                '$group': {
+                    '_id': '$_id.service_type',
+                    'total_uses': {'$sum': '$total_uses'},
+                    'unique_users': {'$sum': 1}
+                }
+            },
+            {
+                '$project': {
+                    'service_type': '$_id',
+                    'total_uses': 1,
+                    'unique_users': 1
+                }
+            },
+            {'$sort': {'total_uses': -1}},
+            {'$limit': limit}
+        ]
+        return list(self.collection.aggregate(pipeline))
+
+    def delete_user_rollups(self, user_id: str) -> int:
+        """Delete all rollups for a user"""
+        result = self.collection.delete_many({'user_id': user_id})
+        return result.deleted_count
+
+    def rebuild(self, activities_collection, batch_size: int = 1000) -> int:
+        """
+        Recompute every rollup from the raw activities collection
+
+        Returns:
+            Number of activities processed
+        """
+        self.collection.delete_many({})
+
+        processed = 0
+        batch = []
+        cursor = activities_collection.find(
+            {},
+            {'user_id': 1, 'service_type': 1, 'action': 1, 'timestamp': 1, 'duration_ms': 1}
+        )
+        for activity in cursor:
+            if any(activity.get(field) is None for field in ('user_id', 'service_type', 'timestamp')):
+                continue
+            batch.append(activity)
+            if len(batch) >= batch_size:
+                self.record(batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            self.record(batch)
+            processed += len(batch)
+        return processed
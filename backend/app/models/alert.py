@@ -0,0 +1,149 @@
+"""
+Alert Model for MongoDB
+Travel alerts (road, weather, safety, event) covering a circular region
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+from app.config.database import get_collection
+from app.utils.geo import geojson_point, haversine_km, point_coordinates, valid_coordinates
+
+
+class Alert:
+    """
+    Alerts with a GeoJSON centre and a radius
+
+    The region centre carries a 2dsphere index and valid_until a TTL index,
+    so expired alerts are removed by the server without a cleanup job.
+    """
+
+    TYPES = ('weather', 'road', 'safety', 'event')
+    SEVERITIES = ('low', 'moderate', 'high')
+    MAX_RADIUS_KM = 200.0
+
+    def __init__(self, db):
+        self.collection = get_collection('alerts', db)
+
+    @classmethod
+    def validate(cls, data: Dict[str, Any]) -> Optional[str]:
+        """Get a validation error message for alert input, or None if valid"""
+        for field in ('title', 'message', 'location'):
+            value = data.get(field)
+            if not isinstance(value, str) or not value.strip():
+                return f'{field} is required and must be text'
+        if data.get('type') not in cls.TYPES:
+            return f"type must be one of {', '.join(cls.TYPES)}"
+        if data.get('severity') not in cls.SEVERITIES:
+            return f"severity must be one of {', '.join(cls.SEVERITIES)}"
+        if not valid_coordinates(data.get('lat'), data.get('lon')):
+            return 'lat and lon are required'
+        try:
+            if not 0 < float(data.get('radius_km', 0)) <= cls.MAX_RADIUS_KM:
+                return f'radius_km must be between 0 and {cls.MAX_RADIUS_KM:g}'
+        except (TypeError, ValueError):
+            return 'radius_km must be a number'
+        if not isinstance(data.get('valid_until'), datetime):
+            return 'valid_until must be a date'
+        return None
+
+    def create_alert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create an alert
+
+        Args:
+            data: type, severity, title, message, location, lat, lon,
+                radius_km and valid_until (datetime, UTC)
+
+        Returns:
+            Created alert document
+
+        Raises:
+            ValueError: If the data is invalid
+        """
+        error = self.validate(data)
+        if error:
+            raise ValueError(error)
+
+        now = datetime.utcnow()
+        alert = {
+            'type': data['type'],
+            'severity': data['severity'],
+            'title': data['title'].strip(),
+            'message': data['message'].strip(),
+            'location': data['location'].strip(),
+            'region': geojson_point(float(data['lat']), float(data['lon'])),
+            'radius_km': float(data['radius_km']),
+            'valid_until': data['valid_until'],
+            'created_at': now,
+            'updated_at': now
+        }
+        result = self.collection.insert_one(alert)
+        alert['_id'] = result.inserted_id
+        return alert
+
+    def delete_alert(self, alert_id: str) -> bool:
+        """Delete an alert; returns False if it did not exist"""
+        try:
+            object_id = ObjectId(alert_id)
+        except Exception:
+            return False
+        return self.collection.delete_one({'_id': object_id}).deleted_count > 0
+
+    def get_active_alerts(self) -> List[Dict[str, Any]]:
+        """Get every alert that has not expired"""
+        # The TTL monitor only runs once a minute, so filter on expiry as well
+        return list(self.collection.find({'valid_until': {'$gt': datetime.utcnow()}}))
+
+    def find_near(self, lat: float, lon: float, radius_km: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Get active alerts whose region is within radius_km of a point
+
+        The 2dsphere query returns centres within the widest possible reach
+        (radius_km plus MAX_RADIUS_KM), nearest first; each alert's own
+        radius is then checked against the distance.
+        """
+        alerts = self.collection.find({
+            'region': {
+                '$nearSphere': {
+                    '$geometry': geojson_point(lat, lon),
+                    '$maxDistance': (radius_km + self.MAX_RADIUS_KM) * 1000
+                }
+            },
+            'valid_until': {'$gt': datetime.utcnow()}
+        })
+        near = []
+        for alert in alerts:
+            distance = haversine_km(lat, lon, *point_coordinates(alert['region']))
+            if distance <= alert['radius_km'] + radius_km:
+                alert['distance_km'] = round(distance, 1)
+                near.append(alert)
+        return near
+
+    def get_version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        Cheap change marker for snapshot holders: (count, newest updated_at)
+
+        Inserts, deletes and TTL expiry change the count; edits bump updated_at.
+        """
+        newest = self.collection.find_one({}, {'updated_at': 1}, sort=[('updated_at', -1)])
+        return self.collection.estimated_document_count(), newest['updated_at'] if newest else None
+
+    @staticmethod
+    def to_dict(alert: Dict[str, Any]) -> Dict[str, Any]:
+        """Serialize an alert for API responses"""
+        lat, lon = point_coordinates(alert['region'])
+        result = {
+            'id': str(alert['_id']),
+            'type': alert['type'],
+            'severity': alert['severity'],
+            'title': alert['title'],
+            'message': alert['message'],
+            'location': alert['location'],
+            'lat': lat,
+            'lon': lon,
+            'radius_km': alert['radius_km'],
+            'valid_until': alert['valid_until'].strftime('%Y-%m-%d')
+        }
+        if 'distance_km' in alert:
+            result['distance_km'] = alert['distance_km']
+        return result
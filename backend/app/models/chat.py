@@ -5,23 +5,22 @@ Handles chat message storage and retrieval
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from bson import ObjectId
+from app.config.database import get_collection
+from app.utils.pagination import KEYSET_SORT, keyset_filter
 
 
 class Chat:
     """Chat model for storing conversation history"""
     
-    def __init__(self, db):
-        self.collection = db.chats
-        self._ensure_indexes()
+    # Internal ranking fields list views do not need
+    LIST_PROJECTION = {"reinforcement_weight": 0}
+    
+    # Rolling summaries of older turns share the collection with messages
+    SUMMARY_ROLE = "summary"
+    MESSAGES_ONLY = {"role": {"$ne": SUMMARY_ROLE}}
     
-    def _ensure_indexes(self):
-        """Create indexes for efficient queries"""
-        # Compound index for user_id and timestamp
-        self.collection.create_index([("user_id", 1), ("timestamp", -1)])
-        # Index on session_id for grouping conversations
-        self.collection.create_index("session_id")
-        # Index on feedback for analytics
-        self.collection.create_index("feedback.rating")
+    def __init__(self, db):
+        self.collection = get_collection('chats', db)
     
     def create_message(self, user_id: str, session_id: str, role: str, 
                       content: str, metadata: Optional[Dict] = None) -> Dict[str, Any]:
@@ -57,44 +56,80 @@ class Chat:
         return message_data
     
     def get_user_chats(self, user_id: str, limit: int = 50, skip: int = 0,
-                      session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+                      session_id: Optional[str] = None,
+                      cursor: Optional[str] = None,
+                      projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
         """
         Get user's chat history with pagination
         
         Args:
             user_id: User ID
             limit: Number of messages to return
-            skip: Number of messages to skip
+            skip: Number of messages to skip (ignored when cursor is given)
             session_id: Optional session ID to filter by
+            cursor: Token from encode_cursor() for the last message of the previous page
+            projection: Optional field projection
         """
-        query = {"user_id": user_id}
+        query = {"user_id": user_id, **self.MESSAGES_ONLY}
         if session_id:
             query["session_id"] = session_id
         
+        if cursor:
+            query = {"$and": [query, keyset_filter(cursor)]}
+            skip = 0
+        
         chats = list(
-            self.collection.find(query)
-            .sort("timestamp", -1)
+            self.collection.find(query, projection)
+            .sort(KEYSET_SORT)
             .skip(skip)
             .limit(limit)
         )
         
         return chats
     
-    def get_session_chats(self, user_id: str, session_id: str) -> List[Dict[str, Any]]:
-        """Get all messages from a specific session"""
+    def get_session_chats(self, user_id: str, session_id: str,
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get messages from a specific session, oldest first
+        
+        Args:
+            user_id: User ID
+            session_id: Session/conversation ID
+            limit: Only return the most recent N messages
+        """
+        query = {
+            "user_id": user_id,
+            "session_id": session_id,
+            **self.MESSAGES_ONLY
+        }
+        if limit:
+            chats = list(
+                self.collection.find(query)
+                .sort([("timestamp", -1), ("_id", -1)])
+                .limit(limit)
+            )
+            chats.reverse()
+            return chats
+        
         chats = list(
-            self.collection.find({
-                "user_id": user_id,
-                "session_id": session_id
-            })
+            self.collection.find(query)
             .sort("timestamp", 1)
         )
         return chats
     
+    def get_last_message_id(self, user_id: str, session_id: str) -> Optional[ObjectId]:
+        """Get the _id of the newest message in a session"""
+        latest = self.collection.find_one(
+            {"user_id": user_id, "session_id": session_id, **self.MESSAGES_ONLY},
+            {"_id": 1},
+            sort=[("timestamp", -1), ("_id", -1)]
+        )
+        return latest["_id"] if latest else None
+    
     def get_user_sessions(self, user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Get list of user's chat sessions with summary"""
         pipeline = [
-            {"$match": {"user_id": user_id}},
+            {"$match": {"user_id": user_id, **self.MESSAGES_ONLY}},
             {"$sort": {"timestamp": -1}},
             {
                 "$group": {
@@ -112,6 +147,43 @@ class Chat:
         sessions = list(self.collection.aggregate(pipeline))
         return sessions
     
+    def get_session_summary(self, user_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the rolling summary of a session's older turns, if one exists"""
+        return self.collection.find_one({
+            "user_id": user_id,
+            "session_id": session_id,
+            "role": self.SUMMARY_ROLE
+        })
+    
+    def save_session_summary(self, user_id: str, session_id: str, summary: str,
+                             covered_until: str, covered_messages: int) -> None:
+        """
+        Create or replace a session's rolling summary
+        
+        Args:
+            user_id: User ID
+            session_id: Session/conversation ID
+            summary: Summary text
+            covered_until: Fingerprint of the newest message folded into the summary
+            covered_messages: Total number of messages the summary covers
+        """
+        self.collection.update_one(
+            {
+                "user_id": user_id,
+                "session_id": session_id,
+                "role": self.SUMMARY_ROLE
+            },
+            {
+                "$set": {
+                    "content": summary,
+                    "covered_until": covered_until,
+                    "covered_messages": covered_messages,
+                    "timestamp": datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+    
     def add_feedback(self, message_id: str, user_id: str, rating: int, 
                     comment: Optional[str] = None) -> bool:
         """
@@ -238,7 +310,7 @@ class Chat:
     def get_chat_analytics(self, user_id: str) -> Dict[str, Any]:
         """Get analytics for user's chat history"""
         pipeline = [
-            {"$match": {"user_id": user_id}},
+            {"$match": {"user_id": user_id, **self.MESSAGES_ONLY}},
             {
                 "$group": {
                     "_id": None,
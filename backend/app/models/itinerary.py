@@ -1,8 +1,7 @@
 """Itinerary model for MongoDB"""
 from typing import Optional, Dict, Any
 from datetime import datetime
-from pymongo import MongoClient
-from app.config.settings import Config
+from app.config.database import get_collection
 from app.utils.logger import logger
 
 class ItineraryModel:
@@ -11,14 +10,10 @@ class ItineraryModel:
     def __init__(self):
         """Initialize MongoDB connection"""
         try:
-            self.client = MongoClient(Config.MONGO_URI)
-            self.db = self.client[Config.DB_NAME]
-            self.collection = self.db['itineraries']
+            self.collection = get_collection('itineraries')
             logger.info("Itinerary model initialized")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            self.client = None
-            self.db = None
             self.collection = None
     
     def create_itinerary(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -31,7 +26,7 @@ class ItineraryModel:
         Returns:
             Created itinerary document
         """
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -62,7 +57,7 @@ class ItineraryModel:
     
     def get_itinerary(self, itinerary_id: str) -> Dict[str, Any]:
         """Get itinerary by ID"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -78,7 +73,7 @@ class ItineraryModel:
     
     def get_user_itineraries(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
         """Get all itineraries for a user"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available', 'data': []}
         
         try:
@@ -1,8 +1,7 @@
 """Place model for MongoDB"""
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pymongo import MongoClient
-from app.config.settings import Config
+from app.config.database import get_collection
 from app.utils.logger import logger
 
 class PlaceModel:
@@ -11,14 +10,10 @@ class PlaceModel:
     def __init__(self):
         """Initialize MongoDB connection"""
         try:
-            self.client = MongoClient(Config.MONGO_URI)
-            self.db = self.client[Config.DB_NAME]
-            self.collection = self.db['places']
+            self.collection = get_collection('places')
             logger.info("Place model initialized")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            self.client = None
-            self.db = None
             self.collection = None
     
     def create_place(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -31,7 +26,7 @@ class PlaceModel:
         Returns:
             Created place document
         """
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -65,7 +60,7 @@ class PlaceModel:
     
     def get_place(self, place_id: str) -> Dict[str, Any]:
         """Get place by ID"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -98,7 +93,7 @@ class PlaceModel:
         Returns:
             List of matching places
         """
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available', 'data': []}
         
         try:
@@ -138,7 +133,7 @@ class PlaceModel:
     
     def get_popular_places(self, limit: int = 10) -> Dict[str, Any]:
         """Get popular places"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available', 'data': []}
         
         try:
@@ -1,8 +1,7 @@
 """Tourist model for MongoDB"""
 from typing import Optional, Dict, Any
 from datetime import datetime
-from pymongo import MongoClient
-from app.config.settings import Config
+from app.config.database import get_collection
 from app.utils.logger import logger
 
 class TouristModel:
@@ -11,14 +10,10 @@ class TouristModel:
     def __init__(self):
         """Initialize MongoDB connection"""
         try:
-            self.client = MongoClient(Config.MONGO_URI)
-            self.db = self.client[Config.DB_NAME]
-            self.collection = self.db['tourists']
+            self.collection = get_collection('tourists')
             logger.info("Tourist model initialized")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            self.client = None
-            self.db = None
             self.collection = None
     
     def create_tourist(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -31,7 +26,7 @@ class TouristModel:
         Returns:
             Created tourist document
         """
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -60,7 +55,7 @@ class TouristModel:
     
     def get_tourist(self, tourist_id: str) -> Dict[str, Any]:
         """Get tourist by ID"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -76,7 +71,7 @@ class TouristModel:
     
     def update_tourist(self, tourist_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update tourist data"""
-        if not self.collection:
+        if self.collection is None:
             return {'success': False, 'message': 'Database not available'}
         
         try:
@@ -6,21 +6,14 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 import bcrypt
 from bson import ObjectId
+from app.config.database import get_collection
 
 
 class User:
     """User model for authentication and profile management"""
     
     def __init__(self, db):
-        self.collection = db.users
-        self._ensure_indexes()
-    
-    def _ensure_indexes(self):
-        """Create indexes for efficient queries"""
-        # Unique index on email
-        self.collection.create_index("email", unique=True)
-        # Index on created_at for sorting
-        self.collection.create_index("created_at")
+        self.collection = get_collection('users', db)
     
     @staticmethod
     def hash_password(password: str) -> str:
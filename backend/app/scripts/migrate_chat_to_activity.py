@@ -12,6 +12,7 @@ Run kaise kare:
 from app.config.database import get_database
 from app.models.chat import Chat
 from app.models.activity import Activity
+from app.models.activity_rollup import ActivityRollup
 from datetime import datetime
 
 
@@ -87,8 +88,8 @@ def migrate_chat_history_to_activities():
                     skipped_count += 1
                     continue
                 
-                # Insert activity
-                activity_model.collection.insert_one(activity_data)
+                # Insert activity (and fold it into the daily rollups)
+                activity_model.insert_activities([activity_data])
                 migrated_count += 1
                 
                 if migrated_count % 100 == 0:
@@ -145,6 +146,9 @@ def rollback_migration():
         
         print(f"✅ Rollback completed! Deleted {result.deleted_count} activities")
         
+        # Recompute rollups without the deleted activities
+        ActivityRollup(db).rebuild(activity_collection)
+        
     except Exception as e:
         print(f"❌ Rollback failed: {str(e)}")
 
@@ -0,0 +1,219 @@
+"""Fan-out of travel alert changes to server-sent event subscribers"""
+import itertools
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.models.alert import Alert
+from app.services.alert_service import AlertService, get_alert_service
+from app.utils.concurrency import OverloadedError
+from app.utils.geo import haversine_km, point_coordinates
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class AlertSubscription:
+    """One connected client and the region it cares about"""
+
+    def __init__(
+        self,
+        subscription_id: int,
+        lat: Optional[float],
+        lon: Optional[float],
+        radius_km: float,
+        place: Optional[str],
+        queue_size: int
+    ):
+        self.id = subscription_id
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+        self.place = place.lower() if place else None
+        self.closed = False
+        self._events: queue.Queue = queue.Queue(maxsize=queue_size)
+
+    def matches(self, alert: Dict[str, Any]) -> bool:
+        """Check whether an alert affects this subscriber's region"""
+        if self.lat is not None and self.lon is not None:
+            distance = haversine_km(self.lat, self.lon, *point_coordinates(alert['region']))
+            return distance <= alert['radius_km'] + self.radius_km
+        if self.place:
+            return self.place in alert['location'].lower()
+        return True
+
+    def offer(self, event: Tuple[int, str, Dict[str, Any]]) -> bool:
+        """Queue an event without blocking; returns False if the subscriber fell behind"""
+        try:
+            self._events.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def next_event(self, timeout: float) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """Wait up to timeout for the next (id, name, data) event"""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.closed = True
+        # Wake the connection's thread so it notices promptly
+        try:
+            self._events.put_nowait((0, 'closed', {}))
+        except queue.Full:
+            pass
+
+
+class AlertHub:
+    """
+    Delivers alert changes to every subscriber whose region they affect
+
+    Publishing never blocks: each subscriber has a bounded queue, and one
+    that falls behind is disconnected (its EventSource reconnects and gets
+    a fresh snapshot). While anyone is subscribed, a single watcher thread
+    checks the alerts store every ALERTS_STREAM_POLL_INTERVAL seconds, so
+    changes written by other processes are pushed within seconds; changes
+    made through this process's AlertService are pushed immediately.
+    """
+
+    def __init__(
+        self,
+        alert_service: AlertService,
+        max_subscribers: int = 500,
+        queue_size: int = 100,
+        poll_interval: float = 5.0
+    ):
+        self.alert_service = alert_service
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[int, AlertSubscription] = {}
+        self._ids = itertools.count(1)
+        self._event_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._stats = {'subscribed': 0, 'rejected': 0, 'events_published': 0, 'deliveries': 0, 'dropped_slow': 0}
+        alert_service.add_listener(self.publish)
+        metrics.register_collector('alert_hub', self.stats)
+
+    def subscribe(
+        self,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius_km: Optional[float] = None,
+        place: Optional[str] = None
+    ) -> AlertSubscription:
+        """
+        Register a subscriber
+
+        Raises:
+            OverloadedError: If max_subscribers are already connected
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self._stats['rejected'] += 1
+                raise OverloadedError('alerts_stream', 'too many subscribers', retry_after=30)
+            subscription = AlertSubscription(
+                next(self._ids),
+                lat,
+                lon,
+                Config.ALERTS_DEFAULT_RADIUS_KM if radius_km is None else radius_km,
+                place,
+                self.queue_size
+            )
+            self._subscribers[subscription.id] = subscription
+            self._stats['subscribed'] += 1
+            self._ensure_watcher()
+        self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: AlertSubscription) -> None:
+        """Remove a subscriber (safe to call more than once)"""
+        with self._lock:
+            self._subscribers.pop(subscription.id, None)
+        subscription.closed = True
+
+    def publish(self, changed: List[Dict[str, Any]], removed: List[str]) -> None:
+        """Push added/updated alerts and withdrawn alert ids to matching subscribers"""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+            self._stats['events_published'] += len(changed) + len(removed)
+
+        events = [(alert, Alert.to_dict(alert)) for alert in changed]
+        slow = []
+        deliveries = 0
+        for subscription in subscribers:
+            queued = True
+            for alert, payload in events:
+                if subscription.matches(alert):
+                    queued = subscription.offer((next(self._event_ids), 'alert', payload))
+                    deliveries += 1
+                    if not queued:
+                        break
+            # Ids are cheap to send and clients ignore ones they never saw
+            for alert_id in removed if queued else ():
+                queued = subscription.offer((next(self._event_ids), 'withdrawn', {'id': alert_id}))
+                deliveries += 1
+                if not queued:
+                    break
+            if not queued:
+                slow.append(subscription)
+
+        for subscription in slow:
+            self.unsubscribe(subscription)
+            subscription.close()
+        with self._lock:
+            self._stats['deliveries'] += deliveries
+            self._stats['dropped_slow'] += len(slow)
+
+    def _ensure_watcher(self) -> None:
+        # Caller holds the lock
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher = threading.Thread(target=self._watch, name='alert-hub-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self._subscribers
+            if idle:
+                # Sleep until someone subscribes; nothing to poll for meanwhile
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                self.alert_service.check_for_changes()
+            except Exception as e:
+                logger.warning(f"Alert change check failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get subscriber and delivery counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['subscribers'] = len(self._subscribers)
+        stats['max_subscribers'] = self.max_subscribers
+        return stats
+
+
+# Singleton instance
+_alert_hub: Optional[AlertHub] = None
+_alert_hub_lock = threading.Lock()
+
+def get_alert_hub() -> AlertHub:
+    """Get or create the alert hub"""
+    global _alert_hub
+    if _alert_hub is None:
+        with _alert_hub_lock:
+            if _alert_hub is None:
+                _alert_hub = AlertHub(
+                    get_alert_service(),
+                    max_subscribers=Config.ALERTS_STREAM_MAX_SUBSCRIBERS,
+                    queue_size=Config.ALERTS_STREAM_QUEUE_SIZE,
+                    poll_interval=Config.ALERTS_STREAM_POLL_INTERVAL
+                )
+    return _alert_hub
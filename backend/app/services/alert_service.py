@@ -0,0 +1,249 @@
+"""Travel alerts served from an in-memory spatial snapshot of the alerts collection"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.models.alert import Alert
+from app.services.place_matcher import get_place_matcher
+from app.utils.geo import GeoGrid, point_coordinates
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class _Snapshot:
+    """Active alerts at one point in time, with a grid index over their regions"""
+
+    def __init__(self, alerts: List[Dict[str, Any]], version: Tuple, cell_degrees: float):
+        self.alerts = alerts
+        self.version = version
+        self.loaded_at = time.time()
+        self.grid = GeoGrid(cell_degrees)
+        for alert in alerts:
+            lat, lon = point_coordinates(alert['region'])
+            self.grid.insert(lat, lon, alert['radius_km'], alert)
+
+
+class AlertService:
+    """
+    Answers "which alerts apply here" for a point or a known place
+
+    Reads come from an immutable snapshot of the active alerts with a grid
+    index, so a lookup touches only the alerts registered in the query's
+    cell. Writes through this service swap the snapshot immediately; writes
+    from other processes (and TTL expiry) are picked up by a cheap version
+    check every ALERTS_SNAPSHOT_CHECK_INTERVAL seconds. Listeners are told
+    about every alert a reload adds, updates or removes. With the snapshot
+    disabled, point lookups go straight to the 2dsphere index.
+    """
+
+    SEVERITY_ORDER = {'high': 0, 'moderate': 1, 'low': 2}
+
+    def __init__(self, alert_model: Optional[Alert] = None):
+        self._alert_model = alert_model
+        self.snapshot_enabled = Config.ALERTS_SNAPSHOT_ENABLED
+        self.check_interval = Config.ALERTS_SNAPSHOT_CHECK_INTERVAL
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]], List[str]], None]] = []
+        self._lock = threading.Lock()
+        self._stats = {'lookups': 0, 'snapshot_loads': 0, 'version_checks': 0, 'refresh_failures': 0}
+        metrics.register_collector('alerts', self.stats)
+
+    @property
+    def alert_model(self) -> Alert:
+        if self._alert_model is None:
+            from app.config.database import get_database
+            self._alert_model = Alert(get_database())
+        return self._alert_model
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]], List[str]], None]) -> None:
+        """
+        Call listener(added_or_updated_alerts, removed_ids) whenever a reload changes the snapshot
+
+        Listeners run on the thread that reloaded and must not block.
+        """
+        self._listeners.append(listener)
+
+    def _load(self, version: Optional[Tuple] = None) -> _Snapshot:
+        if version is None:
+            version = self.alert_model.get_version()
+        previous = self._snapshot
+        snapshot = _Snapshot(self.alert_model.get_active_alerts(), version, Config.ALERTS_GRID_CELL_DEGREES)
+        self._snapshot = snapshot
+        self._checked_at = time.time()
+        self._count('snapshot_loads')
+        if previous is not None:
+            self._notify(previous, snapshot)
+        return snapshot
+
+    def _notify(self, previous: _Snapshot, snapshot: _Snapshot) -> None:
+        before = {alert['_id']: alert['updated_at'] for alert in previous.alerts}
+        after = {alert['_id'] for alert in snapshot.alerts}
+        changed = [alert for alert in snapshot.alerts if before.get(alert['_id']) != alert['updated_at']]
+        removed = [str(alert_id) for alert_id in before if alert_id not in after]
+        if changed or removed:
+            self._publish(changed, removed)
+
+    def _publish(self, changed: List[Dict[str, Any]], removed: List[str]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(changed, removed)
+            except Exception as e:
+                logger.warning(f"Alert listener failed: {str(e)}")
+
+    def _current(self, force: bool = False) -> _Snapshot:
+        snapshot = self._snapshot
+        if not force and snapshot is not None and time.time() - self._checked_at < self.check_interval:
+            return snapshot
+
+        # One caller checks for changes; others keep serving the current snapshot
+        if not force and snapshot is not None and not self._refresh_lock.acquire(blocking=False):
+            return snapshot
+        if force or snapshot is None:
+            self._refresh_lock.acquire()
+        try:
+            if not force and self._snapshot is not snapshot:
+                return self._snapshot
+            if self._snapshot is None:
+                return self._load()
+            self._count('version_checks')
+            version = self.alert_model.get_version()
+            if version == self._snapshot.version:
+                self._checked_at = time.time()
+                return self._snapshot
+            return self._load(version)
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            logger.warning(f"Alert snapshot refresh failed, serving previous snapshot: {str(e)}")
+            self._count('refresh_failures')
+            self._checked_at = time.time()
+            return self._snapshot
+        finally:
+            self._refresh_lock.release()
+
+    def check_for_changes(self) -> None:
+        """Reload now if the collection changed since the last check"""
+        if self.snapshot_enabled:
+            self._current(force=True)
+
+    def _after_write(self, changed: List[Dict[str, Any]], removed: List[str]) -> None:
+        # The reload diffs against the previous snapshot and publishes the change itself
+        if self.snapshot_enabled:
+            with self._refresh_lock:
+                if self._snapshot is not None:
+                    try:
+                        self._load()
+                        return
+                    except Exception as e:
+                        logger.warning(f"Alert snapshot reload after write failed: {str(e)}")
+                        self._checked_at = 0.0
+        self._publish(changed, removed)
+
+    def get_alerts(
+        self,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        place: Optional[str] = None,
+        radius_km: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Get active alerts, optionally only those affecting a point or place
+
+        Args:
+            lat, lon: Point to check (takes precedence over place)
+            place: Place name, resolved to coordinates via the place catalogue;
+                unknown names fall back to matching the alert's location text
+            radius_km: Also include alerts whose region is this close to the point
+
+        Returns:
+            {'alerts': [...], 'count', and 'center' when a point was used}
+        """
+        self._count('lookups')
+        if radius_km is None:
+            radius_km = Config.ALERTS_DEFAULT_RADIUS_KM
+
+        if (lat is None or lon is None) and place:
+            coordinates = get_place_matcher().get_coordinates(place)
+            if coordinates:
+                lat, lon = coordinates
+
+        now = datetime.utcnow()
+        center = None
+        if lat is not None and lon is not None:
+            center = {'lat': lat, 'lon': lon}
+            if self.snapshot_enabled:
+                alerts = []
+                for alert, distance in self._current().grid.covering(lat, lon, radius_km):
+                    if alert['valid_until'] > now:
+                        alerts.append(dict(alert, distance_km=round(distance, 1)))
+            else:
+                alerts = self.alert_model.find_near(lat, lon, radius_km)
+        else:
+            if self.snapshot_enabled:
+                alerts = [alert for alert in self._current().alerts if alert['valid_until'] > now]
+            else:
+                alerts = self.alert_model.get_active_alerts()
+            if place:
+                place_lower = place.lower()
+                alerts = [alert for alert in alerts if place_lower in alert['location'].lower()]
+
+        alerts.sort(key=lambda alert: (
+            self.SEVERITY_ORDER.get(alert['severity'], len(self.SEVERITY_ORDER)),
+            alert.get('distance_km', 0.0),
+            alert['valid_until']
+        ))
+        result = {
+            'alerts': [Alert.to_dict(alert) for alert in alerts],
+            'count': len(alerts)
+        }
+        if center:
+            result['center'] = center
+        return result
+
+    def create_alert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create an alert and make it visible to lookups immediately
+
+        Raises:
+            ValueError: If the data is invalid
+        """
+        alert = self.alert_model.create_alert(data)
+        self._after_write([alert], [])
+        return Alert.to_dict(alert)
+
+    def delete_alert(self, alert_id: str) -> bool:
+        """Delete an alert; returns False if it did not exist"""
+        deleted = self.alert_model.delete_alert(alert_id)
+        if deleted:
+            self._after_write([], [alert_id])
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Get lookup and snapshot counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        snapshot = self._snapshot
+        stats['snapshot_alerts'] = len(snapshot.alerts) if snapshot else 0
+        stats['snapshot_age_seconds'] = round(time.time() - snapshot.loaded_at, 1) if snapshot else None
+        return stats
+
+
+# Singleton instance
+_alert_service: Optional[AlertService] = None
+_alert_service_lock = threading.Lock()
+
+def get_alert_service() -> AlertService:
+    """Get or create the alert service"""
+    global _alert_service
+    if _alert_service is None:
+        with _alert_service_lock:
+            if _alert_service is None:
+                _alert_service = AlertService()
+    return _alert_service
@@ -0,0 +1,162 @@
+"""Autocomplete index for place search-as-you-type"""
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class AutocompleteIndex:
+    """
+    Prefix and infix lookup over names and aliases, ranked by popularity
+
+    Prefix matches come from a sorted array of normalized terms (plus every
+    word-start suffix, so "corb" finds "Jim Corbett National Park") searched
+    with bisect. Any prefix whose range is wider than range_threshold gets
+    its top-k precomputed, so a lookup never ranks more than that many
+    entries. Infix matches come from trigram postings (and exact postings for
+    one- and two-character queries) and are only consulted when prefix
+    matches do not fill the requested limit.
+    """
+
+    def __init__(self, range_threshold: int = 64, cached_top_k: int = 10):
+        self.range_threshold = range_threshold
+        self.cached_top_k = cached_top_k
+        self._keys: List[str] = []
+        self._key_items: List[int] = []
+        self._terms: List[str] = []
+        self._term_items: List[int] = []
+        self._trigram_postings: Dict[str, List[int]] = {}
+        self._short_postings: Dict[str, List[int]] = {}
+        self._popularity: List[float] = []
+        self._prefix_top: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase and collapse whitespace"""
+        return re.sub(r'\s+', ' ', text.lower()).strip()
+
+    def build(self, items: Iterable[Tuple[Sequence[str], float]]) -> None:
+        """
+        Build the index
+
+        Args:
+            items: (terms, popularity) per item; results are item positions
+        """
+        keys = []
+        self._terms = []
+        self._term_items = []
+        self._popularity = []
+
+        terms_by_item = []
+        for item_idx, (terms, popularity) in enumerate(items):
+            self._popularity.append(popularity)
+            normalized = sorted({self.normalize(t) for t in terms if t})
+            terms_by_item.append(normalized)
+            for term in normalized:
+                # Every word start is a prefix entry point
+                keys.append((term, item_idx))
+                for match in re.finditer(r' (?=\S)', term):
+                    keys.append((term[match.end():], item_idx))
+
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_items = [item for _, item in keys]
+
+        # Term ids follow rank order, so every trigram posting list is ranked too
+        for item_idx in sorted(range(len(terms_by_item)), key=self._rank_key, reverse=True):
+            for term in terms_by_item[item_idx]:
+                self._terms.append(term)
+                self._term_items.append(item_idx)
+
+        self._trigram_postings = {}
+        self._short_postings = {}
+        for term_idx, term in enumerate(self._terms):
+            for gram in {term[i:i + 3] for i in range(len(term) - 2)}:
+                self._trigram_postings.setdefault(gram, []).append(term_idx)
+            # Queries too short for a trigram look up their own substring
+            for gram in {term[i:i + n] for n in (1, 2) for i in range(len(term) - n + 1)}:
+                self._short_postings.setdefault(gram, []).append(term_idx)
+
+        # Wide prefix ranges are ranked once here instead of on every keystroke
+        self._prefix_top = {}
+        self._cache_wide_prefixes()
+
+    def _cache_wide_prefixes(self) -> None:
+        """Precompute top-k for every prefix whose key range exceeds the threshold"""
+        stack = [(0, len(self._keys), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= self.range_threshold:
+                continue
+            if depth:
+                prefix = self._keys[lo][:depth]
+                self._prefix_top[prefix] = self._top(set(self._key_items[lo:hi]), self.cached_top_k)
+
+            # Keys equal to the prefix sort first; split the rest by their next character
+            i = lo
+            while i < hi and len(self._keys[i]) == depth:
+                i += 1
+            while i < hi:
+                next_prefix = self._keys[i][:depth + 1]
+                j = bisect_left(self._keys, next_prefix + '\uffff', i, hi)
+                stack.append((i, j, depth + 1))
+                i = j
+
+    def _rank_key(self, item_idx: int) -> Tuple[float, int]:
+        # Most popular first; earlier items win ties
+        return (self._popularity[item_idx], -item_idx)
+
+    def _top(self, item_ids: Iterable[int], k: int) -> List[int]:
+        return heapq.nlargest(k, item_ids, key=self._rank_key)
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Find the top items for a partially typed query
+
+        Args:
+            query: Partial name
+            limit: Maximum number of results
+
+        Returns:
+            Item positions, prefix matches first, each group by popularity
+        """
+        query = self.normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        results = self._prefix_search(query, limit)
+        if len(results) < limit:
+            seen = set(results)
+            results.extend(self._infix_search(query, limit - len(results), seen))
+        return results
+
+    def _prefix_search(self, query: str, limit: int) -> List[int]:
+        if query in self._prefix_top and limit <= self.cached_top_k:
+            return self._prefix_top[query][:limit]
+
+        lo = bisect_left(self._keys, query)
+        hi = bisect_left(self._keys, query + '\uffff', lo)
+        return self._top(set(self._key_items[lo:hi]), limit)
+
+    def _infix_search(self, query: str, limit: int, exclude: set) -> List[int]:
+        if len(query) < 3:
+            postings = [self._short_postings.get(query)]
+        else:
+            grams = {query[i:i + 3] for i in range(len(query) - 2)}
+            postings = [self._trigram_postings.get(gram) for gram in grams]
+        if not all(postings):
+            return []
+
+        # Walk the rarest trigram's postings in rank order, verifying the
+        # substring directly, and stop as soon as the limit is filled
+        results = []
+        seen = set(exclude)
+        for term_idx in min(postings, key=len):
+            item_idx = self._term_items[term_idx]
+            if item_idx in seen or query not in self._terms[term_idx]:
+                continue
+            seen.add(item_idx)
+            results.append(item_idx)
+            if len(results) == limit:
+                break
+        return results
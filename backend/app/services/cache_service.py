@@ -0,0 +1,213 @@
+"""Response caching with pluggable storage backends"""
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+def make_cache_key(payload: Any) -> str:
+    """
+    Build a content-addressed key from a JSON-serializable payload
+
+    Args:
+        payload: Normalized data identifying the cached response
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class LRUCacheBackend:
+    """In-process LRU store with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate what they get back, so never hand out the stored object
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store an entry that expires after ttl seconds"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MongoCacheBackend:
+    """MongoDB-backed store; expired documents are reaped by the registered TTL index"""
+
+    def __init__(self, collection_name: str = 'response_cache'):
+        from app.config.database import get_collection
+
+        self.collection = get_collection(collection_name)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry, or None if missing or expired"""
+        # The TTL monitor only runs once a minute, so filter on expiry as well
+        doc = self.collection.find_one({
+            '_id': key,
+            'expires_at': {'$gt': datetime.utcnow()}
+        })
+        return doc['value'] if doc else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """Store an entry that expires after ttl seconds"""
+        now = datetime.utcnow()
+        self.collection.replace_one(
+            {'_id': key},
+            {
+                '_id': key,
+                'value': value,
+                'created_at': now,
+                'expires_at': now + timedelta(seconds=ttl)
+            },
+            upsert=True
+        )
+
+    def delete(self, key: str) -> None:
+        """Remove an entry"""
+        self.collection.delete_one({'_id': key})
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self.collection.delete_many({})
+
+    def __len__(self) -> int:
+        return self.collection.estimated_document_count()
+
+
+class ResponseCache:
+    """Namespaced cache with a default TTL and hit/miss accounting"""
+
+    def __init__(self, namespace: str, backend: Any, default_ttl: int = 3600):
+        self.namespace = namespace
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+        metrics.register_collector(f'cache.{namespace}', self.stats)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Backend failures are logged and treated as a miss so that the
+        cache can never take a request down with it.
+        """
+        try:
+            value = self.backend.get(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache '{self.namespace}' read failed: {str(e)}")
+            value = None
+            with self._lock:
+                self._errors += 1
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value, using the cache default TTL unless ttl is given"""
+        try:
+            self.backend.set(self._key(key), value, ttl or self.default_ttl)
+        except Exception as e:
+            logger.warning(f"Cache '{self.namespace}' write failed: {str(e)}")
+            with self._lock:
+                self._errors += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a cached value"""
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Cache '{self.namespace}' delete failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for this cache"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'backend': type(self.backend).__name__,
+                'default_ttl': self.default_ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'errors': self._errors,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def create_response_cache(
+    namespace: str,
+    backend: str = 'memory',
+    default_ttl: int = 3600,
+    max_entries: int = 1024
+) -> ResponseCache:
+    """
+    Create a response cache with the configured backend
+
+    Args:
+        namespace: Cache name, used to prefix keys and label stats
+        backend: 'memory' for an in-process LRU, 'mongo' for a shared collection
+        default_ttl: Default entry lifetime in seconds
+        max_entries: LRU capacity (memory backend only)
+
+    Returns:
+        ResponseCache instance
+    """
+    store = None
+    if backend == 'mongo':
+        try:
+            store = MongoCacheBackend()
+        except Exception as e:
+            logger.warning(f"Mongo cache backend unavailable for '{namespace}', using memory: {str(e)}")
+
+    if store is None:
+        store = LRUCacheBackend(max_entries=max_entries)
+
+    logger.info(f"Response cache '{namespace}' initialized ({type(store).__name__})")
+    return ResponseCache(namespace, store, default_ttl=default_ttl)
@@ -0,0 +1,130 @@
+"""Emergency contact directory with district and nearest-contact lookup"""
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from app.config.settings import Config
+from app.utils.geo import KDTree, valid_coordinates
+from app.utils.logger import logger
+
+
+# Served if the seed file cannot be loaded, so the statewide numbers are always available
+FALLBACK_CONTACTS = [
+    {'name': 'Police Emergency', 'number': '100', 'description': 'Emergency police assistance', 'category': 'police'},
+    {'name': 'Ambulance Emergency', 'number': '108', 'description': 'Medical emergency', 'category': 'ambulance'},
+    {'name': 'Fire Department', 'number': '101', 'description': 'Fire emergency', 'category': 'fire'},
+    {'name': 'Disaster Management', 'number': '1070', 'description': 'Natural disaster assistance', 'category': 'disaster'},
+    {'name': 'Women Helpline', 'number': '1091', 'description': 'Women safety and support', 'category': 'helpline'},
+    {'name': 'Child Helpline', 'number': '1098', 'description': 'Child protection services', 'category': 'helpline'},
+    {'name': 'Tourist Helpline', 'number': '1363', 'description': 'Tourism assistance and information', 'category': 'helpline'},
+]
+
+
+class ContactDirectory:
+    """
+    Emergency contacts loaded once from the seed file
+
+    Statewide numbers (no district) are always returned. Contacts with
+    coordinates go into a k-d tree per category plus one over all of them,
+    so the k nearest are found in microseconds; district lookups are a
+    dictionary read.
+    """
+
+    def __init__(self, contacts: List[Dict[str, Any]]):
+        self.contacts = [self._public(contact) for contact in contacts if contact.get('active', True)]
+        self.statewide = [contact for contact in self.contacts if not contact.get('district')]
+        self.by_district: Dict[str, List[Dict[str, Any]]] = {}
+        for contact in self.contacts:
+            if contact.get('district'):
+                self.by_district.setdefault(contact['district'].lower(), []).append(contact)
+
+        located = [contact for contact in self.contacts if 'lat' in contact]
+        self._trees: Dict[Optional[str], KDTree] = {
+            None: KDTree([(contact['lat'], contact['lon'], contact) for contact in located])
+        }
+        for category in {contact['category'] for contact in located}:
+            self._trees[category] = KDTree([
+                (contact['lat'], contact['lon'], contact)
+                for contact in located if contact['category'] == category
+            ])
+        logger.info(f"Contact directory loaded ({len(self.contacts)} contacts, {len(located)} located)")
+
+    @staticmethod
+    def _public(contact: Dict[str, Any]) -> Dict[str, Any]:
+        public = {
+            'name': contact['name'],
+            'number': contact['number'],
+            'description': contact.get('description', ''),
+            'category': contact.get('category', 'other')
+        }
+        if contact.get('district'):
+            public['district'] = contact['district']
+        if valid_coordinates(contact.get('lat'), contact.get('lon')):
+            public['lat'] = float(contact['lat'])
+            public['lon'] = float(contact['lon'])
+        return public
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ContactDirectory':
+        """Load the directory from a seed file ({"emergency_contacts": [...]})"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['emergency_contacts'])
+
+    @property
+    def categories(self) -> List[str]:
+        return sorted({contact['category'] for contact in self.contacts})
+
+    def _filter(self, contacts: List[Dict[str, Any]], category: Optional[str]) -> List[Dict[str, Any]]:
+        if not category:
+            return list(contacts)
+        return [contact for contact in contacts if contact['category'] == category]
+
+    def nearest(self, lat: float, lon: float, k: int = 5, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the k nearest located contacts with distance_km, nearest first"""
+        tree = self._trees.get(category or None)
+        if tree is None:
+            return []
+        return [
+            dict(contact, distance_km=round(distance, 1))
+            for contact, distance in tree.nearest(lat, lon, k)
+        ]
+
+    def lookup(
+        self,
+        category: Optional[str] = None,
+        district: Optional[str] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        k: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the contacts relevant to a place
+
+        Statewide numbers come first, then the k nearest contacts to
+        (lat, lon) if given, else the district's contacts if given, else
+        every contact.
+        """
+        if lat is not None and lon is not None:
+            return self._filter(self.statewide, category) + self.nearest(lat, lon, k, category)
+        if district:
+            return self._filter(self.statewide, category) + self._filter(
+                self.by_district.get(district.lower(), []), category
+            )
+        return self._filter(self.contacts, category)
+
+
+# Singleton instance
+_contact_directory: Optional[ContactDirectory] = None
+_contact_directory_lock = threading.Lock()
+
+def get_contact_directory() -> ContactDirectory:
+    """Get or load the contact directory"""
+    global _contact_directory
+    if _contact_directory is None:
+        with _contact_directory_lock:
+            if _contact_directory is None:
+                try:
+                    _contact_directory = ContactDirectory.from_file(Config.EMERGENCY_CONTACTS_FILE)
+                except Exception as e:
+                    logger.error(f"Failed to load emergency contacts from {Config.EMERGENCY_CONTACTS_FILE}: {str(e)}")
+                    _contact_directory = ContactDirectory(FALLBACK_CONTACTS)
+    return _contact_directory
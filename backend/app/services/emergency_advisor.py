@@ -0,0 +1,467 @@
+"""Offline emergency advice with background AI enrichment for unmatched cases"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.services.cache_service import create_response_cache, make_cache_key
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class EmergencyAdvisor:
+    """
+    Answers emergency situations from a curated knowledge base
+
+    A situation is classified by keyword/phrase scoring against an inverted
+    index built once at startup, so advice is returned in well under a
+    millisecond and works without any network. Only situations that match
+    no template are sent to Gemini, in the background; the enriched answer
+    is cached and can be fetched by its enrichment id.
+    """
+
+    # Contacts referenced by situation templates (see the emergency contacts seed file)
+    CONTACTS = {
+        '112': 'Emergency (all services)',
+        '108': 'Ambulance',
+        '1070': 'State Disaster Control Room',
+        '100': 'Police',
+        '1363': 'Tourist Helpline'
+    }
+
+    HEADERS = {
+        'english': 'Immediate steps',
+        'hindi': 'तुरंत करें',
+        'garhwali': 'तुरंत कर्या',
+        'kumaoni': 'तुरंत करौ'
+    }
+
+    CALL_LABELS = {
+        'english': 'Call',
+        'hindi': 'कॉल करें',
+        'garhwali': 'फोन कर्या',
+        'kumaoni': 'फोन करौ'
+    }
+
+    # \w alone splits Devanagari words at vowel signs and viramas
+    TOKEN_PATTERN = re.compile(r'[\w\u0900-\u097F]+')
+
+    # Keywords are matched as word prefixes, except English keywords of up to
+    # four letters, which must be the whole word (so 'board' is not 'boar')
+    # and list their inflections; phrases are matched as substrings.
+    # Devanagari and romanized Hindi keywords cover all four languages.
+    SITUATIONS = {
+        'landslide': {
+            'keywords': ['landslide', 'landslip', 'rockfall', 'mudslide', 'debris', 'boulder',
+                         'bhuskhalan', 'malba', 'भूस्खलन', 'मलबा', 'चट्टान', 'पत्थर'],
+            'phrases': ['falling rocks', 'road blocked', 'road closed', 'hill collapsed',
+                        'रास्ता बंद', 'सड़क बंद', 'पहाड़ टूट', 'पत्थर गिर'],
+            'contacts': ['112', '1070', '108'],
+            'advice': {
+                'english': [
+                    'Move away from the slope and the slide path at once, to higher, open ground to the side of it.',
+                    'Do not try to cross fresh debris or drive through a blocked stretch; more material often follows.',
+                    'Watch and listen for cracking trees, rumbling or muddy water in streams, which signal further slides.',
+                    'Help injured people only if the area is safe; do not move anyone with a suspected spine injury.',
+                    'Report the blockage to the disaster control room and wait for the road to be officially cleared.'
+                ],
+                'hindi': [
+                    'तुरंत ढलान और मलबे के रास्ते से हटकर किनारे की ऊँची, खुली जगह पर जाएँ।',
+                    'ताज़ा मलबे को पार करने या बंद रास्ते से गाड़ी निकालने की कोशिश न करें; और मलबा गिर सकता है।',
+                    'पेड़ों के चटकने, गड़गड़ाहट या नालों में मटमैले पानी पर ध्यान दें, ये और भूस्खलन के संकेत हैं।',
+                    'सुरक्षित होने पर ही घायलों की मदद करें; रीढ़ की चोट की आशंका हो तो व्यक्ति को न हिलाएँ।',
+                    'आपदा नियंत्रण कक्ष को सूचना दें और रास्ता आधिकारिक रूप से खुलने तक प्रतीक्षा करें।'
+                ],
+                'garhwali': [
+                    'तुरंत ढलान अर मलबा का रस्ता बटि हटिक किनारा की ऊँची, खुली जगा मा जावा।',
+                    'नयो मलबा पार करण या बंद रस्ता बटि गाड़ी निकालण की कोशिश नि कर्या; और मलबा गिर सकदू।',
+                    'डाळा चटकण, गड़गड़ाहट या गदेरा मा मटमैलो पाणी पर ध्यान द्यावा, यो और भूस्खलन का संकेत छन।',
+                    'सुरक्षित होण पर ही घायल लोगु की मदद कर्या; रीढ़ की चोट को डर हो त आदमी कु नि हिलावा।',
+                    'आपदा नियंत्रण कक्ष कु खबर द्यावा अर रस्ता खुलण तक इंतजार कर्या।'
+                ],
+                'kumaoni': [
+                    'तुरंत ढलान और मलब क बाट बटी हटि बेर किनार क ऊँच, खुली जाग में जाओ।',
+                    'नई मलब पार करण या बंद बाट बटी गाड़ी निकालण क कोशिश नि करौ; और मलब गिर सकूँ।',
+                    'बोट चटकण, गड़गड़ाहट या गधेर में मटमैल पाणि पर ध्यान दिया, यो और भूस्खलन क संकेत छन।',
+                    'सुरक्षित हुण पर ही घायलों कि मदद करौ; रीढ़ कि चोट क डर हो त मैस कें नि हिलाओ।',
+                    'आपदा नियंत्रण कक्ष कें खबर दिया और बाट खुलण तक इंतजार करौ।'
+                ]
+            }
+        },
+        'altitude_sickness': {
+            'keywords': ['altitude', 'ams', 'hape', 'hace', 'breathless', 'breathing', 'dizzy', 'dizziness',
+                         'nausea', 'headache', 'oxygen', 'saans', 'सांस', 'साँस', 'ऊंचाई', 'ऊँचाई',
+                         'चक्कर', 'सिरदर्द', 'ऑक्सीजन'],
+            'phrases': ['mountain sickness', 'short of breath', 'shortness of breath', 'cannot breathe',
+                        "can't breathe", 'सांस फूल', 'साँस फूल', 'सांस नहीं', 'साँस नहीं'],
+            'contacts': ['108', '112'],
+            'advice': {
+                'english': [
+                    'Stop climbing immediately and rest; do not go higher while symptoms last.',
+                    'If breathlessness at rest, confusion, blue lips or loss of balance appear, descend at least 300-500 m now, even at night.',
+                    'Never leave the person alone and do not let them descend by themselves.',
+                    'Keep warm, drink water, and avoid alcohol and sleeping pills.',
+                    'Use supplemental oxygen if available and get medical help at the nearest health centre.'
+                ],
+                'hindi': [
+                    'तुरंत चढ़ाई रोकें और आराम करें; लक्षण रहने तक और ऊपर न जाएँ।',
+                    'आराम में भी सांस फूलना, भ्रम, होंठ नीले पड़ना या संतुलन बिगड़ना हो तो तुरंत कम से कम 300-500 मीटर नीचे उतरें, रात में भी।',
+                    'व्यक्ति को कभी अकेला न छोड़ें और उसे अकेले नीचे न उतरने दें।',
+                    'शरीर गर्म रखें, पानी पिएँ, शराब और नींद की गोलियों से बचें।',
+                    'ऑक्सीजन उपलब्ध हो तो दें और नज़दीकी स्वास्थ्य केंद्र से चिकित्सा सहायता लें।'
+                ],
+                'garhwali': [
+                    'तुरंत चढ़ाई रोका अर आराम कर्या; लक्षण रैण तक और ऐंच नि जावा।',
+                    'आराम मा भी सांस फूलण, भ्रम, होंठ नीला होण या संतुलन बिगड़ण पर तुरंत कम से कम 300-500 मीटर तौळ उतरा, रात मा भी।',
+                    'बीमार आदमी कु कभी यखुलि नि छोड़ा अर वै कु यखुलि तौळ नि जाण द्यावा।',
+                    'शरीर गरम रखा, पाणी प्यावा, दारू अर नींद की गोळी बटि बचा।',
+                    'ऑक्सीजन हो त द्यावा अर नजीक का स्वास्थ्य केंद्र बटि इलाज ल्यावा।'
+                ],
+                'kumaoni': [
+                    'तुरंत चढ़ाई रोकौ और आराम करौ; लक्षण रूण तक और मलि नि जाओ।',
+                    'आराम में लै सांस फूलण, भ्रम, होंठ नीला हुण या संतुलन बिगड़ण पर तुरंत कम से कम 300-500 मीटर तलि उतरौ, रात में लै।',
+                    'बिमार मैस कें कभै इकलै नि छोड़ौ और उकें इकलै तलि नि जाण दिया।',
+                    'शरीर गरम धरौ, पाणि पियौ, दारू और नींद कि गोली बटी बचौ।',
+                    'ऑक्सीजन हो त दिया और नजीक क स्वास्थ्य केंद्र बटी इलाज लियौ।'
+                ]
+            }
+        },
+        'snow': {
+            'keywords': ['snow', 'snows', 'snowy', 'snowing', 'snowed', 'snowfall', 'snowstorm', 'blizzard',
+                         'snowbound', 'avalanche', 'frostbite', 'hypothermia', 'freezing', 'frozen', 'icy', 'barf',
+                         'बर्फ', 'हिमस्खलन', 'शीतदंश', 'ठंड', 'ठण्ड'],
+            # Road phrases outweigh the landslide template's 'road closed' / 'road blocked'
+            'phrases': ['stuck in snow', 'due to snow', 'blocked by snow', 'snow on the road', 'very cold',
+                        'extreme cold', 'बर्फ में फंस', 'बर्फ से', 'बर्फ के कारण', 'बहुत ठंड'],
+            'contacts': ['112', '1070', '108'],
+            'advice': {
+                'english': [
+                    'Get into shelter (a building, vehicle or tent) and stay put; do not walk into whiteout or deep snow.',
+                    'Keep dry: replace wet clothes, cover head, hands and feet, and share body heat if needed.',
+                    'For numb, white or waxy skin, warm it gently with body heat; do not rub it or use direct fire.',
+                    'In a vehicle, run the engine only briefly and keep the exhaust pipe clear of snow.',
+                    'Keep avalanche slopes and gullies out of your route, and share your location with rescuers.'
+                ],
+                'hindi': [
+                    'किसी आश्रय (इमारत, गाड़ी या टेंट) में जाएँ और वहीं रहें; सफ़ेद धुंध या गहरी बर्फ में न चलें।',
+                    'सूखे रहें: गीले कपड़े बदलें, सिर, हाथ और पैर ढकें, ज़रूरत हो तो एक-दूसरे के शरीर की गर्मी साझा करें।',
+                    'सुन्न, सफ़ेद या मोम जैसी त्वचा को शरीर की गर्मी से धीरे-धीरे गर्म करें; रगड़ें नहीं, सीधे आग न लगाएँ।',
+                    'गाड़ी में हों तो इंजन कुछ देर ही चलाएँ और साइलेंसर पाइप को बर्फ से साफ़ रखें।',
+                    'हिमस्खलन वाली ढलानों और नालों से दूर रहें और बचाव दल को अपनी लोकेशन बताएँ।'
+                ],
+                'garhwali': [
+                    'कै आश्रय (मकान, गाड़ी या टेंट) मा जावा अर वखि रावा; सफेद धुंध या गैरी बर्फ मा नि हिटा।',
+                    'सुक्खा रावा: गीला कपड़ा बदला, मुंड, हाथ अर खुट्टा ढका, जरूरत हो त एक-दूसरा की गर्मी बांटा।',
+                    'सुन्न, सफेद या मोम जनी चमड़ी कु शरीर की गर्मी से धीरे-धीरे गरम कर्या; नि रगड़ा, सीधा आग नि लगावा।',
+                    'गाड़ी मा हो त इंजन थोड़ी देर ही चलावा अर धुआं वाळो पाइप बर्फ से साफ रखा।',
+                    'हिमस्खलन वाळी ढलान अर गदेरा से दूर रावा अर बचाव दल कु अपणी जगा बतावा।'
+                ],
+                'kumaoni': [
+                    'कै आश्रय (मकान, गाड़ी या टेंट) में जाओ और वाँ ई रौ; सफेद धुंध या गैरि बर्फ में नि हिटौ।',
+                    'सुक रौ: गिल कपड़ बदलौ, ख्वार, हाथ और खुट ढकौ, जरूरत हो त एक-दुसरै कि गर्मी बांटौ।',
+                    'सुन्न, सफेद या मोम जसि चमड़ि कें शरीर कि गर्मी ल धीरे-धीरे गरम करौ; नि रगड़ौ, सीध आग नि लगाओ।',
+                    'गाड़ी में छा त इंजन थोड़ि देर ई चलाओ और धुंआ वाल पाइप बर्फ ल साफ धरौ।',
+                    'हिमस्खलन वालि ढलान और गधेरों बटी दूर रौ और बचाव दल कें आपणि जाग बताओ।'
+                ]
+            }
+        },
+        'flood': {
+            'keywords': ['flood', 'flooding', 'cloudburst', 'river', 'stream', 'swept', 'drowning', 'torrent',
+                         'baadh', 'बाढ़', 'बाढ', 'नदी', 'डूब', 'सैलाब'],
+            'phrases': ['flash flood', 'water level', 'rising water', 'heavy rain', 'cloud burst', 'badal phata',
+                        'बादल फट', 'पानी बढ़', 'भारी बारिश', 'तेज़ बारिश'],
+            'contacts': ['112', '1070', '108'],
+            'advice': {
+                'english': [
+                    'Move to higher ground immediately, away from riverbanks, streams and dry channels.',
+                    'Do not walk or drive through moving water; 15 cm can knock you down and 60 cm can carry a car.',
+                    'Stay off bridges and causeways over fast-flowing water.',
+                    'If trapped in a building, go to the highest floor or roof and signal for help; avoid electrical points.',
+                    'Follow official warnings and do not return until authorities say the area is safe.'
+                ],
+                'hindi': [
+                    'तुरंत ऊँची जगह पर जाएँ, नदी के किनारों, नालों और सूखी धाराओं से दूर।',
+                    'बहते पानी में न चलें और न गाड़ी चलाएँ; 15 सेमी पानी आपको गिरा सकता है और 60 सेमी गाड़ी बहा सकता है।',
+                    'तेज़ बहते पानी पर बने पुलों और रपटों से दूर रहें।',
+                    'इमारत में फँसे हों तो सबसे ऊपरी मंज़िल या छत पर जाएँ और मदद के लिए संकेत दें; बिजली के बिंदुओं से बचें।',
+                    'आधिकारिक चेतावनियों का पालन करें और प्रशासन के सुरक्षित घोषित करने तक वापस न लौटें।'
+                ],
+                'garhwali': [
+                    'तुरंत ऊँची जगा मा जावा, गाड़ का किनारा, गदेरा अर सुक्खा धारा से दूर।',
+                    'बगदा पाणी मा नि हिटा अर गाड़ी नि चलावा; 15 सेमी पाणी तुम कु गिरै सकदू अर 60 सेमी गाड़ी बगै सकदू।',
+                    'तेज बगदा पाणी का पुल अर रपटा से दूर रावा।',
+                    'मकान मा फंस्यां हो त सबसे ऐंच की मंजिल या छत मा जावा अर मदद खुणि इशारा कर्या; बिजली से बचा।',
+                    'सरकारी चेतावनी मना अर प्रशासन का सुरक्षित बोलण तक वापस नि आवा।'
+                ],
+                'kumaoni': [
+                    'तुरंत ऊँच जाग में जाओ, गाड़ क किनार, गधेर और सुक धार बटी दूर।',
+                    'बगनी पाणि में नि हिटौ और गाड़ी नि चलाओ; 15 सेमी पाणि तुमुकें गिरै सकूँ और 60 सेमी गाड़ी बगै सकूँ।',
+                    'तेज बगनी पाणि क पुल और रपट बटी दूर रौ।',
+                    'मकान में फँसि रौछा त सबन है मलि मंजिल या छत में जाओ और मदद लिजी इशार करौ; बिजुली बटी बचौ।',
+                    'सरकारी चेतावनी मानौ और प्रशासन क सुरक्षित कूण तक वापस नि आओ।'
+                ]
+            }
+        },
+        'wildlife': {
+            # 'bear' is also a verb, so it only counts in phrases
+            'keywords': ['wildlife', 'leopard', 'tiger', 'bears', 'elephant', 'snake', 'snakebite', 'boar', 'boars',
+                         'guldar', 'bhalu', 'saanp', 'तेंदुआ', 'गुलदार', 'बाघ', 'भालू', 'हाथी',
+                         'सांप', 'साँप', 'सर्प'],
+            'phrases': ['animal attack', 'wild animal', 'bitten by', 'a bear', 'the bear', 'bear attack', 'black bear', 'जंगली जानवर', 'सांप ने काट', 'साँप ने काट'],
+            'contacts': ['112', '108'],
+            'advice': {
+                'english': [
+                    'Do not run or turn your back; back away slowly, keep the animal in view and give it an escape route.',
+                    'For a leopard or bear, stay in a group, look large and make steady noise; never approach cubs.',
+                    'Keep well away from elephants and never block their path; leave your vehicle only if it is being charged and cover is close.',
+                    'For a snakebite, keep the person still and calm, remove rings and tight items, and do not cut, suck or apply a tight tourniquet.',
+                    'Get the bitten or injured person to a hospital quickly and report the animal to the forest department.'
+                ],
+                'hindi': [
+                    'भागें नहीं और पीठ न दिखाएँ; जानवर पर नज़र रखते हुए धीरे-धीरे पीछे हटें और उसे निकलने का रास्ता दें।',
+                    'तेंदुए या भालू के सामने समूह में रहें, बड़े दिखें और लगातार आवाज़ करें; बच्चों (शावकों) के पास कभी न जाएँ।',
+                    'हाथियों से काफ़ी दूरी रखें और उनका रास्ता न रोकें; गाड़ी तभी छोड़ें जब हमला हो रहा हो और पास में आड़ हो।',
+                    'सांप के काटने पर व्यक्ति को स्थिर और शांत रखें, अंगूठी और कसी चीज़ें हटाएँ; न काटें, न चूसें, न कसकर पट्टी बाँधें।',
+                    'घायल व्यक्ति को जल्द अस्पताल पहुँचाएँ और वन विभाग को जानवर की सूचना दें।'
+                ],
+                'garhwali': [
+                    'भाजा ना अर पीठ नि दिखावा; जानवर पर नजर रखिक धीरे-धीरे पैथर हटा अर वै कु निकलण को रस्ता द्यावा।',
+                    'गुलदार या भालू का सामणी टोली मा रावा, बड़ा दिखा अर लगातार आवाज कर्या; वूंका बच्चों का नजीक कभी नि जावा।',
+                    'हाथी से भौत दूरी रखा अर वूंको रस्ता नि रोका; गाड़ी तभी छोड़ा जब हमला होणु हो अर नजीक आड़ हो।',
+                    'सांप का काटण पर आदमी कु स्थिर अर शांत रखा, अंगूठी अर कसीं चीज हटावा; नि काटा, नि चूसा, कसिक पट्टी नि बांधा।',
+                    'घायल कु जल्दी अस्पताल पौंछावा अर वन विभाग कु जानवर की खबर द्यावा।'
+                ],
+                'kumaoni': [
+                    'भाजौ नै और पीठ नि दिखाओ; जानवर पर नजर धरि बेर धीरे-धीरे पछिल हटौ और उकें निकलण क बाट दिया।',
+                    'गुलदार या भालू क सामणि टोली में रौ, ठुल दिखौ और लगातार आवाज करौ; उनार बच्चों क नजीक कभै नि जाओ।',
+                    'हाथी बटी भौत दूरी धरौ और उनर बाट नि रोकौ; गाड़ी तबै छोड़ौ जब हमला हुण लागि रौ और नजीक आड़ हो।',
+                    'सांप क काटण पर मैस कें स्थिर और शांत धरौ, अंगूठी और कसी चीज हटाओ; नि काटौ, नि चूसौ, कसि बेर पट्टी नि बांधौ।',
+                    'घायल कें जल्दी अस्पताल पुजाओ और वन विभाग कें जानवर कि खबर दिया।'
+                ]
+            }
+        },
+        'general': {
+            'keywords': [],
+            'phrases': [],
+            'contacts': ['112', '108', '100', '1363'],
+            'advice': {
+                'english': [
+                    'Move yourself and others away from any immediate danger to a safe, visible spot.',
+                    'Call 112 and state your location, the number of people and any injuries.',
+                    'Give basic first aid only if you know how; keep injured people warm and still.',
+                    'Save phone battery, stay with your group and stay where rescuers can find you.',
+                    'Follow instructions from police, SDRF and local officials.'
+                ],
+                'hindi': [
+                    'खुद को और दूसरों को तत्काल खतरे से दूर किसी सुरक्षित, दिखाई देने वाली जगह पर ले जाएँ।',
+                    '112 पर कॉल करें और अपनी लोकेशन, लोगों की संख्या और चोटों के बारे में बताएँ।',
+                    'जानकारी हो तभी प्राथमिक उपचार दें; घायलों को गर्म और स्थिर रखें।',
+                    'फ़ोन की बैटरी बचाएँ, अपने समूह के साथ रहें और ऐसी जगह रहें जहाँ बचाव दल आपको ढूँढ सके।',
+                    'पुलिस, SDRF और स्थानीय अधिकारियों के निर्देशों का पालन करें।'
+                ],
+                'garhwali': [
+                    'अपणा आप कु अर दूसरों कु खतरा से दूर कै सुरक्षित, दिखेण वाळी जगा मा ल्हि जावा।',
+                    '112 पर फोन कर्या अर अपणी जगा, लोगु की गिनती अर चोट का बारा मा बतावा।',
+                    'जाणकारी हो तभी प्राथमिक उपचार द्यावा; घायलों कु गरम अर स्थिर रखा।',
+                    'फोन की बैटरी बचावा, अपणी टोली का दगड़ रावा अर इनी जगा रावा जख बचाव दल तुम कु खोजि सकु।',
+                    'पुलिस, SDRF अर स्थानीय अधिकारियों की बात मना।'
+                ],
+                'kumaoni': [
+                    'आपूं कें और दुसरों कें खतर बटी दूर कै सुरक्षित, दिखीण वालि जाग में लि जाओ।',
+                    '112 में फोन करौ और आपणि जाग, मैसों कि गिनती और चोटों क बार में बताओ।',
+                    'जानकारी हो तबै प्राथमिक उपचार दिया; घायलों कें गरम और स्थिर धरौ।',
+                    'फोन कि बैटरी बचाओ, आपणि टोली दगै रौ और इसि जाग रौ जां बचाव दल तुमुकें खोजि सको।',
+                    'पुलिस, SDRF और स्थानीय अधिकारियों कि बात मानौ।'
+                ]
+            }
+        }
+    }
+
+    def __init__(self, gemini_service_factory=None):
+        """
+        Args:
+            gemini_service_factory: Zero-argument callable returning the Gemini
+                service for enrichment (None disables enrichment)
+        """
+        self.gemini_service_factory = gemini_service_factory
+        self._keywords, self._phrases = self._build_index()
+        self.enrichments = create_response_cache(
+            'emergency_enrichment',
+            backend=Config.EMERGENCY_ENRICHMENT_CACHE_BACKEND,
+            default_ttl=Config.EMERGENCY_ENRICHMENT_TTL,
+            max_entries=1000
+        )
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='emergency-enrich')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stats = {'matched': 0, 'unmatched': 0, 'enrichments_started': 0, 'enrichments_failed': 0}
+        metrics.register_collector('emergency_advice', self.stats)
+
+    @classmethod
+    def _build_index(cls) -> Tuple[Dict[str, List[Tuple[str, int]]], List[Tuple[str, str]]]:
+        keywords: Dict[str, List[Tuple[str, int]]] = {}
+        phrases = []
+        for situation, template in cls.SITUATIONS.items():
+            for keyword in template['keywords']:
+                keywords.setdefault(keyword.lower(), []).append((situation, 1))
+            for phrase in template['phrases']:
+                phrases.append((phrase.lower(), situation))
+        return keywords, phrases
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.lower().split())
+
+    def classify(self, situation: str) -> Tuple[Optional[str], int]:
+        """
+        Score a free-text situation against the templates
+
+        Returns:
+            (situation type or None, score)
+        """
+        text = self._normalize(situation)
+        scores: Dict[str, int] = {}
+
+        # Phrases are more specific than single words, so they count double
+        for phrase, situation_type in self._phrases:
+            if phrase in text:
+                scores[situation_type] = scores.get(situation_type, 0) + 2
+
+        for token in self.TOKEN_PATTERN.findall(text):
+            # Prefix match handles inflections: landslides -> landslide, बर्फबारी -> बर्फ;
+            # short English stems only match whole words (board must not hit boar)
+            shortest = min(len(token), 5 if token.isascii() else 3)
+            for end in range(len(token), shortest - 1, -1):
+                hits = self._keywords.get(token[:end])
+                if hits:
+                    for situation_type, weight in hits:
+                        scores[situation_type] = scores.get(situation_type, 0) + weight
+                    break
+
+        if not scores:
+            return None, 0
+        best = max(scores, key=scores.get)
+        return best, scores[best]
+
+    def advise(self, situation: str, location: str = '', language: str = 'english') -> Dict[str, Any]:
+        """
+        Get advice for a situation from the local knowledge base
+
+        Unmatched situations get general advice immediately and an
+        enrichment request is queued; its id is returned so the client can
+        fetch the AI answer once ready.
+        """
+        if language not in self.HEADERS:
+            language = 'english'
+
+        situation_type, score = self.classify(situation)
+        matched = situation_type is not None
+        template = self.SITUATIONS[situation_type or 'general']
+        steps = template['advice'][language]
+        contacts = [
+            {'number': number, 'name': self.CONTACTS[number]}
+            for number in template['contacts']
+        ]
+
+        lines = [f"{self.HEADERS[language]}:"]
+        lines.extend(f"{i}. {step}" for i, step in enumerate(steps, 1))
+        lines.append('')
+        lines.append(f"{self.CALL_LABELS[language]}: " + ', '.join(
+            f"{contact['number']} ({contact['name']})" for contact in contacts
+        ))
+
+        result = {
+            'success': True,
+            'advice': '\n'.join(lines),
+            'steps': steps,
+            'contacts': contacts,
+            'situation_type': situation_type or 'general',
+            'matched': matched,
+            'confidence': 'high' if score >= 2 else 'medium' if matched else 'low',
+            'language': language,
+            'source': 'local'
+        }
+
+        if matched:
+            self._count('matched')
+        else:
+            self._count('unmatched')
+            result['enrichment'] = self._enrich(situation, location, language)
+        return result
+
+    def enrichment_key(self, situation: str, location: str, language: str) -> str:
+        """Id of the enrichment for a situation/location/language"""
+        return make_cache_key({
+            'situation': self._normalize(situation),
+            'location': self._normalize(location or ''),
+            'language': language
+        })
+
+    def get_enrichment(self, enrichment_id: str) -> Dict[str, Any]:
+        """Get the status (ready, pending or unavailable) and advice of an enrichment"""
+        cached = self.enrichments.get(enrichment_id)
+        if cached is not None:
+            return {'id': enrichment_id, 'status': 'ready', 'advice': cached['advice'], 'generated_at': cached['generated_at']}
+        with self._lock:
+            pending = enrichment_id in self._pending
+        return {'id': enrichment_id, 'status': 'pending' if pending else 'unavailable'}
+
+    def _enrich(self, situation: str, location: str, language: str) -> Dict[str, Any]:
+        key = self.enrichment_key(situation, location, language)
+        status = self.get_enrichment(key)
+        if status['status'] != 'unavailable' or not Config.EMERGENCY_ENRICHMENT_ENABLED:
+            return status
+        if self.gemini_service_factory is None:
+            return status
+
+        with self._lock:
+            if key in self._pending:
+                return {'id': key, 'status': 'pending'}
+            self._pending.add(key)
+        self._count('enrichments_started')
+
+        def enrich():
+            try:
+                gemini_service = self.gemini_service_factory()
+                response = gemini_service.get_emergency_advice(situation, location, language)
+                if response.get('success'):
+                    self.enrichments.set(key, {'advice': response['advice'], 'generated_at': time.time()})
+                else:
+                    self._count('enrichments_failed')
+            except Exception as e:
+                logger.warning(f"Emergency advice enrichment failed: {str(e)}")
+                self._count('enrichments_failed')
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        self._executor.submit(enrich)
+        return {'id': key, 'status': 'pending'}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get match and enrichment counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_enrichments'] = len(self._pending)
+        return stats
+
+
+# Singleton instance
+_emergency_advisor: Optional[EmergencyAdvisor] = None
+_emergency_advisor_lock = threading.Lock()
+
+def get_emergency_advisor() -> EmergencyAdvisor:
+    """Get or create the emergency advisor"""
+    global _emergency_advisor
+    if _emergency_advisor is None:
+        with _emergency_advisor_lock:
+            if _emergency_advisor is None:
+                from app.services.gemini_service import get_gemini_service
+                factory = get_gemini_service if Config.GEMINI_API_KEY else None
+                _emergency_advisor = EmergencyAdvisor(factory)
+    return _emergency_advisor
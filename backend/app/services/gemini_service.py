@@ -1,14 +1,55 @@
 """Google Gemini AI service integration"""
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import google.generativeai as genai
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from app.config.settings import Config
+from app.services.cache_service import create_response_cache, make_cache_key
+from app.services.history_compactor import HistoryCompactor, format_turns
+from app.services.image_cache import VisionResultCache, dhash
+from app.utils.concurrency import OverloadedError, PriorityLimiter, SingleFlight
 from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class _SlotReleasingIterator:
+    """Wraps a streaming response so its scheduler slot is freed on exhaustion or close"""
+    
+    def __init__(self, iterator: Iterator[str], slot):
+        self._iterator = iterator
+        self._slot = slot
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> str:
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        # Safe to call repeatedly, and before iteration ever started
+        try:
+            self._iterator.close()
+        finally:
+            self._slot.release()
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API"""
     
+    CHAT_GENERATION_CONFIG = {
+        'temperature': 0.7,
+        'top_p': 0.8,
+        'top_k': 40,
+        'max_output_tokens': 1024,
+    }
+    
     def __init__(self):
         """Initialize Gemini service with API key"""
         api_key = Config.GEMINI_API_KEY
@@ -19,13 +60,125 @@ class GeminiService:
         genai.configure(api_key=api_key)
         self.chat_model = genai.GenerativeModel(Config.GEMINI_MODEL)
         self.vision_model = genai.GenerativeModel(Config.GEMINI_VISION_MODEL)
+        self.itinerary_cache = create_response_cache(
+            'itinerary',
+            backend=Config.ITINERARY_CACHE_BACKEND,
+            default_ttl=Config.ITINERARY_CACHE_TTL,
+            max_entries=Config.ITINERARY_CACHE_MAX_ENTRIES
+        )
+        # Bounded pool shared by all requests for running vision passes concurrently
+        self.vision_executor = ThreadPoolExecutor(
+            max_workers=Config.VISION_MAX_WORKERS,
+            thread_name_prefix='vision-pass'
+        )
+        self.vision_cache = VisionResultCache(
+            max_distance=Config.VISION_CACHE_MAX_DISTANCE,
+            max_entries=Config.VISION_CACHE_MAX_ENTRIES,
+            ttl=Config.VISION_CACHE_TTL
+        )
+        # Admission control shared by every caller of the Gemini API
+        self.limiter = PriorityLimiter(Config.GEMINI_MAX_CONCURRENCY, {
+            name: dict(limits, max_queue=Config.GEMINI_QUEUE_MAX_DEPTH)
+            for name, limits in Config.GEMINI_CALL_LIMITS.items()
+        })
+        metrics.register_collector('gemini_scheduler', self.limiter.stats)
+        # Identical concurrent text prompts share one upstream call
+        self._inflight = SingleFlight()
+        metrics.register_collector('gemini_coalescing', self._inflight.stats)
+        self.history_compactor = HistoryCompactor(self)
         logger.info("Gemini service initialized successfully")
     
+    def acquire_slot(self, call_type: str):
+        """
+        Wait for a Gemini slot, recording time spent queued
+        
+        Args:
+            call_type: One of Config.GEMINI_CALL_LIMITS (emergency, chat, translation, vision, itinerary)
+            
+        Returns:
+            Slot to release once the upstream call is finished
+            
+        Raises:
+            OverloadedError: If no slot frees up within the call type's queue-time limit
+        """
+        start = time.time()
+        try:
+            return self.limiter.acquire(call_type)
+        except OverloadedError:
+            metrics.increment(f'gemini.rejected.{call_type}')
+            raise
+        finally:
+            metrics.record_timing(f'gemini.wait.{call_type}', (time.time() - start) * 1000)
+    
+    def generate_content(
+        self,
+        call_type: str,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None,
+        model: Optional[Any] = None
+    ):
+        """
+        Call Gemini under admission control
+        
+        Every non-streaming request to the API goes through here so that
+        per-type concurrency caps and priorities apply to all callers.
+        
+        Concurrent calls with the same type, model, text prompt and
+        generation config are coalesced: one caller queues for a slot and
+        calls Gemini, the others wait for its response (or its exception)
+        without taking slots of their own. Image prompts are never coalesced.
+        
+        Args:
+            call_type: Scheduler call type
+            contents: Prompt (or [prompt, image]) passed to generate_content
+            generation_config: Optional generation config
+            model: Model to call (defaults to the chat model)
+            
+        Raises:
+            OverloadedError: If the call could not be admitted in time
+            TimeoutError: If a coalesced caller gave up waiting on the shared call
+        """
+        model = model or self.chat_model
+        
+        def call():
+            with self.acquire_slot(call_type):
+                return model.generate_content(
+                    contents,
+                    generation_config=generation_config
+                )
+        
+        if not isinstance(contents, str):
+            return call()
+        
+        key = make_cache_key({
+            'type': call_type,
+            'model': id(model),
+            'prompt': contents,
+            'config': generation_config
+        })
+        response, shared = self._inflight.do(key, call, timeout=Config.GEMINI_COALESCE_WAIT)
+        if shared:
+            metrics.increment(f'gemini.coalesced.{call_type}')
+        return response
+    
+    @staticmethod
+    def overloaded_result(error: OverloadedError) -> Dict[str, Any]:
+        """Result dictionary for a call rejected by the scheduler (routes answer 503)"""
+        return {
+            'success': False,
+            'overloaded': True,
+            'retry_after': error.retry_after,
+            'error': str(error),
+            'message': 'The AI service is busy right now. Please try again in a moment.'
+        }
+    
     def chat_with_context(
         self, 
         message: str, 
         language: str = 'english',
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Chat with AI guide with context awareness
@@ -34,46 +187,22 @@ class GeminiService:
             message: User message
             language: Language code (english, hindi, garhwali, kumaoni)
             conversation_history: Previous conversation messages
+            user_id: Authenticated user, for the stored session summary
+            session_id: Conversation the history belongs to
             
         Returns:
             Response dictionary with text and metadata
         """
         try:
-            # Auto-detect language if message contains Hindi/Devanagari script
-            detected_language = self._detect_language(message)
-            if detected_language and detected_language != 'english':
-                language = detected_language
-                logger.info(f"Auto-detected language: {language}")
-            
-            # Build system prompt based on language
-            system_prompt = self._get_system_prompt(language)
-            
-            # Build conversation context
-            prompt_parts = [system_prompt]
-            
-            if conversation_history:
-                for msg in conversation_history[-10:]:  # Last 10 messages for context
-                    role = msg.get('role', 'user')
-                    content = msg.get('content', '')
-                    if role == 'user':
-                        prompt_parts.append(f"User: {content}")
-                    else:
-                        prompt_parts.append(f"Assistant: {content}")
-            
-            prompt_parts.append(f"User: {message}")
-            prompt_parts.append("Assistant:")
-            
-            full_prompt = "\n".join(prompt_parts)
+            full_prompt, language = self.build_chat_prompt(
+                message, language, conversation_history, user_id, session_id
+            )
             
             # Generate response
-            response = self.chat_model.generate_content(
+            response = self.generate_content(
+                'chat',
                 full_prompt,
-                generation_config={
-                    'temperature': 0.7,
-                    'top_p': 0.8,
-                    'top_k': 40,
-                    'max_output_tokens': 1024,
-                }
+                generation_config=self.CHAT_GENERATION_CONFIG
             )
             
             response_text = response.text.strip()
@@ -84,6 +213,9 @@ class GeminiService:
                 'language': language
             }
             
+        except OverloadedError as e:
+            logger.warning(f"Chat request rejected: {str(e)}")
+            return self.overloaded_result(e)
         except Exception as e:
             logger.error(f"Error in chat_with_context: {str(e)}")
             return {
@@ -92,6 +224,99 @@ class GeminiService:
                 'error': str(e)
             }
     
+    def stream_chat_with_context(
+        self,
+        message: str,
+        language: str = 'english',
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Tuple[Iterator[str], str]:
+        """
+        Streaming variant of chat_with_context
+        
+        Chunks are pulled from Gemini only as the caller consumes them, so a
+        slow client slows generation down instead of buffering it, and closing
+        the iterator stops reading from the upstream stream.
+        
+        The scheduler slot is taken before returning and held until the
+        iterator is exhausted or closed, so callers must close it.
+        
+        Args:
+            message: User message
+            language: Language code (english, hindi, garhwali, kumaoni)
+            conversation_history: Previous conversation messages
+            user_id: Authenticated user, for the stored session summary
+            session_id: Conversation the history belongs to
+            
+        Returns:
+            (iterator of text chunks, resolved language)
+            
+        Raises:
+            OverloadedError: If no chat slot frees up in time
+        """
+        full_prompt, language = self.build_chat_prompt(
+            message, language, conversation_history, user_id, session_id
+        )
+        slot = self.acquire_slot('chat')
+        
+        def chunks():
+            response = self.chat_model.generate_content(
+                full_prompt,
+                generation_config=self.CHAT_GENERATION_CONFIG,
+                stream=True
+            )
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. safety metadata) carry nothing to forward
+                    continue
+                if text:
+                    yield text
+        
+        return _SlotReleasingIterator(chunks(), slot), language
+    
+    def build_chat_prompt(
+        self,
+        message: str,
+        language: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Build the chat prompt and resolve the response language
+        
+        History is compacted first: a summary of older turns plus a
+        token-bounded window of recent ones.
+        
+        Returns:
+            (prompt, language)
+        """
+        # Auto-detect language if message contains Hindi/Devanagari script
+        detected_language = self._detect_language(message)
+        if detected_language and detected_language != 'english':
+            language = detected_language
+            logger.info(f"Auto-detected language: {language}")
+        
+        # Build system prompt based on language
+        system_prompt = self._get_system_prompt(language)
+        
+        # Build conversation context
+        prompt_parts = [system_prompt]
+        
+        if conversation_history:
+            summary, recent = self.history_compactor.compact(conversation_history, user_id, session_id)
+            if summary:
+                prompt_parts.append(f"Summary of the earlier conversation:\n{summary}")
+            prompt_parts.extend(format_turns(recent))
+        
+        prompt_parts.append(f"User: {message}")
+        prompt_parts.append("Assistant:")
+        
+        return "\n".join(prompt_parts), language
+    
     def analyze_image(
         self, 
         image_data: bytes, 
@@ -119,6 +344,14 @@ class GeminiService:
             # Enhance image quality for better recognition
             image = self._enhance_image_for_recognition(image)
             
+            # Near-duplicate photos (same viewpoint, different upload) reuse a stored result
+            mode = 'multi' if use_enhanced_recognition else 'single'
+            image_hash = dhash(image) if Config.VISION_CACHE_ENABLED else None
+            if image_hash is not None:
+                cached = self.vision_cache.lookup(image_hash, language, mode)
+                if cached is not None:
+                    return cached
+            
             if use_enhanced_recognition:
                 # Multi-pass recognition for better accuracy
                 result = self._multi_pass_recognition(image, language)
@@ -126,8 +359,22 @@ class GeminiService:
                 # Single pass recognition
                 result = self._single_pass_recognition(image, language)
             
+            if image_hash is not None and result.get('success') and not result.get('degraded'):
+                self.vision_cache.store(
+                    image_hash,
+                    language,
+                    mode,
+                    result,
+                    gemini_calls=2 if use_enhanced_recognition else 1
+                )
+            
             return result
             
+        except OverloadedError as e:
+            logger.warning(f"Image analysis rejected: {str(e)}")
+            result = self.overloaded_result(e)
+            result['identified'] = False
+            return result
         except Exception as e:
             logger.error(f"Error in analyze_image: {str(e)}")
             return {
@@ -139,7 +386,7 @@ class GeminiService:
     
     def _enhance_image_for_recognition(self, image):
         """Enhance image quality for better recognition"""
-        from PIL import ImageEnhance
+        from PIL import Image, ImageEnhance
         
         # Convert to RGB if needed
         if image.mode != 'RGB':
@@ -166,12 +413,17 @@ class GeminiService:
         """
         Multi-pass recognition for higher accuracy
         Uses multiple prompts and combines results
+        
+        Both passes run concurrently; if only one finishes within
+        VISION_PASS_TIMEOUT the result degrades to that pass alone.
         """
         # Pass 1: Detailed place identification
         prompt1 = self._get_vision_prompt_detailed(language)
-        response1 = self.vision_model.generate_content(
-            [prompt1, image],
-            generation_config={
+        detailed = self.vision_executor.submit(
+            self._run_vision_pass,
+            prompt1,
+            image,
+            {
                 'temperature': 0.2,  # Lower temperature for more accurate identification
                 'top_p': 0.7,
                 'top_k': 30,
@@ -179,11 +431,13 @@ class GeminiService:
             }
         )
         
-        # Pass 2: Landmark and feature detection
+        # Pass 2: Landmark and feature detection (on its own copy of the image)
         prompt2 = self._get_vision_prompt_landmarks(language)
-        response2 = self.vision_model.generate_content(
-            [prompt2, image],
-            generation_config={
+        landmarks = self.vision_executor.submit(
+            self._run_vision_pass,
+            prompt2,
+            image.copy(),
+            {
                 'temperature': 0.3,
                 'top_p': 0.8,
                 'top_k': 40,
@@ -191,27 +445,66 @@ class GeminiService:
             }
         )
         
+        passes = {'detailed': detailed, 'landmarks': landmarks}
+        done, _ = wait(passes.values(), timeout=Config.VISION_PASS_TIMEOUT)
+        
+        responses = {}
+        rejected = []
+        for name, future in passes.items():
+            if future not in done:
+                future.cancel()
+                logger.warning(f"Vision pass '{name}' timed out after {Config.VISION_PASS_TIMEOUT}s")
+                continue
+            try:
+                responses[name] = future.result()
+            except OverloadedError as e:
+                logger.warning(f"Vision pass '{name}' rejected: {str(e)}")
+                rejected.append(e)
+            except Exception as e:
+                logger.warning(f"Vision pass '{name}' failed: {str(e)}")
+        
+        if not responses:
+            if len(rejected) == len(passes):
+                raise rejected[0]
+            raise RuntimeError('All recognition passes failed or timed out')
+        
         # Combine and parse results
         result = self._combine_recognition_results(
-            response1.text.strip(),
-            response2.text.strip(),
+            responses.get('detailed', ''),
+            responses.get('landmarks', ''),
             language
         )
         
+        if len(responses) < len(passes):
+            result['degraded'] = True
+            result['completed_passes'] = list(responses.keys())
+        
         return result
     
+    def _run_vision_pass(self, prompt: str, image, generation_config: Dict[str, Any]) -> str:
+        """Run a single vision prompt against an image and return the response text"""
+        response = self.generate_content(
+            'vision',
+            [prompt, image],
+            generation_config=generation_config,
+            model=self.vision_model
+        )
+        return response.text.strip()
+    
     def _single_pass_recognition(self, image, language: str) -> Dict[str, Any]:
         """Single pass recognition (faster but less accurate)"""
         prompt = self._get_vision_prompt(language)
         
-        response = self.vision_model.generate_content(
+        response = self.generate_content(
+            'vision',
             [prompt, image],
             generation_config={
                 'temperature': 0.4,
                 'top_p': 0.8,
                 'top_k': 40,
                 'max_output_tokens': 2048,
-            }
+            },
+            model=self.vision_model
         )
         
         response_text = response.text.strip()
@@ -340,20 +633,29 @@ class GeminiService:
             }
         
         # Fallback if parsing failed
+        fallback_data = {
+            'name': 'Unknown Place',
+            'description': response1,
+            'history': 'Information not available',
+            'best_time_to_visit': 'Year-round',
+            'nearby_places': [],
+            'dos_and_donts': [],
+            'crowd_level': 'Unknown'
+        }
+        
+        # Keep whatever the landmark pass found (e.g. when only that pass completed)
+        if landmarks:
+            fallback_data['landmarks'] = landmarks
+        if visible_text:
+            fallback_data['visible_text'] = visible_text
+        
         return {
             'success': True,
             'identified': False,
             'confidence': 'low',
-            'data': {
-                'name': 'Unknown Place',
-                'description': response1,
-                'history': 'Information not available',
-                'best_time_to_visit': 'Year-round',
-                'nearby_places': [],
-                'dos_and_donts': [],
-                'crowd_level': 'Unknown'
-            },
+            'data': fallback_data,
             'raw_response': response1,
+            'landmarks_detected': len(landmarks),
             'database_matched': False
         }
     
@@ -431,9 +733,20 @@ class GeminiService:
             Complete itinerary dictionary
         """
         try:
+            # Serve identical preference combinations from the cache
+            cache_key = self._get_itinerary_cache_key(preferences, language)
+            cached = self.itinerary_cache.get(cache_key)
+            # A plan cached for a higher budget in the same bucket may cost more than this one allows
+            budget = float(preferences.get('budget', 0) or 0)
+            if cached is not None and self._fits_budget(cached.get('itinerary'), budget):
+                cached['itinerary']['budget'] = preferences.get('budget')
+                cached['cached'] = True
+                return cached
+            
             prompt = self._get_itinerary_prompt(preferences, language)
             
-            response = self.chat_model.generate_content(
+            response = self.generate_content(
+                'itinerary',
                 prompt,
                 generation_config={
                     'temperature': 0.8,
@@ -453,25 +766,29 @@ class GeminiService:
                     json_str = response_text[start:end]
                     itinerary_data = json.loads(json_str)
                     
-                    return {
+                    result = {
                         'success': True,
                         'itinerary': itinerary_data,
                         'raw_response': response_text
                     }
+                    
+                    # Only well-formed itineraries are worth reusing
+                    self.itinerary_cache.set(cache_key, result)
+                    return result
             except json.JSONDecodeError:
                 pass
             
-            # If JSON parsing failed, return structured response
+            # If JSON parsing failed, fall back to a locally planned itinerary
+            from app.services.itinerary_planner import get_itinerary_planner
             return {
                 'success': True,
-                'itinerary': {
-                    'duration': preferences.get('duration', 3),
-                    'budget': preferences.get('budget', 0),
-                    'days': self._parse_itinerary_text(response_text, preferences.get('duration', 3))
-                },
+                'itinerary': get_itinerary_planner().plan(preferences, language),
                 'raw_response': response_text
             }
             
+        except OverloadedError as e:
+            logger.warning(f"Itinerary request rejected: {str(e)}")
+            return self.overloaded_result(e)
         except Exception as e:
             logger.error(f"Error in generate_itinerary: {str(e)}")
             return {
@@ -480,6 +797,112 @@ class GeminiService:
                 'message': 'Failed to generate itinerary. Please try again.'
             }
     
+    @staticmethod
+    def _fits_budget(itinerary: Any, budget: float) -> bool:
+        """Check that a cached itinerary's estimated cost is within budget"""
+        if not isinstance(itinerary, dict):
+            return False
+        try:
+            return float(itinerary.get('total_estimated_cost')) <= budget
+        except (TypeError, ValueError):
+            return False
+    
+    def _get_itinerary_cache_key(self, preferences: Dict[str, Any], language: str) -> str:
+        """
+        Build a normalized fingerprint of the itinerary prompt inputs
+        
+        Budgets are bucketed so that near-identical requests (₹20000 vs ₹20500)
+        share an entry; a hit is only served if its cost fits the request's
+        own budget. Only fields that shape the prompt are included.
+        """
+        step = max(Config.ITINERARY_CACHE_BUDGET_STEP, 1)
+        budget = float(preferences.get('budget', 0) or 0)
+        interests = preferences.get('interests', [])
+        
+        fingerprint = {
+            'duration': int(preferences.get('duration', 3)),
+            'budget_bucket': int(budget // step) * step,
+            'interests': sorted({str(i).strip().lower() for i in interests}),
+            'start_location': str(preferences.get('start_location', 'Dehradun')).strip().lower(),
+            'travel_style': str(preferences.get('travel_style', 'moderate')).strip().lower(),
+            'language': language.lower()
+        }
+        return make_cache_key(fingerprint)
+    
+    def describe_itinerary(self, itinerary: Dict[str, Any], language: str = 'english') -> Dict[str, Any]:
+        """
+        Write a narrative for an already planned itinerary
+        
+        The plan itself (places, timings, costs) is fixed; only an overview
+        and a short summary per day are generated.
+        
+        Returns:
+            {'success': True, 'narrative': {'overview': str, 'days': [{'day', 'summary'}]}}
+        """
+        try:
+            outline = '\n'.join(
+                f"Day {day['day']}: " + '; '.join(
+                    f"{item['name']} ({item['time']})" for item in day['places']
+                ) + f"; night: {day['accommodation']['name']}"
+                for day in itinerary['days']
+            )
+            prompt = f"""Write a warm, practical travel narrative for this fixed {itinerary['duration']}-day Uttarakhand itinerary.
+Do not add, remove or reorder places and do not mention prices.
+
+{outline}
+
+Provide a JSON response with this structure:
+{{
+  "overview": "2-3 sentences about the whole trip",
+  "days": [{{"day": 1, "summary": "2-3 sentences about what the day feels like and what not to miss"}}]
+}}"""
+            if language != 'english':
+                prompt += f"\n\nRespond in {language} language."
+            
+            response = self.generate_content(
+                'itinerary',
+                prompt,
+                generation_config={
+                    'temperature': 0.7,
+                    'top_p': 0.9,
+                    'top_k': 40,
+                    'max_output_tokens': 2048,
+                }
+            )
+            
+            response_text = response.text.strip()
+            start = response_text.find('{')
+            end = response_text.rfind('}') + 1
+            narrative = json.loads(response_text[start:end]) if start != -1 else None
+            if not isinstance(narrative, dict) or not narrative.get('overview'):
+                return {
+                    'success': False,
+                    'message': 'Narrative response was not in the expected format.'
+                }
+            
+            return {
+                'success': True,
+                'narrative': {
+                    'overview': str(narrative['overview']),
+                    'days': [
+                        {'day': int(day['day']), 'summary': str(day['summary'])}
+                        for day in narrative.get('days', [])
+                        if isinstance(day, dict) and 'day' in day and 'summary' in day
+                    ]
+                }
+            }
+            
+        except OverloadedError as e:
+            logger.warning(f"Itinerary narrative request rejected: {str(e)}")
+            return self.overloaded_result(e)
+        except Exception as e:
+            logger.error(f"Error in describe_itinerary: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'message': 'Failed to write itinerary narrative.'
+            }
+    
     def get_emergency_advice(
         self, 
         situation: str, 
@@ -500,7 +923,8 @@ class GeminiService:
         try:
             prompt = self._get_emergency_prompt(situation, location, language)
             
-            response = self.chat_model.generate_content(
+            response = self.generate_content(
+                'emergency',
                 prompt,
                 generation_config={
                     'temperature': 0.3,
@@ -516,6 +940,9 @@ class GeminiService:
                 'language': language
             }
             
+        except OverloadedError as e:
+            logger.warning(f"Emergency advice request rejected: {str(e)}")
+            return self.overloaded_result(e)
         except Exception as e:
             logger.error(f"Error in get_emergency_advice: {str(e)}")
             return {
@@ -770,28 +1197,18 @@ Make sure all costs are realistic and the sum of daily costs equals total_estima
             prompt += f"\n\nRespond in {language} language."
         
         return prompt
-    
-    def _parse_itinerary_text(self, text: str, duration: int) -> List[Dict[str, Any]]:
-        """Parse itinerary from text if JSON parsing fails"""
-        days = []
-        for i in range(1, duration + 1):
-            days.append({
-                'day': i,
-                'date': f'Day {i}',
-                'places': [{'name': 'To be determined', 'time': 'TBD', 'description': 'Details will be provided', 'cost': 0}],
-                'accommodation': {'name': 'TBD', 'cost': 0},
-                'meals': {'breakfast': 0, 'lunch': 0, 'dinner': 0},
-                'total_cost': 0
-            })
-        return days
 
 # Singleton instance
 _gemini_service: Optional[GeminiService] = None
+_gemini_service_lock = threading.Lock()
 
 def get_gemini_service() -> GeminiService:
     """Get or create Gemini service instance"""
     global _gemini_service
     if _gemini_service is None:
-        _gemini_service = GeminiService()
+        # Concurrent first requests must share one instance (and one limiter)
+        with _gemini_service_lock:
+            if _gemini_service is None:
+                _gemini_service = GeminiService()
     return _gemini_service
 
@@ -0,0 +1,278 @@
+"""Conversation history compaction for chat prompts"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.services.cache_service import make_cache_key
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count without calling the API
+
+    Latin text averages ~4 characters per token; Devanagari tokenizes
+    much less densely, so non-ASCII characters are counted at ~2 per token.
+    """
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars + 1) // 2
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, on a word boundary"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    keep = max(int(len(text) * max_tokens / tokens), 1)
+    clipped = text[:keep].rsplit(' ', 1)[0] or text[:keep]
+    return clipped.rstrip() + ' …'
+
+
+def _fingerprint(message: Dict[str, str]) -> str:
+    normalized = ' '.join(message['content'].casefold().split())
+    return make_cache_key({'role': message['role'], 'content': normalized})[:16]
+
+
+def format_turns(messages: List[Dict[str, str]]) -> List[str]:
+    """Render messages as prompt lines"""
+    return [
+        f"{'User' if message['role'] == 'user' else 'Assistant'}: {message['content']}"
+        for message in messages
+    ]
+
+
+class HistoryCompactor:
+    """
+    Bounds the conversation context sent with each chat turn
+
+    Earlier turns repeating a long question are dropped, recent turns are kept newest-first within
+    a token budget (long ones clipped), and everything older is represented
+    by a rolling summary stored per session in the chats collection. The
+    summary is updated in the background, so a turn never waits on it; until
+    it catches up, the user's older questions stand in for it.
+    """
+
+    SUMMARY_PROMPT = """Summarize this conversation between a tourist and an Uttarakhand travel guide in at most {words} words.
+Keep places, dates, budgets, group details and preferences the user mentioned, and any recommendations already given.
+Drop greetings and repeated details. Write in the language of the conversation.
+
+Existing summary:
+{summary}
+
+New turns:
+{turns}
+
+Updated summary:"""
+
+    def __init__(self, gemini_service):
+        self.gemini_service = gemini_service
+        self.token_budget = Config.CHAT_HISTORY_TOKEN_BUDGET
+        self.max_messages = Config.CHAT_HISTORY_MAX_MESSAGES
+        self.message_max_tokens = Config.CHAT_HISTORY_MESSAGE_MAX_TOKENS
+        self.dedup_min_tokens = Config.CHAT_HISTORY_DEDUP_MIN_TOKENS
+        self.summary_max_tokens = Config.CHAT_SUMMARY_MAX_TOKENS
+        self._chat_model = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chat-summary')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stats = {'compacted': 0, 'summaries_written': 0, 'summary_failures': 0, 'duplicates_dropped': 0}
+        metrics.register_collector('chat_history', self.stats)
+
+    @property
+    def chat_model(self):
+        if self._chat_model is None:
+            from app.config.database import get_database
+            from app.models.chat import Chat
+            self._chat_model = Chat(get_database())
+        return self._chat_model
+
+    def compact(
+        self,
+        conversation_history: Optional[List[Dict[str, str]]],
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """
+        Reduce a conversation to a summary plus a bounded window of recent turns
+
+        Args:
+            conversation_history: Messages oldest first ({'role', 'content'})
+            user_id: Authenticated user; summaries are only stored for known users
+            session_id: Session the history belongs to
+
+        Returns:
+            (summary or None, recent messages oldest first)
+        """
+        messages = self._deduplicate(self._clean(conversation_history))
+        if not messages:
+            return None, []
+
+        recent: List[Dict[str, str]] = []
+        used = 0
+        for message in reversed(messages):
+            if len(recent) >= self.max_messages:
+                break
+            content = clip_to_tokens(message['content'], self.message_max_tokens)
+            tokens = estimate_tokens(content) + 2
+            if recent and used + tokens > self.token_budget:
+                break
+            recent.append({'role': message['role'], 'content': content})
+            used += tokens
+        recent.reverse()
+        older = messages[:len(messages) - len(recent)]
+
+        summary = self._summary_for(older, user_id, session_id) if older else None
+        self._record(conversation_history, summary, recent)
+        return summary, recent
+
+    @staticmethod
+    def _clean(conversation_history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        messages = []
+        for message in conversation_history or []:
+            if not isinstance(message, dict):
+                continue
+            content = str(message.get('content') or '').strip()
+            if content:
+                role = 'user' if message.get('role', 'user') == 'user' else 'assistant'
+                messages.append({'role': role, 'content': content})
+        return messages
+
+    def _deduplicate(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        # A turn is a user message and the replies to it; of turns asking the
+        # same long question only the latest is kept, whole, so roles keep
+        # alternating. Short messages ("yes", "how far?") mean something
+        # different each time and are never dropped.
+        turns: List[List[Dict[str, str]]] = []
+        for message in messages:
+            if message['role'] == 'user' or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+
+        seen = set()
+        kept_turns = []
+        for turn in reversed(turns):
+            question = turn[0]
+            if question['role'] == 'user' and estimate_tokens(question['content']) > self.dedup_min_tokens:
+                fingerprint = _fingerprint(question)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+            kept_turns.append(turn)
+        kept = [message for turn in reversed(kept_turns) for message in turn]
+
+        dropped = len(messages) - len(kept)
+        if dropped:
+            with self._lock:
+                self._stats['duplicates_dropped'] += dropped
+        return kept
+
+    def _summary_for(
+        self,
+        older: List[Dict[str, str]],
+        user_id: Optional[str],
+        session_id: Optional[str]
+    ) -> str:
+        stored = None
+        if Config.CHAT_SUMMARY_ENABLED and user_id and session_id:
+            try:
+                stored = self.chat_model.get_session_summary(user_id, session_id)
+            except Exception as e:
+                logger.warning(f"Failed to load chat summary: {str(e)}")
+
+        # Messages after the last one the stored summary covers still need folding in
+        fingerprints = [_fingerprint(message) for message in older]
+        uncovered = older
+        if stored and stored.get('covered_until') in fingerprints:
+            uncovered = older[fingerprints.index(stored['covered_until']) + 1:]
+
+        if uncovered and Config.CHAT_SUMMARY_ENABLED and user_id and session_id:
+            self._summarize_in_background(user_id, session_id, stored, uncovered, fingerprints[-1])
+
+        parts = []
+        if stored and stored.get('content'):
+            parts.append(stored['content'])
+        if uncovered:
+            questions = [message['content'] for message in uncovered if message['role'] == 'user']
+            if questions:
+                parts.append('Earlier the user asked: ' + '; '.join(
+                    clip_to_tokens(question, 40) for question in questions
+                ))
+        return clip_to_tokens('\n'.join(parts), self.summary_max_tokens) if parts else None
+
+    def _summarize_in_background(
+        self,
+        user_id: str,
+        session_id: str,
+        stored: Optional[Dict[str, Any]],
+        uncovered: List[Dict[str, str]],
+        covered_until: str
+    ) -> None:
+        key = (user_id, session_id)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+
+        def summarize():
+            try:
+                words = max(self.summary_max_tokens * 3 // 4, 50)
+                prompt = self.SUMMARY_PROMPT.format(
+                    words=words,
+                    summary=(stored or {}).get('content') or '(none)',
+                    turns='\n'.join(format_turns([
+                        {'role': m['role'], 'content': clip_to_tokens(m['content'], self.message_max_tokens)}
+                        for m in uncovered
+                    ]))
+                )
+                response = self.gemini_service.generate_content(
+                    'prewarm',
+                    prompt,
+                    generation_config={'temperature': 0.2, 'max_output_tokens': self.summary_max_tokens * 2}
+                )
+                self.chat_model.save_session_summary(
+                    user_id,
+                    session_id,
+                    clip_to_tokens(response.text.strip(), self.summary_max_tokens),
+                    covered_until,
+                    (stored or {}).get('covered_messages', 0) + len(uncovered)
+                )
+                with self._lock:
+                    self._stats['summaries_written'] += 1
+            except Exception as e:
+                logger.warning(f"Failed to update chat summary for session {session_id}: {str(e)}")
+                with self._lock:
+                    self._stats['summary_failures'] += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        self._executor.submit(summarize)
+
+    def _record(
+        self,
+        conversation_history: List[Dict[str, str]],
+        summary: Optional[str],
+        recent: List[Dict[str, str]]
+    ) -> None:
+        # Baseline: the previous behaviour of pasting the last 10 raw messages
+        baseline = sum(
+            estimate_tokens(line)
+            for line in format_turns(self._clean(conversation_history)[-10:])
+        )
+        used = sum(estimate_tokens(line) for line in format_turns(recent))
+        if summary:
+            used += estimate_tokens(summary)
+
+        metrics.increment('chat.history.prompt_tokens', used)
+        metrics.increment('chat.history.prompt_tokens_saved', baseline - used)
+        with self._lock:
+            self._stats['compacted'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get compaction and summary counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_summaries'] = len(self._pending)
+        return stats
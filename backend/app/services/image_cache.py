@@ -0,0 +1,223 @@
+"""Perceptual-hash result cache for image recognition"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+def dhash(image, hash_size: int = 8) -> int:
+    """
+    Compute a difference hash (dHash) of an image
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale
+    thumbnail and each bit records whether a pixel is brighter than its
+    right-hand neighbour, so re-encoded, resized or slightly re-framed
+    photos of the same scene land within a few bits of each other.
+
+    Args:
+        image: PIL image
+        hash_size: Hash width in bits per row (hash has hash_size**2 bits)
+
+    Returns:
+        Hash as an integer
+    """
+    from PIL import Image
+
+    thumbnail = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(thumbnail.getdata())
+    width = hash_size + 1
+
+    bits = 0
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """Burkhard-Keller tree for nearest-neighbour search under Hamming distance"""
+
+    def __init__(self):
+        # Each node is [hash, item, {distance: child_node}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def add(self, hash_value: int, item: Any) -> None:
+        """Insert an item; an identical hash replaces the existing item"""
+        if self._root is None:
+            self._root = [hash_value, item, {}]
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            if distance == 0:
+                node[1] = item
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, item, {}]
+                self._size += 1
+                return
+            node = child
+
+    def search(self, hash_value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        Find all items within max_distance of a hash
+
+        Returns:
+            (distance, item) pairs sorted by distance
+        """
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= max_distance:
+                matches.append((distance, node[1]))
+            # Triangle inequality: only children in [d - k, d + k] can match
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in node[2].items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _HashIndex:
+    """Entries for one (language, mode) pair, with a BK-tree over their hashes"""
+
+    def __init__(self):
+        self.tree = BKTree()
+        self.entries: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+
+    def rebuild(self) -> None:
+        """Rebuild the tree from live entries, dropping evicted nodes"""
+        self.tree = BKTree()
+        for entry_id, entry in self.entries.items():
+            self.tree.add(entry['hash'], entry_id)
+
+
+class VisionResultCache:
+    """Near-duplicate image cache keyed on perceptual hashes, per language"""
+
+    def __init__(self, max_distance: int = 6, max_entries: int = 2000, ttl: int = 86400):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._indexes: Dict[Tuple[str, str], _HashIndex] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+        self._saved_calls = 0
+        metrics.register_collector('vision_cache', self.stats)
+        logger.info("Vision result cache initialized")
+
+    def lookup(self, image_hash: int, language: str, mode: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a stored result for a near-identical image
+
+        Args:
+            image_hash: dHash of the enhanced image
+            language: Response language
+            mode: Recognition mode ('multi' or 'single')
+
+        Returns:
+            Copy of the stored result, or None
+        """
+        now = time.time()
+        with self._lock:
+            self._lookups += 1
+            index = self._indexes.get((language, mode))
+            if index is None:
+                return None
+
+            for distance, entry_id in index.tree.search(image_hash, self.max_distance):
+                entry = index.entries.get(entry_id)
+                if entry is None:
+                    continue
+                if entry['expires_at'] <= now:
+                    # Its tree node goes at the next rebuild, like an evicted one
+                    del index.entries[entry_id]
+                    continue
+                index.entries.move_to_end(entry_id)
+                self._hits += 1
+                self._saved_calls += entry['gemini_calls']
+                result = copy.deepcopy(entry['result'])
+                break
+            else:
+                return None
+
+        result['cached'] = True
+        result['cache_distance'] = distance
+        return result
+
+    def store(
+        self,
+        image_hash: int,
+        language: str,
+        mode: str,
+        result: Dict[str, Any],
+        gemini_calls: int = 1
+    ) -> None:
+        """
+        Store a recognition result
+
+        Args:
+            image_hash: dHash of the enhanced image
+            language: Response language
+            mode: Recognition mode ('multi' or 'single')
+            result: Combined recognition result
+            gemini_calls: Upstream calls a future hit on this entry saves
+        """
+        with self._lock:
+            index = self._indexes.setdefault((language, mode), _HashIndex())
+            # The tree keeps one item per hash, so the entry it replaces must go too
+            for _, previous_id in index.tree.search(image_hash, 0):
+                index.entries.pop(previous_id, None)
+            entry_id = self._next_id
+            self._next_id += 1
+            index.entries[entry_id] = {
+                'hash': image_hash,
+                'result': copy.deepcopy(result),
+                'gemini_calls': gemini_calls,
+                'expires_at': time.time() + self.ttl
+            }
+            index.tree.add(image_hash, entry_id)
+
+            while len(index.entries) > self.max_entries:
+                index.entries.popitem(last=False)
+
+            # Evicted entries stay in the tree as dead nodes until it gets too sparse
+            if len(index.tree) > 2 * max(len(index.entries), 1):
+                index.rebuild()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit ratio and saved upstream calls"""
+        with self._lock:
+            return {
+                'entries': sum(len(index.entries) for index in self._indexes.values()),
+                'lookups': self._lookups,
+                'hits': self._hits,
+                'hit_ratio': round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+                'saved_gemini_calls': self._saved_calls,
+                'max_distance': self.max_distance
+            }
@@ -0,0 +1,922 @@
+"""Deterministic itinerary planning over the place catalogue, with optional AI narrative"""
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.services.cache_service import create_response_cache, make_cache_key
+from app.services.place_matcher import PlaceMatcher
+from app.utils.geo import haversine_km
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class ItineraryPlanner:
+    """
+    Builds complete, costed itineraries locally in milliseconds
+
+    Road distances and driving hours between every pair of destinations are
+    precomputed once from their coordinates and altitudes: roads wind more
+    and climb slower the higher they go, and trek-access places add the walk
+    in and out. A plan is a tour from the start location and back. Places
+    are inserted greedily by interest score per added hour, each at the
+    position that costs the least time, as long as the tour still fits the
+    trip length and the budget left after lodging and meals; the tour is
+    then laid out day by day. The AI service is only used afterwards to
+    write a narrative for the finished plan, fetched separately by id.
+    """
+
+    # Hours spent at a destination, by place type
+    VISIT_HOURS = {
+        'temple': 2.0,
+        'religious': 3.0,
+        'hill_station': 4.0,
+        'wildlife': 5.0,
+        'nature': 4.0,
+        'adventure': 4.0,
+        'city': 3.0
+    }
+
+    # Typical per-person entry and activity spend (₹), by place type
+    VISIT_COST = {
+        'temple': 100,
+        'religious': 200,
+        'hill_station': 300,
+        'wildlife': 2500,
+        'nature': 200,
+        'adventure': 1000,
+        'city': 200
+    }
+
+    # What the coordinates cannot tell: the walk in from the road head,
+    # visit length, activity spend and season
+    PLACE_DETAILS = {
+        'kedarnath': {'access_hours': 7.0, 'trek': {'from': 'Gaurikund', 'km': 16}},
+        'yamunotri': {'access_hours': 3.0, 'trek': {'from': 'Janki Chatti', 'km': 6}},
+        'valley_of_flowers': {
+            'access_hours': 5.0,
+            'trek': {'from': 'Govindghat', 'via': 'Ghangaria'},
+            'visit_hours': 5.0,
+            'season': 'June to October'
+        },
+        'tungnath': {'access_hours': 2.5, 'trek': {'from': 'Chopta', 'km': 3.5}},
+        'jim_corbett': {'cost': 3000},
+        'auli': {'cost': 1200},
+        'rishikesh': {'cost': 1500}
+    }
+
+    CHAR_DHAM = ('kedarnath', 'badrinath', 'gangotri', 'yamunotri')
+
+    # Interest words (matched by prefix) -> place types and keywords they favour
+    INTEREST_PROFILES = {
+        'temple': (('temple', 'religious'), ()),
+        'spiritual': (('temple', 'religious'), ()),
+        'religio': (('temple', 'religious'), ()),
+        'pilgrim': (('temple', 'religious'), ()),
+        'shrine': (('temple',), ()),
+        'dham': (('temple',), ()),
+        'trek': (('adventure', 'nature'), ('trek',)),
+        'hiking': (('adventure', 'nature'), ('trek',)),
+        'adventure': (('adventure',), ('rafting', 'skiing', 'trek')),
+        'rafting': ((), ('rafting',)),
+        'ski': ((), ('skiing',)),
+        'wildlife': (('wildlife',), ('tiger', 'safari')),
+        'safari': (('wildlife',), ('safari',)),
+        'nature': (('nature', 'wildlife'), ('meadow', 'flowers')),
+        'hill': (('hill_station',), ()),
+        'lake': ((), ('lake',)),
+        'snow': ((), ('snow', 'skiing')),
+        'yoga': ((), ('yoga',)),
+        'wellness': ((), ('yoga', 'ashram')),
+        'meditation': ((), ('yoga', 'ashram')),
+        'photo': (('nature', 'hill_station', 'adventure'), ('view',)),
+        'culture': (('city', 'temple'), ('ancient', 'mall road')),
+        'heritage': (('temple',), ('ancient',)),
+        'family': (('hill_station', 'city'), ('lake', 'mall road')),
+        'himalaya': (('adventure', 'nature'), ('snow', 'view'))
+    }
+
+    # Spending tiers, cheapest first: lodging per night and meals per day (₹)
+    TIERS = [
+        {'name': 'Budget', 'lodging': 800, 'meals': {'breakfast': 100, 'lunch': 200, 'dinner': 250}},
+        {'name': 'Standard', 'lodging': 1800, 'meals': {'breakfast': 200, 'lunch': 300, 'dinner': 400}},
+        {'name': 'Comfort', 'lodging': 3500, 'meals': {'breakfast': 300, 'lunch': 450, 'dinner': 600}},
+        {'name': 'Luxury', 'lodging': 7000, 'meals': {'breakfast': 500, 'lunch': 800, 'dinner': 1000}}
+    ]
+
+    # Travel style -> preferred tier and active hours per day
+    STYLES = {
+        'backpacker': {'tier': 0, 'day_hours': 11.0},
+        'budget': {'tier': 0, 'day_hours': 10.0},
+        'moderate': {'tier': 1, 'day_hours': 9.0},
+        'family friendly': {'tier': 2, 'day_hours': 8.0},
+        'luxury': {'tier': 3, 'day_hours': 8.0}
+    }
+
+    ACCOMMODATION_FACTORS = {'hostel': 0.7, 'dharamshala': 0.6, 'camp': 0.8, 'homestay': 0.9, 'hotel': 1.0, 'resort': 1.5}
+
+    # Transport mode -> (₹ per road km, local transport per day, speed relative to a car)
+    TRANSPORT = {
+        'bus': (2.5, 300, 0.8),
+        'mixed': (8.0, 500, 1.0),
+        'car': (10.0, 500, 1.0),
+        'taxi': (14.0, 800, 1.0),
+        'bike': (4.0, 300, 1.1)
+    }
+
+    # Rendered text by language; place names and catalogue seasons and
+    # descriptions are left as they are in the catalogue
+    TEXT = {
+        'english': {
+            'day': 'Day {n}',
+            'drive': 'About {km} km by road from {origin}, {hours} h in all',
+            'including': ', including {access}',
+            'continue': 'Continue the journey',
+            'travel': 'Travel to {name}',
+            'halt': 'Overnight halt en route to {name}',
+            'free': 'Free day in {name}',
+            'free_after': 'Unplanned time to rest, revisit favourites or explore nearby markets and walks',
+            'free_idle': 'Unplanned time to rest or explore locally',
+            'stay': '{tier} stay in {name}',
+            'tiers': {'Budget': 'Budget', 'Standard': 'Standard', 'Comfort': 'Comfort', 'Luxury': 'Luxury'},
+            'local_transport': 'Local transport and transfers',
+            'explore': 'Explore {name}',
+            'trek': 'the {km} km trek from {start}',
+            'trek_via': 'the trek in from {start} via {via}',
+            'packing': {
+                'basic': ['Photo ID', 'Comfortable walking shoes', 'Reusable water bottle',
+                          'First-aid kit and personal medicines', 'Power bank'],
+                'cold': ['Warm layers and a windproof jacket', 'Sunscreen and sunglasses'],
+                'trek': ['Trekking shoes', 'Rain poncho', 'Small daypack'],
+                'temple': 'Modest clothing for temple visits',
+                'wildlife': 'Neutral-coloured clothing and binoculars'
+            },
+            'char_dham': [
+                'Char Dham pilgrims must register with Uttarakhand Tourism before the yatra.',
+                'The Char Dham temples close for winter, roughly November to April.'
+            ],
+            'altitude': 'Ascend gradually, drink plenty of water and descend if you get altitude sickness symptoms.',
+            'trek_tip': 'Reaching {name} involves {access}; start early, ponies and porters are available.',
+            'safari': 'Book jungle safaris in advance; zones fill up in peak season.',
+            'season': 'Best time to visit {name}: {season}.',
+            'roads': 'Mountain roads are slow and can close after heavy rain; check travel alerts before setting off.',
+            'emergency': 'Emergency numbers: police 100, ambulance 108, disaster management 1070.',
+            'squeezed': 'This budget only stretches to dharamshala or hostel stays and buses, so the plan assumes them.',
+            'unknown_start': "{location} is not in the planner's catalogue, so this plan starts and ends at {name}."
+        },
+        'hindi': {
+            'day': 'दिन {n}',
+            'drive': '{origin} से सड़क मार्ग से लगभग {km} किमी, कुल {hours} घंटे',
+            'including': ', जिसमें {access} शामिल है',
+            'continue': 'यात्रा जारी रखें',
+            'travel': '{name} की यात्रा',
+            'halt': '{name} के रास्ते में रात्रि विश्राम',
+            'free': '{name} में खाली दिन',
+            'free_after': 'आराम करने, पसंदीदा जगहें दोबारा देखने या आसपास के बाज़ार और सैर के लिए खाली समय',
+            'free_idle': 'आराम करने या आसपास घूमने के लिए खाली समय',
+            'stay': '{name} में {tier} ठहराव',
+            'tiers': {'Budget': 'बजट', 'Standard': 'स्टैंडर्ड', 'Comfort': 'आरामदायक', 'Luxury': 'लग्ज़री'},
+            'local_transport': 'स्थानीय परिवहन और आवागमन',
+            'explore': '{name} घूमें',
+            'trek': '{start} से {km} किमी की पैदल यात्रा',
+            'trek_via': '{start} से {via} होते हुए पैदल यात्रा',
+            'packing': {
+                'basic': ['पहचान पत्र', 'चलने के लिए आरामदायक जूते', 'दोबारा भरने लायक पानी की बोतल',
+                          'प्राथमिक चिकित्सा किट और निजी दवाइयाँ', 'पावर बैंक'],
+                'cold': ['गर्म कपड़े और हवा-रोधी जैकेट', 'सनस्क्रीन और धूप का चश्मा'],
+                'trek': ['ट्रेकिंग जूते', 'रेनकोट', 'छोटा बैग'],
+                'temple': 'मंदिर दर्शन के लिए शालीन कपड़े',
+                'wildlife': 'हल्के रंग के कपड़े और दूरबीन'
+            },
+            'char_dham': [
+                'चारधाम यात्रियों को यात्रा से पहले उत्तराखंड पर्यटन में पंजीकरण कराना अनिवार्य है।',
+                'चारधाम मंदिर सर्दियों में, लगभग नवंबर से अप्रैल तक, बंद रहते हैं।'
+            ],
+            'altitude': 'धीरे-धीरे ऊँचाई पर चढ़ें, खूब पानी पिएँ और ऊँचाई की बीमारी के लक्षण दिखें तो नीचे उतरें।',
+            'trek_tip': '{name} पहुँचने के लिए {access} करनी होती है; जल्दी निकलें, घोड़े-खच्चर और कुली उपलब्ध हैं।',
+            'safari': 'जंगल सफारी पहले से बुक करें; व्यस्त मौसम में ज़ोन जल्दी भर जाते हैं।',
+            'season': '{name} घूमने का सबसे अच्छा समय: {season}।',
+            'roads': 'पहाड़ी सड़कों पर यात्रा धीमी होती है और भारी बारिश के बाद सड़कें बंद हो सकती हैं; निकलने से पहले यात्रा अलर्ट देखें।',
+            'emergency': 'आपातकालीन नंबर: पुलिस 100, एम्बुलेंस 108, आपदा प्रबंधन 1070।',
+            'squeezed': 'इस बजट में केवल धर्मशाला या हॉस्टल और बसें ही संभव हैं, इसलिए योजना इन्हीं पर आधारित है।',
+            'unknown_start': '{location} योजनाकार की सूची में नहीं है, इसलिए यह योजना {name} से शुरू होकर वहीं समाप्त होती है।'
+        },
+        'garhwali': {
+            'day': 'दिन {n}',
+            'drive': '{origin} बटि सड़क से लगभग {km} किमी, कुल {hours} घंटा',
+            'including': ', जैमा {access} भि शामिल च',
+            'continue': 'यात्रा जारी रखा',
+            'travel': '{name} कि यात्रा',
+            'halt': '{name} जांद बाटा मा रात रुकण',
+            'free': '{name} मा खाली दिन',
+            'free_after': 'आराम करणा, पसंदै जगा दुबारा देखणा या आसपास बजार अर सैर कु खाली बगत',
+            'free_idle': 'आराम करणा या आसपास घुमणा कु खाली बगत',
+            'stay': '{name} मा {tier} ठैरणो',
+            'tiers': {'Budget': 'बजट', 'Standard': 'स्टैंडर्ड', 'Comfort': 'आरामदायक', 'Luxury': 'लग्ज़री'},
+            'local_transport': 'स्थानीय गाड़ी-मोटर अर आवत-जावत',
+            'explore': '{name} घुमा',
+            'trek': '{start} बटि {km} किमी पैदल बाटो',
+            'trek_via': '{start} बटि {via} ह्वेकि पैदल बाटो',
+            'packing': {
+                'basic': ['पछ्याण पत्र', 'हिटणा कु आरामदायक जुत्ता', 'दुबारा भरण वळि पाणि कि बोतल',
+                          'मरहम-पट्टी कि किट अर अपणि दवै', 'पावर बैंक'],
+                'cold': ['गरम कपड़ा अर हवा रोकण वळि जैकेट', 'सनस्क्रीन अर धूपौ चश्मा'],
+                'trek': ['ट्रेकिंग जुत्ता', 'बरखा कु रेनकोट', 'छ्वटो झोला'],
+                'temple': 'मंदिर दर्शन कु सादा कपड़ा',
+                'wildlife': 'हल्का रंगौ कपड़ा अर दूरबीन'
+            },
+            'char_dham': [
+                'चारधाम यात्र्यूं तैं यात्रा से पैलि उत्तराखंड पर्यटन मा पंजीकरण करौण जरूरी च।',
+                'चारधाम मंदिर ह्यूंद मा, लगभग नवंबर बटि अप्रैल तक, बंद रंदन।'
+            ],
+            'altitude': 'धीरे-धीरे ऐंच चढ़ा, खूब पाणि प्या अर ऊँचाई कि बीमारी का लक्षण दिखेन त तौळ उतरा।',
+            'trek_tip': '{name} पौंछणा कु {access} करण पड़द; सुबेर जल्दी निकळा, घ्वाड़ा-खच्चर अर कुली मिल जंदन।',
+            'safari': 'जंगल सफारी पैलि बटि बुक करा; सीजन मा ज़ोन जल्दी भरे जंदन।',
+            'season': '{name} घुमणा कु सबसे बढ़िया बगत: {season}।',
+            'roads': 'पहाड़ी सड़कूं मा गाड़ी धीरे चलदि अर भारी बरखा का बाद सड़क बंद ह्वे सकदन; निकळण से पैलि यात्रा अलर्ट देखा।',
+            'emergency': 'आपातकालीन नंबर: पुलिस 100, एम्बुलेंस 108, आपदा प्रबंधन 1070।',
+            'squeezed': 'ये बजट मा सिर्फ धर्मशाला या हॉस्टल अर बस ही ह्वे सकदन, इलै योजना मा यी माने गैन।',
+            'unknown_start': '{location} योजनाकार कि सूची मा नि च, इलै या योजना {name} बटि शुरू ह्वेकि वखी खतम होंद।'
+        },
+        'kumaoni': {
+            'day': 'दिन {n}',
+            'drive': '{origin} बटी सड़कक रस्त लगभग {km} किमी, कुल {hours} घंट',
+            'including': ', जमें {access} लै शामिल छ',
+            'continue': 'यात्रा जारी राखौ',
+            'travel': '{name} कि यात्रा',
+            'halt': '{name} जान्हैं बाट में रात रुकण',
+            'free': '{name} में खाली दिन',
+            'free_after': 'आराम करण, पसंदक जाग दुबार देखण या आसपासक बजार और सैर हुँ खाली टैम',
+            'free_idle': 'आराम करण या आसपास घुमण हुँ खाली टैम',
+            'stay': '{name} में {tier} ठहरण',
+            'tiers': {'Budget': 'बजट', 'Standard': 'स्टैंडर्ड', 'Comfort': 'आरामदायक', 'Luxury': 'लग्ज़री'},
+            'local_transport': 'स्थानीय गाड़ि और आण-जाण',
+            'explore': '{name} घुमौ',
+            'trek': '{start} बटी {km} किमी पैदल बाट',
+            'trek_via': '{start} बटी {via} है बेर पैदल बाट',
+            'packing': {
+                'basic': ['पछयाण पत्र', 'हिटण हुँ आरामदायक जुत', 'दुबार भरण वालि पाणिक बोतल',
+                          'मरहम-पट्टीक किट और आपणि दवाई', 'पावर बैंक'],
+                'cold': ['गरम लुकुड़ और हाव रोकण वालि जैकेट', 'सनस्क्रीन और घामक चश्म'],
+                'trek': ['ट्रेकिंग जुत', 'बरखाक रेनकोट', 'नानु झोल'],
+                'temple': 'मंदिर दर्शन हुँ सादा लुकुड़',
+                'wildlife': 'हल्क रंगक लुकुड़ और दूरबीन'
+            },
+            'char_dham': [
+                'चारधाम यात्रियों कैं यात्रा है पैलि उत्तराखंड पर्यटन में पंजीकरण करूण जरूरी छ।',
+                'चारधाम मंदिर ह्यूँन में, लगभग नवंबर बटी अप्रैल तक, बंद रूनी।'
+            ],
+            'altitude': 'धीरे-धीरे मल चढ़ौ, खूब पाणि पियौ और ऊँचाइक बीमारीक लक्षण देखीण पर तल उतरौ।',
+            'trek_tip': '{name} पुजण हुँ {access} करण पड़ूं; रत्तै जल्दी निकलौ, घोड़-खच्चर और कुली मिल जानी।',
+            'safari': 'जंगल सफारी पैलि बटी बुक करौ; सीजन में ज़ोन जल्दी भरी जानी।',
+            'season': '{name} घुमणक सबूं है भल टैम: {season}।',
+            'roads': 'पहाड़ी सड़कन में गाड़ि धीरे चलैं और भारी बरखाक बाद सड़क बंद है सकनी; निकलण है पैलि यात्रा अलर्ट देखौ।',
+            'emergency': 'आपातकालीन नंबर: पुलिस 100, एम्बुलेंस 108, आपदा प्रबंधन 1070।',
+            'squeezed': 'यो बजट में सिर्फ धर्मशाला या हॉस्टल और बस ही है सकनी, यैक वील योजना में यई मानी गईं।',
+            'unknown_start': '{location} योजनाकारक सूची में न्हैं, यैक वील यो योजना {name} बटी शुरू है बेर वईं खतम हूं।'
+        }
+    }
+
+    DAY_START = 8.0  # Clock hour the first activity of a day starts
+    LATE_ARRIVAL_HOURS = 1.0  # A drive may run this far past the end of the day instead of halting
+    MISC_SHARE = 0.05  # Held back from the budget for miscellaneous spend
+    FIXED_SHARE = 0.75  # A tier is only chosen if its lodging and meals leave a quarter of the budget
+
+    def __init__(self, places: Optional[Dict[str, Dict[str, Any]]] = None, gemini_service_factory=None):
+        """
+        Args:
+            places: Place records keyed by slug, with coordinates (defaults to KNOWN_PLACES)
+            gemini_service_factory: Zero-argument callable returning the Gemini
+                service for narratives (None disables them)
+        """
+        places = places if places is not None else PlaceMatcher.KNOWN_PLACES
+        self.slugs = [slug for slug, place in places.items() if place.get('coordinates')]
+        self.places = [places[slug] for slug in self.slugs]
+        self.matcher = PlaceMatcher({slug: places[slug] for slug in self.slugs})
+        self._index = {place['name']: idx for idx, place in enumerate(self.places)}
+        self._details = [self.PLACE_DETAILS.get(slug, {}) for slug in self.slugs]
+        self._access = [details.get('access_hours', 0.0) for details in self._details]
+        self.distances, self.hours = self._build_matrix()
+
+        self.gemini_service_factory = gemini_service_factory
+        self.narratives = create_response_cache(
+            'itinerary_narrative',
+            backend=Config.ITINERARY_CACHE_BACKEND,
+            default_ttl=Config.ITINERARY_CACHE_TTL,
+            max_entries=Config.ITINERARY_CACHE_MAX_ENTRIES
+        )
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='itinerary-narrative')
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stats = {'plans': 0, 'plan_ms_total': 0.0, 'plan_ms_max': 0.0, 'narratives_started': 0, 'narratives_failed': 0}
+        metrics.register_collector('itinerary_planner', self.stats)
+        logger.info(f"Itinerary planner ready ({len(self.places)} destinations)")
+
+    @classmethod
+    def from_sources(cls, seed_path: Optional[str] = None, gemini_service_factory=None) -> 'ItineraryPlanner':
+        """
+        Build the catalogue from KNOWN_PLACES plus the places seed file
+
+        Seed places that name a known place add their description, entry fee
+        and best season to it; others with coordinates and a category become
+        destinations of their own.
+        """
+        places = {slug: dict(place) for slug, place in PlaceMatcher.KNOWN_PLACES.items()}
+        seed_places = []
+        if seed_path:
+            try:
+                with open(seed_path, 'r', encoding='utf-8') as f:
+                    seed_places = json.load(f).get('places', [])
+            except Exception as e:
+                logger.warning(f"Could not read place seeds from {seed_path}: {str(e)}")
+
+        lookup = {}
+        for slug, place in places.items():
+            for term in [place['name']] + place.get('aliases', []):
+                lookup[term.lower()] = slug
+        for seed in seed_places:
+            slug = lookup.get(str(seed.get('name', '')).lower())
+            if slug:
+                place = places[slug]
+            elif seed.get('coordinates') and seed.get('category'):
+                slug = re.sub(r'[^a-z0-9]+', '_', seed['name'].lower()).strip('_')
+                place = places[slug] = {
+                    'name': seed['name'],
+                    'aliases': [],
+                    'district': seed.get('district', ''),
+                    'type': seed['category'],
+                    'altitude': seed.get('altitude', 1000),
+                    'coordinates': {
+                        'lat': seed['coordinates']['latitude'],
+                        'lon': seed['coordinates']['longitude']
+                    },
+                    'popularity': 50,
+                    'keywords': []
+                }
+            else:
+                continue
+            for field in ('description', 'best_time_to_visit', 'entry_fee'):
+                if field in seed:
+                    place[field] = seed[field]
+        return cls(places, gemini_service_factory)
+
+    def _build_matrix(self) -> Tuple[List[List[float]], List[List[float]]]:
+        """Road km and driving hours between every pair of destinations"""
+        count = len(self.places)
+        distances = [[0.0] * count for _ in range(count)]
+        hours = [[0.0] * count for _ in range(count)]
+        for i, origin in enumerate(self.places):
+            for j, destination in enumerate(self.places):
+                if i == j:
+                    continue
+                top = max(origin.get('altitude', 0), destination.get('altitude', 0))
+                # Hill roads wind: ~1.5x the straight line in the foothills, ~2x high up
+                road_km = haversine_km(
+                    origin['coordinates']['lat'], origin['coordinates']['lon'],
+                    destination['coordinates']['lat'], destination['coordinates']['lon']
+                ) * (1.5 + 0.5 * min(top, 2000) / 2000)
+                speed = 40.0 if top < 1000 else 25.0
+                # Half an hour more for every km climbed beyond the first
+                climb = max(destination.get('altitude', 0) - origin.get('altitude', 0), 0)
+                distances[i][j] = road_km
+                hours[i][j] = road_km / speed + max(climb - 1000, 0) / 1000 * 0.5
+        return distances, hours
+
+    def _leg_hours(self, i: int, j: int, speed: float) -> float:
+        if i == j:
+            return 0.0
+        # Walking back out to the road is quicker than walking in
+        return self.hours[i][j] / speed + self._access[i] * 0.7 + self._access[j]
+
+    def _visit_hours(self, idx: int) -> float:
+        return self._details[idx].get('visit_hours', self.VISIT_HOURS.get(self.places[idx].get('type'), 3.0))
+
+    def _visit_cost(self, idx: int) -> int:
+        if 'cost' in self._details[idx]:
+            return self._details[idx]['cost']
+        place = self.places[idx]
+        return max(place.get('entry_fee', 0), self.VISIT_COST.get(place.get('type'), 200))
+
+    def score_places(self, interests: List[str]) -> List[float]:
+        """
+        Score every destination for a list of free-text interests
+
+        Each interest favouring a place's type adds 3, one matching only its
+        keywords adds 2, and naming the place anywhere adds 4; popularity
+        adds up to 0.5 so unmatched places still rank among themselves.
+        """
+        profiles = []
+        for interest in interests:
+            types, keywords = set(), set()
+            for word in re.findall(r'[a-z]+', str(interest).lower()):
+                for key, (key_types, key_keywords) in self.INTEREST_PROFILES.items():
+                    if word.startswith(key) or (len(word) >= 4 and key.startswith(word)):
+                        types.update(key_types)
+                        keywords.update(key_keywords)
+            profiles.append((types, keywords))
+        text = ' '.join(str(interest) for interest in interests).lower()
+
+        scores = []
+        for place in self.places:
+            place_text = ' '.join(place.get('keywords', []) + [place['name'], place.get('description', '')]).lower()
+            score = place.get('popularity', 50) / 200
+            for types, keywords in profiles:
+                if place.get('type') in types:
+                    score += 3.0
+                elif any(keyword in place_text for keyword in keywords):
+                    score += 2.0
+            if any(re.search(rf'\b{re.escape(term)}\b', text) for term in [place['name'].lower()] + place.get('aliases', [])):
+                score += 4.0
+            scores.append(score)
+        return scores
+
+    def _resolve_start(self, start_location: str) -> Tuple[int, bool]:
+        matched = self.matcher.match_place(start_location or '')
+        if matched and matched['name'] in self._index:
+            return self._index[matched['name']], True
+        return self._index.get('Dehradun', 0), False
+
+    def _choose_tier(self, preferred: int, lodging_factor: float, local_cost: int, duration: int, budget: float) -> Dict[str, Any]:
+        for tier in reversed(self.TIERS[:preferred + 1]):
+            daily = tier['lodging'] * lodging_factor + sum(tier['meals'].values()) + local_cost
+            if daily * duration <= budget * self.FIXED_SHARE:
+                return tier
+        return self.TIERS[0]
+
+    def _schedule(
+        self,
+        start: int,
+        route: List[int],
+        day_hours: float,
+        speed: float,
+        free_days: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Lay a tour out in time
+
+        A drive that does not fit what is left of a day waits for the next
+        morning, unless it is longer than a whole day, when it halts
+        overnight on the way; visits never span days. Free days are spent
+        at the last stop before the journey back. Returns (events, days used), each event carrying its
+        kind (travel, visit or free), day, start and end hour and place.
+        """
+        events = []
+        day, clock = 0, 0.0
+
+        def travel(origin: int, stop: int) -> None:
+            nonlocal day, clock
+            remaining = self._leg_hours(origin, stop, speed)
+            first = True
+            while remaining > 1e-9:
+                available = day_hours - clock
+                if remaining <= available + self.LATE_ARRIVAL_HOURS:
+                    used = remaining
+                elif clock > 0 and (remaining <= day_hours + self.LATE_ARRIVAL_HOURS or available < 1.0):
+                    # Set off the next morning rather than halting on the way
+                    day, clock = day + 1, 0.0
+                    continue
+                else:
+                    used = available
+                events.append({
+                    'kind': 'travel', 'day': day, 'start': clock, 'end': clock + used,
+                    'place': stop, 'origin': origin, 'first': first, 'arrives': used >= remaining - 1e-9
+                })
+                clock += used
+                remaining -= used
+                first = False
+
+        here = start
+        for stop in route:
+            travel(here, stop)
+            visit = self._visit_hours(stop)
+            if clock + visit > day_hours:
+                day, clock = day + 1, 0.0
+            events.append({'kind': 'visit', 'day': day, 'start': clock, 'end': clock + visit, 'place': stop})
+            clock += visit
+            here = stop
+        for _ in range(free_days):
+            day += 1
+            events.append({'kind': 'free', 'day': day, 'start': 0.0, 'end': day_hours, 'place': here})
+            clock = day_hours
+        travel(here, start)
+        return events, day + 1
+
+    def _route_hours(self, start: int, route: List[int], speed: float) -> float:
+        stops = [start] + route + [start]
+        return sum(self._leg_hours(stops[k], stops[k + 1], speed) for k in range(len(stops) - 1))
+
+    def _route_km(self, start: int, route: List[int]) -> float:
+        stops = [start] + route + [start]
+        return sum(self.distances[stops[k]][stops[k + 1]] for k in range(len(stops) - 1))
+
+    def _two_opt(self, start: int, route: List[int], speed: float) -> bool:
+        """Reverse route segments while that shortens the tour; returns whether it changed"""
+        improved = False
+        best = self._route_hours(start, route, speed)
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(route) - 1):
+                for j in range(i + 1, len(route)):
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    hours = self._route_hours(start, candidate, speed)
+                    if hours < best - 1e-6:
+                        route[:] = candidate
+                        best = hours
+                        changed = improved = True
+        return improved
+
+    def _build_route(
+        self,
+        start: int,
+        scores: List[float],
+        duration: int,
+        day_hours: float,
+        speed: float,
+        travel_budget: float,
+        per_km: float
+    ) -> List[int]:
+        route: List[int] = []
+        spent = 0.0
+        while True:
+            while True:
+                stops = [start] + route + [start]
+                candidates = []
+                for place in range(len(self.places)):
+                    if place in route:
+                        continue
+                    # Cheapest position for this place, in added hours
+                    best = None
+                    for k in range(len(stops) - 1):
+                        a, b = stops[k], stops[k + 1]
+                        added = (
+                            self._leg_hours(a, place, speed) + self._leg_hours(place, b, speed)
+                            - self._leg_hours(a, b, speed)
+                        )
+                        if best is None or added < best[0]:
+                            added_km = self.distances[a][place] + self.distances[place][b] - self.distances[a][b]
+                            best = (added, k, added_km)
+                    added, position, added_km = best
+                    ratio = scores[place] / (added + self._visit_hours(place) + 1.0)
+                    candidates.append((ratio, place, position, added_km * per_km + self._visit_cost(place)))
+                candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+                inserted = False
+                for _, place, position, cost in candidates:
+                    if spent + cost > travel_budget:
+                        continue
+                    trial = route[:position] + [place] + route[position:]
+                    if self._schedule(start, trial, day_hours, speed)[1] <= duration:
+                        route, spent, inserted = trial, spent + cost, True
+                        break
+                if not inserted:
+                    break
+            # A shorter order may free time for another stop, but day
+            # boundaries can still make it need more days or road money
+            reordered = list(route)
+            if not self._two_opt(start, reordered, speed):
+                return route
+            reordered_spent = self._route_km(start, reordered) * per_km + sum(self._visit_cost(place) for place in reordered)
+            if reordered_spent > travel_budget or self._schedule(start, reordered, day_hours, speed)[1] > duration:
+                return route
+            route, spent = reordered, reordered_spent
+
+    def plan(self, preferences: Dict[str, Any], language: str = 'english') -> Dict[str, Any]:
+        """
+        Plan an itinerary
+
+        Args:
+            preferences: duration, budget, interests, start_location,
+                travel_style, accommodation_type, transport_mode
+            language: Language of the rendered text (english, hindi, garhwali, kumaoni)
+
+        Returns:
+            Itinerary in the same shape as the AI-generated one (days with
+            places, accommodation, meals, transport and total_cost; packing
+            list, tips, budget breakdown) plus the route and source 'local'
+        """
+        started = time.perf_counter()
+        if language not in self.TEXT:
+            language = 'english'
+        text = self.TEXT[language]
+        duration = max(int(preferences.get('duration', 3)), 1)
+        budget = float(preferences.get('budget', 0) or 0)
+        interests = preferences.get('interests') or []
+        style = self.STYLES.get(str(preferences.get('travel_style', 'moderate')).strip().lower(), self.STYLES['moderate'])
+        lodging_factor = self.ACCOMMODATION_FACTORS.get(
+            str(preferences.get('accommodation_type', 'hotel')).strip().lower(), 1.0
+        )
+        per_km, local_cost, speed = self.TRANSPORT.get(
+            str(preferences.get('transport_mode', 'mixed')).strip().lower(), self.TRANSPORT['mixed']
+        )
+        day_hours = style['day_hours']
+
+        start, start_known = self._resolve_start(preferences.get('start_location', 'Dehradun'))
+        tier = self._choose_tier(style['tier'], lodging_factor, local_cost, duration, budget)
+        lodging = round(tier['lodging'] * lodging_factor)
+        fixed = (lodging + sum(tier['meals'].values()) + local_cost) * duration
+        # Below what the chosen stays and transport need, fall back to the cheapest of both
+        squeezed = fixed * (1 + self.MISC_SHARE) > budget
+        if squeezed:
+            lodging = round(tier['lodging'] * min(self.ACCOMMODATION_FACTORS.values()))
+            per_km, local_cost, speed = self.TRANSPORT['bus']
+            fixed = (lodging + sum(tier['meals'].values()) + local_cost) * duration
+        travel_budget = budget / (1 + self.MISC_SHARE) - fixed
+
+        scores = self.score_places(interests)
+        route = self._build_route(start, scores, duration, day_hours, speed, travel_budget, per_km)
+
+        # Spare days go to the last stop, as many as still fit before the journey back
+        events, used = self._schedule(start, route, day_hours, speed)
+        for free_days in range(duration - used, 0, -1):
+            trial_events, trial_used = self._schedule(start, route, day_hours, speed, free_days)
+            if trial_used <= duration:
+                events, used = trial_events, trial_used
+                break
+
+        itinerary = self._render(
+            events, route, start, duration, budget, tier, lodging, local_cost, per_km, speed, day_hours, language
+        )
+        if squeezed:
+            itinerary['travel_tips'].insert(0, text['squeezed'])
+        if not start_known:
+            itinerary['travel_tips'].insert(0, text['unknown_start'].format(
+                location=preferences.get('start_location'), name=self.places[start]['name']
+            ))
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        itinerary['planning_ms'] = round(elapsed_ms, 2)
+        with self._lock:
+            self._stats['plans'] += 1
+            self._stats['plan_ms_total'] += elapsed_ms
+            self._stats['plan_ms_max'] = max(self._stats['plan_ms_max'], elapsed_ms)
+        return itinerary
+
+    @staticmethod
+    def _clock(hours: float) -> str:
+        minutes = int(round(hours * 4)) * 15
+        hour, minute = divmod(minutes, 60)
+        suffix = 'AM' if hour % 24 < 12 else 'PM'
+        return f"{(hour % 12) or 12}:{minute:02d} {suffix}"
+
+    def _describe(self, idx: int, language: str) -> str:
+        place = self.places[idx]
+        explore = self.TEXT[language]['explore'].format(name=place['name'])
+        # Catalogue descriptions and keywords are English
+        if language != 'english':
+            return explore
+        if place.get('description'):
+            return place['description']
+        highlights = ', '.join(keyword.title() for keyword in place.get('keywords', [])[:4])
+        return explore + (f" - {highlights}" if highlights else '')
+
+    def _trek(self, idx: int, language: str) -> Optional[str]:
+        """The walk in from the road head to a place, if it has one"""
+        trek = self._details[idx].get('trek')
+        if not trek:
+            return None
+        text = self.TEXT[language]
+        if 'km' in trek:
+            return text['trek'].format(km=f"{trek['km']:g}", start=trek['from'])
+        return text['trek_via'].format(start=trek['from'], via=trek['via'])
+
+    def _render(
+        self,
+        events: List[Dict[str, Any]],
+        route: List[int],
+        start: int,
+        duration: int,
+        budget: float,
+        tier: Dict[str, Any],
+        lodging: int,
+        local_cost: int,
+        per_km: float,
+        speed: float,
+        day_hours: float,
+        language: str
+    ) -> Dict[str, Any]:
+        text = self.TEXT[language]
+        days = []
+        breakdown = {'accommodation': 0, 'meals': 0, 'transport': 0, 'activities': 0, 'miscellaneous': 0}
+        by_day: Dict[int, List[Dict[str, Any]]] = {}
+        for event in events:
+            by_day.setdefault(event['day'], []).append(event)
+
+        where = start
+        for day in range(duration):
+            items = []
+            overnight = None
+            for event in by_day.get(day, []):
+                time_range = f"{self._clock(self.DAY_START + event['start'])} - {self._clock(self.DAY_START + event['end'])}"
+                name = self.places[event['place']]['name']
+                if event['kind'] == 'travel':
+                    origin = self.places[event['origin']]['name']
+                    km = self.distances[event['origin']][event['place']]
+                    cost = round(km * per_km) if event['first'] else 0
+                    access = self._trek(event['place'], language)
+                    if event['first']:
+                        description = text['drive'].format(
+                            km=f"{km:.0f}", origin=origin, hours=f"{self._leg_hours(event['origin'], event['place'], speed):.1f}"
+                        )
+                        if access:
+                            description += text['including'].format(access=access)
+                    else:
+                        description = text['continue']
+                    items.append({
+                        'name': text['travel'].format(name=name),
+                        'time': time_range,
+                        'description': description,
+                        'cost': cost,
+                        'kind': 'travel'
+                    })
+                    breakdown['transport'] += cost
+                    where = event['place']
+                    overnight = None if event['arrives'] else text['halt'].format(name=name)
+                elif event['kind'] == 'visit':
+                    cost = self._visit_cost(event['place'])
+                    items.append({
+                        'name': name,
+                        'time': time_range,
+                        'description': self._describe(event['place'], language),
+                        'cost': cost,
+                        'kind': 'visit'
+                    })
+                    breakdown['activities'] += cost
+                    where = event['place']
+                    overnight = None
+                else:
+                    items.append({
+                        'name': text['free'].format(name=name),
+                        'time': time_range,
+                        'description': text['free_after'],
+                        'cost': 0,
+                        'kind': 'free'
+                    })
+            if not items:
+                items.append({
+                    'name': text['free'].format(name=self.places[where]['name']),
+                    'time': f"{self._clock(self.DAY_START)} - {self._clock(self.DAY_START + day_hours)}",
+                    'description': text['free_idle'],
+                    'cost': 0,
+                    'kind': 'free'
+                })
+
+            meals = dict(tier['meals'])
+            stay = overnight or text['stay'].format(tier=text['tiers'][tier['name']], name=self.places[where]['name'])
+            total = sum(item['cost'] for item in items) + lodging + sum(meals.values()) + local_cost
+            breakdown['accommodation'] += lodging
+            breakdown['meals'] += sum(meals.values())
+            breakdown['transport'] += local_cost
+            days.append({
+                'day': day + 1,
+                'date': text['day'].format(n=day + 1),
+                'places': items,
+                'accommodation': {'name': stay, 'cost': lodging},
+                'meals': meals,
+                'transport': {'description': text['local_transport'], 'cost': local_cost},
+                'total_cost': total
+            })
+
+        subtotal = sum(day['total_cost'] for day in days)
+        breakdown['miscellaneous'] = max(min(round(subtotal * self.MISC_SHARE), int(budget - subtotal)), 0)
+        packing_list, travel_tips = self._advice(route, language)
+        names = []
+        for idx in [start] + route + [start]:
+            if not names or names[-1] != self.places[idx]['name']:
+                names.append(self.places[idx]['name'])
+        return {
+            'duration': duration,
+            'budget': budget,
+            'total_estimated_cost': subtotal + breakdown['miscellaneous'],
+            'days': days,
+            'packing_list': packing_list,
+            'travel_tips': travel_tips,
+            'budget_breakdown': breakdown,
+            'route': names,
+            'total_distance_km': round(self._route_km(start, route)),
+            'tier': tier['name'],
+            'language': language,
+            'source': 'local'
+        }
+
+    def _advice(self, route: List[int], language: str) -> Tuple[List[str], List[str]]:
+        """Packing list and tips for the places on a route"""
+        text = self.TEXT[language]
+        places = [self.places[idx] for idx in route]
+        types = {place.get('type') for place in places}
+        highest = max((place.get('altitude', 0) for place in places), default=0)
+        treks = [(self.places[idx]['name'], self._trek(idx, language)) for idx in route if 'trek' in self._details[idx]]
+
+        packing = list(text['packing']['basic'])
+        if highest >= 2500:
+            packing += text['packing']['cold']
+        if treks:
+            packing += text['packing']['trek']
+        if types & {'temple', 'religious'}:
+            packing.append(text['packing']['temple'])
+        if 'wildlife' in types:
+            packing.append(text['packing']['wildlife'])
+
+        tips = []
+        if any(self.slugs[idx] in self.CHAR_DHAM for idx in route):
+            tips.extend(text['char_dham'])
+        if highest >= 3000:
+            tips.append(text['altitude'])
+        for name, access in treks:
+            tips.append(text['trek_tip'].format(name=name, access=access))
+        if 'wildlife' in types:
+            tips.append(text['safari'])
+        for idx in route:
+            season = self._details[idx].get('season') or self.places[idx].get('best_time_to_visit')
+            if season:
+                tips.append(text['season'].format(name=self.places[idx]['name'], season=season))
+        tips.append(text['roads'])
+        tips.append(text['emergency'])
+        return packing, tips
+
+    def narrative_key(self, itinerary: Dict[str, Any], language: str) -> str:
+        """Id of the narrative for a plan and language"""
+        return make_cache_key({
+            'days': [[item['name'] for item in day['places']] for day in itinerary['days']],
+            'tier': itinerary.get('tier'),
+            'language': language
+        })
+
+    def get_narrative(self, narrative_id: str) -> Dict[str, Any]:
+        """Get the status (ready, pending or unavailable) and text of a narrative"""
+        cached = self.narratives.get(narrative_id)
+        if cached is not None:
+            return {'id': narrative_id, 'status': 'ready', 'narrative': cached['narrative'], 'generated_at': cached['generated_at']}
+        with self._lock:
+            pending = narrative_id in self._pending
+        return {'id': narrative_id, 'status': 'pending' if pending else 'unavailable'}
+
+    def request_narrative(self, itinerary: Dict[str, Any], language: str) -> Optional[Dict[str, Any]]:
+        """
+        Start writing a narrative for a plan in the background
+
+        Returns:
+            Narrative status to poll, or None if narratives are disabled
+        """
+        if not Config.ITINERARY_NARRATIVE_ENABLED or self.gemini_service_factory is None:
+            return None
+        key = self.narrative_key(itinerary, language)
+        status = self.get_narrative(key)
+        if status['status'] != 'unavailable':
+            return status
+
+        with self._lock:
+            if key in self._pending:
+                return {'id': key, 'status': 'pending'}
+            self._pending.add(key)
+            self._stats['narratives_started'] += 1
+
+        def write():
+            try:
+                response = self.gemini_service_factory().describe_itinerary(itinerary, language)
+                if response.get('success'):
+                    self.narratives.set(key, {'narrative': response['narrative'], 'generated_at': time.time()})
+                else:
+                    self._count('narratives_failed')
+            except Exception as e:
+                logger.warning(f"Itinerary narrative failed: {str(e)}")
+                self._count('narratives_failed')
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        self._executor.submit(write)
+        return {'id': key, 'status': 'pending'}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get planning and narrative counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_narratives'] = len(self._pending)
+        stats['plan_ms_avg'] = round(stats['plan_ms_total'] / stats['plans'], 2) if stats['plans'] else 0.0
+        stats['plan_ms_total'] = round(stats['plan_ms_total'], 1)
+        stats['plan_ms_max'] = round(stats['plan_ms_max'], 2)
+        stats['destinations'] = len(self.places)
+        return stats
+
+
+# Singleton instance
+_itinerary_planner: Optional[ItineraryPlanner] = None
+_itinerary_planner_lock = threading.Lock()
+
+def get_itinerary_planner() -> ItineraryPlanner:
+    """Get or create the itinerary planner"""
+    global _itinerary_planner
+    if _itinerary_planner is None:
+        with _itinerary_planner_lock:
+            if _itinerary_planner is None:
+                from app.services.gemini_service import get_gemini_service
+                factory = get_gemini_service if Config.GEMINI_API_KEY else None
+                _itinerary_planner = ItineraryPlanner.from_sources(Config.ITINERARY_PLACES_FILE, factory)
+    return _itinerary_planner
@@ -1,6 +1,8 @@
 """Place matching service for improved recognition accuracy"""
-from typing import Dict, List, Optional, Any
+import heapq
+from typing import Dict, List, Optional, Tuple, Any
 from difflib import SequenceMatcher
+from app.services.autocomplete_index import AutocompleteIndex
 from app.utils.logger import logger
 
 class PlaceMatcher:
@@ -15,6 +17,8 @@ class PlaceMatcher:
             'district': 'Rudraprayag',
             'type': 'temple',
             'altitude': 3583,
+            'coordinates': {'lat': 30.7346, 'lon': 79.0669},
+            'popularity': 95,
             'keywords': ['shiva', 'temple', 'snow', 'mountain', 'mandakini']
         },
         'badrinath': {
@@ -23,6 +27,8 @@ class PlaceMatcher:
             'district': 'Chamoli',
             'type': 'temple',
             'altitude': 3300,
+            'coordinates': {'lat': 30.7433, 'lon': 79.4938},
+            'popularity': 92,
             'keywords': ['vishnu', 'temple', 'alaknanda', 'neelkanth peak']
         },
         'gangotri': {
@@ -31,6 +37,8 @@ class PlaceMatcher:
             'district': 'Uttarkashi',
             'type': 'temple',
             'altitude': 3100,
+            'coordinates': {'lat': 30.9947, 'lon': 78.9398},
+            'popularity': 80,
             'keywords': ['ganga', 'bhagirathi', 'temple', 'glacier']
         },
         'yamunotri': {
@@ -39,6 +47,8 @@ class PlaceMatcher:
             'district': 'Uttarkashi',
             'type': 'temple',
             'altitude': 3293,
+            'coordinates': {'lat': 31.014, 'lon': 78.46},
+            'popularity': 78,
             'keywords': ['yamuna', 'temple', 'hot spring', 'divya shila']
         },
         
@@ -49,6 +59,8 @@ class PlaceMatcher:
             'district': 'Nainital',
             'type': 'hill_station',
             'altitude': 2084,
+            'coordinates': {'lat': 29.3919, 'lon': 79.4542},
+            'popularity': 98,
             'keywords': ['lake', 'naini', 'mall road', 'boats', 'naina devi']
         },
         'mussoorie': {
@@ -57,6 +69,8 @@ class PlaceMatcher:
             'district': 'Dehradun',
             'type': 'hill_station',
             'altitude': 2005,
+            'coordinates': {'lat': 30.4598, 'lon': 78.0644},
+            'popularity': 96,
             'keywords': ['mall road', 'kempty falls', 'gun hill', 'cable car']
         },
         'ranikhet': {
@@ -65,6 +79,8 @@ class PlaceMatcher:
             'district': 'Almora',
             'type': 'hill_station',
             'altitude': 1869,
+            'coordinates': {'lat': 29.6434, 'lon': 79.4322},
+            'popularity': 70,
             'keywords': ['golf course', 'jhula devi', 'chaubatia']
         },
         'almora': {
@@ -73,6 +89,8 @@ class PlaceMatcher:
             'district': 'Almora',
             'type': 'hill_station',
             'altitude': 1638,
+            'coordinates': {'lat': 29.5971, 'lon': 79.6591},
+            'popularity': 68,
             'keywords': ['kasar devi', 'bright end corner', 'nanda devi']
         },
         'kausani': {
@@ -81,6 +99,8 @@ class PlaceMatcher:
             'district': 'Bageshwar',
             'type': 'hill_station',
             'altitude': 1890,
+            'coordinates': {'lat': 29.8437, 'lon': 79.603},
+            'popularity': 66,
             'keywords': ['tea gardens', 'himalayan view', 'anasakti ashram']
         },
         
@@ -91,6 +111,8 @@ class PlaceMatcher:
             'district': 'Haridwar',
             'type': 'religious',
             'altitude': 314,
+            'coordinates': {'lat': 29.9457, 'lon': 78.1642},
+            'popularity': 97,
             'keywords': ['ganga', 'har ki pauri', 'aarti', 'mansa devi', 'chandi devi']
         },
         'rishikesh': {
@@ -99,6 +121,8 @@ class PlaceMatcher:
             'district': 'Dehradun',
             'type': 'religious',
             'altitude': 372,
+            'coordinates': {'lat': 30.0869, 'lon': 78.2676},
+            'popularity': 99,
             'keywords': ['ganga', 'laxman jhula', 'ram jhula', 'rafting', 'yoga', 'beatles ashram']
         },
         'tungnath': {
@@ -107,6 +131,8 @@ class PlaceMatcher:
             'district': 'Rudraprayag',
             'type': 'temple',
             'altitude': 3680,
+            'coordinates': {'lat': 30.4893, 'lon': 79.2152},
+            'popularity': 72,
             'keywords': ['highest shiva temple', 'chandrashila', 'trek', 'panch kedar']
         },
         'jageshwar': {
@@ -115,6 +141,8 @@ class PlaceMatcher:
             'district': 'Almora',
             'type': 'temple',
             'altitude': 1870,
+            'coordinates': {'lat': 29.6372, 'lon': 79.8545},
+            'popularity': 60,
             'keywords': ['ancient temples', 'shiva', 'stone temples', '125 temples']
         },
         
@@ -125,6 +153,8 @@ class PlaceMatcher:
             'district': 'Nainital',
             'type': 'wildlife',
             'altitude': 400,
+            'coordinates': {'lat': 29.53, 'lon': 78.7747},
+            'popularity': 90,
             'keywords': ['tiger', 'wildlife', 'safari', 'ramganga', 'dhikala']
         },
         'valley_of_flowers': {
@@ -133,6 +163,8 @@ class PlaceMatcher:
             'district': 'Chamoli',
             'type': 'nature',
             'altitude': 3658,
+            'coordinates': {'lat': 30.728, 'lon': 79.605},
+            'popularity': 85,
             'keywords': ['flowers', 'meadow', 'trek', 'unesco', 'hemkund']
         },
         
@@ -143,6 +175,8 @@ class PlaceMatcher:
             'district': 'Chamoli',
             'type': 'adventure',
             'altitude': 2800,
+            'coordinates': {'lat': 30.5287, 'lon': 79.5669},
+            'popularity': 82,
             'keywords': ['skiing', 'cable car', 'snow', 'nanda devi view']
         },
         'chopta': {
@@ -151,6 +185,8 @@ class PlaceMatcher:
             'district': 'Rudraprayag',
             'type': 'nature',
             'altitude': 2680,
+            'coordinates': {'lat': 30.4854, 'lon': 79.2046},
+            'popularity': 74,
             'keywords': ['tungnath trek', 'chandrashila', 'meadows', 'deoria tal']
         },
         
@@ -161,6 +197,8 @@ class PlaceMatcher:
             'district': 'Dehradun',
             'type': 'city',
             'altitude': 640,
+            'coordinates': {'lat': 30.3165, 'lon': 78.0322},
+            'popularity': 88,
             'keywords': ['capital', 'robbers cave', 'sahastradhara', 'fma', 'ima']
         },
         'lansdowne': {
@@ -169,13 +207,116 @@ class PlaceMatcher:
             'district': 'Pauri Garhwal',
             'type': 'hill_station',
             'altitude': 1706,
+            'coordinates': {'lat': 29.8377, 'lon': 78.6871},
+            'popularity': 64,
             'keywords': ['cantonment', 'bhulla lake', 'tip n top']
         }
     }
     
-    def __init__(self):
-        """Initialize place matcher"""
-        logger.info("Place matcher initialized")
+    # Number of best trigram-overlap candidates the fuzzy matcher scores first
+    SHORTLIST_SIZE = 25
+    
+    def __init__(self, places: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize place matcher
+        
+        Args:
+            places: Place records keyed by slug (defaults to KNOWN_PLACES)
+        """
+        self.places = places if places is not None else self.KNOWN_PLACES
+        self._build_index()
+        logger.info(f"Place matcher initialized ({len(self._places)} places)")
+    
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        """Get the set of character trigrams in a string"""
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    @classmethod
+    def _padded_trigrams(cls, text: str) -> set:
+        """Trigrams with word-boundary padding, so short or misspelled names still overlap"""
+        return cls._trigrams(f"  {text} ")
+    
+    def _build_index(self):
+        """Precompute normalized lookup tables and trigram inverted indexes"""
+        self._places: List[Dict[str, Any]] = list(self.places.values())
+        self._key_lookup = {key: idx for idx, key in enumerate(self.places)}
+        
+        # Normalized names and aliases; each place's match terms are name + aliases
+        self._terms: List[List[str]] = []
+        self._aliases: List[tuple] = []  # (place_idx, alias)
+        self._keywords: List[tuple] = []  # (place_idx, keyword)
+        
+        for idx, place_data in enumerate(self._places):
+            name = place_data['name'].lower()
+            aliases = [alias.lower() for alias in place_data.get('aliases', [])]
+            self._terms.append([name] + aliases)
+            self._aliases.extend((idx, alias) for alias in aliases)
+            self._keywords.extend((idx, pk.lower()) for pk in place_data.get('keywords', []))
+        
+        # Candidate generation: padded trigram -> places whose name/aliases contain it
+        self._term_index: Dict[str, set] = {}
+        for idx, terms in enumerate(self._terms):
+            for term in terms:
+                for gram in self._padded_trigrams(term):
+                    self._term_index.setdefault(gram, set()).add(idx)
+        
+        self._alias_index = self._build_containment_index([alias for _, alias in self._aliases])
+        self._keyword_index = self._build_containment_index([pk for _, pk in self._keywords])
+        
+        # Search-as-you-type over names and aliases, ranked by popularity
+        self._autocomplete = AutocompleteIndex()
+        self._autocomplete.build(
+            (terms, place_data.get('popularity', 0))
+            for terms, place_data in zip(self._terms, self._places)
+        )
+    
+    def _build_containment_index(self, strings: List[str]) -> Dict[str, Any]:
+        """
+        Build an index answering "which of these strings occur inside a text"
+        
+        A string can only be a substring of a text if every one of its
+        trigrams is a trigram of the text, so candidates are the strings
+        whose trigram hit count reaches their distinct-trigram count.
+        Strings shorter than three characters have no trigrams and are
+        always checked directly.
+        """
+        postings: Dict[str, List[int]] = {}
+        gram_counts = []
+        short_ids = []
+        for string_id, string in enumerate(strings):
+            grams = self._trigrams(string)
+            gram_counts.append(len(grams))
+            if not grams:
+                short_ids.append(string_id)
+            for gram in grams:
+                postings.setdefault(gram, []).append(string_id)
+        return {
+            'strings': strings,
+            'postings': postings,
+            'gram_counts': gram_counts,
+            'short_ids': short_ids
+        }
+    
+    def _trigram_hits(self, index: Dict[str, Any], text_grams: set) -> Dict[int, int]:
+        """Count, per indexed string, how many of the text's trigrams it shares"""
+        hits: Dict[int, int] = {}
+        postings = index['postings']
+        for gram in text_grams:
+            for string_id in postings.get(gram, ()):
+                hits[string_id] = hits.get(string_id, 0) + 1
+        return hits
+    
+    def _contained_in(self, index: Dict[str, Any], text: str, text_grams: Optional[set] = None) -> List[int]:
+        """Get ids of indexed strings that are substrings of text"""
+        if text_grams is None:
+            text_grams = self._trigrams(text)
+        strings = index['strings']
+        gram_counts = index['gram_counts']
+        hits = self._trigram_hits(index, text_grams)
+        candidates = [sid for sid, count in hits.items() if count == gram_counts[sid]]
+        candidates.extend(index['short_ids'])
+        return [sid for sid in candidates if strings[sid] in text]
     
     def match_place(
         self, 
@@ -200,48 +341,41 @@ class PlaceMatcher:
         recognized_name_lower = recognized_name.lower().strip()
         
         # Direct match
-        if recognized_name_lower in self.KNOWN_PLACES:
-            return self._enrich_place_data(self.KNOWN_PLACES[recognized_name_lower])
+        if recognized_name_lower in self._key_lookup:
+            return self._enrich_place_data(self._places[self._key_lookup[recognized_name_lower]])
         
-        # Alias match
-        for place_key, place_data in self.KNOWN_PLACES.items():
-            for alias in place_data.get('aliases', []):
-                if alias.lower() in recognized_name_lower or recognized_name_lower in alias.lower():
-                    return self._enrich_place_data(place_data)
+        # Alias match (either string containing the other); first place in table order wins
+        alias_place = self._match_alias(recognized_name_lower)
+        if alias_place is not None:
+            return self._enrich_place_data(self._places[alias_place])
         
         # Fuzzy match
+        boosts = self._keyword_boosts(keywords, description)
+        
         best_match = None
+        best_idx = None
         best_score = 0
         
-        for place_key, place_data in self.KNOWN_PLACES.items():
-            # Match against name
-            score = SequenceMatcher(None, recognized_name_lower, place_data['name'].lower()).ratio()
-            
-            # Match against aliases
-            for alias in place_data.get('aliases', []):
-                alias_score = SequenceMatcher(None, recognized_name_lower, alias.lower()).ratio()
-                score = max(score, alias_score)
+        for idx in self._fuzzy_candidates(recognized_name_lower, boosts):
+            keyword_matches, description_matches = boosts.get(idx, (0, 0))
+            boost = keyword_matches * 0.1 + description_matches * 0.05
+            # Ties go to the place earlier in the table, so it only needs to equal the best
+            earlier = best_idx is not None and idx < best_idx
+            # Similarity can add at most 1.0, so skip places that cannot win; the
+            # margin keeps rounding in the summed boost from pruning a tie
+            floor = best_score - boost - 1e-9
+            if floor >= 1.0:
+                continue
             
-            # Boost score if keywords match
-            if keywords:
-                keyword_matches = sum(
-                    1 for kw in keywords 
-                    if any(pk in kw.lower() for pk in place_data.get('keywords', []))
-                )
-                score += keyword_matches * 0.1
+            # Added in the same order as before indexing, so scores compare identically
+            score = self._best_similarity(recognized_name_lower, self._terms[idx], floor)
+            score += keyword_matches * 0.1
+            score += description_matches * 0.05
             
-            # Boost score if description contains place keywords
-            if description:
-                desc_lower = description.lower()
-                keyword_matches = sum(
-                    1 for pk in place_data.get('keywords', [])
-                    if pk in desc_lower
-                )
-                score += keyword_matches * 0.05
-            
-            if score > best_score:
+            if score > best_score or (earlier and score == best_score):
                 best_score = score
-                best_match = place_data
+                best_idx = idx
+                best_match = self._places[idx]
         
         # Return match if confidence is high enough
         if best_score >= 0.6:
@@ -249,6 +383,88 @@ class PlaceMatcher:
         
         return None
     
+    def _match_alias(self, name: str) -> Optional[int]:
+        """Get the first place with an alias containing, or contained in, name"""
+        aliases = self._alias_index['strings']
+        name_grams = self._trigrams(name)
+        
+        # Aliases inside the name
+        matched = self._contained_in(self._alias_index, name, name_grams)
+        
+        # Name inside an alias: the alias must contain every trigram of the name
+        if name_grams:
+            hits = self._trigram_hits(self._alias_index, name_grams)
+            matched.extend(
+                sid for sid, count in hits.items()
+                if count == len(name_grams) and name in aliases[sid]
+            )
+        else:
+            matched.extend(sid for sid, alias in enumerate(aliases) if name in alias)
+        
+        if not matched:
+            return None
+        return min(self._aliases[sid][0] for sid in matched)
+    
+    def _keyword_boosts(self, keywords: Optional[List[str]], description: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Keyword evidence per place: (recognized keywords containing one of its
+        keywords, worth 0.1 each; its keywords found in the description, 0.05 each)
+        """
+        boosts: Dict[int, Tuple[int, int]] = {}
+        
+        if keywords:
+            for kw in keywords:
+                places_hit = {
+                    self._keywords[sid][0]
+                    for sid in self._contained_in(self._keyword_index, str(kw).lower())
+                }
+                for idx in places_hit:
+                    keyword_matches, description_matches = boosts.get(idx, (0, 0))
+                    boosts[idx] = (keyword_matches + 1, description_matches)
+        
+        if description:
+            for sid in self._contained_in(self._keyword_index, description.lower()):
+                idx = self._keywords[sid][0]
+                keyword_matches, description_matches = boosts.get(idx, (0, 0))
+                boosts[idx] = (keyword_matches, description_matches + 1)
+        
+        return boosts
+    
+    def _fuzzy_candidates(self, name: str, boosts: Dict[int, Tuple[int, int]]) -> List[int]:
+        """
+        Every place, the most promising first
+        
+        Places sharing the most trigrams with the name, plus any place with a
+        keyword boost, come first so the best score is high early and the
+        similarity bounds skip most of the rest without computing a full ratio.
+        """
+        name_grams = self._padded_trigrams(name)
+        
+        overlap: Dict[int, int] = {}
+        for gram in name_grams:
+            for idx in self._term_index.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+        
+        shortlist = set(heapq.nlargest(self.SHORTLIST_SIZE, overlap, key=overlap.get)).union(boosts)
+        return sorted(shortlist) + [idx for idx in range(len(self._places)) if idx not in shortlist]
+    
+    @staticmethod
+    def _best_similarity(name: str, terms: List[str], floor: float) -> float:
+        """
+        Highest SequenceMatcher ratio between name and any term
+        
+        The cheap upper bounds (real_quick_ratio, quick_ratio) are checked
+        first so the full ratio only runs on terms that could beat floor.
+        """
+        best = 0.0
+        for term in terms:
+            matcher = SequenceMatcher(None, name, term)
+            bound = max(best, floor)
+            if matcher.real_quick_ratio() <= bound or matcher.quick_ratio() <= bound:
+                continue
+            best = max(best, matcher.ratio())
+        return best
+    
     def _enrich_place_data(self, place_data: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich place data with additional information"""
         enriched = place_data.copy()
@@ -257,30 +473,30 @@ class PlaceMatcher:
         return enriched
     
     def get_suggestions(self, partial_name: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get place suggestions based on partial name"""
+        """
+        Get place suggestions based on partial name
+        
+        Places whose name, alias or any word in them starts with the query
+        come first, then places containing it elsewhere; each group is
+        ordered by popularity.
+        """
         if not partial_name:
             return []
         
-        partial_lower = partial_name.lower().strip()
-        suggestions = []
-        
-        for place_key, place_data in self.KNOWN_PLACES.items():
-            # Check if partial name matches
-            if partial_lower in place_data['name'].lower():
-                suggestions.append(place_data)
-            else:
-                # Check aliases
-                for alias in place_data.get('aliases', []):
-                    if partial_lower in alias.lower():
-                        suggestions.append(place_data)
-                        break
-        
-        return suggestions[:limit]
+        return [self._places[idx] for idx in self._autocomplete.search(partial_name, limit)]
+    
+    def get_coordinates(self, place_name: str) -> Optional[tuple]:
+        """Get (lat, lon) of a known place by name, alias or close spelling"""
+        matched = self.match_place(place_name)
+        coordinates = (matched or {}).get('coordinates')
+        if not coordinates:
+            return None
+        return coordinates['lat'], coordinates['lon']
     
     def get_places_by_type(self, place_type: str) -> List[Dict[str, Any]]:
         """Get all places of a specific type"""
         return [
-            place_data for place_data in self.KNOWN_PLACES.values()
+            place_data for place_data in self.places.values()
             if place_data.get('type') == place_type
         ]
     
@@ -288,7 +504,7 @@ class PlaceMatcher:
         """Get all places in a specific district"""
         district_lower = district.lower()
         return [
-            place_data for place_data in self.KNOWN_PLACES.values()
+            place_data for place_data in self.places.values()
             if district_lower in place_data.get('district', '').lower()
         ]
 
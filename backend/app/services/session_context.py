@@ -0,0 +1,176 @@
+"""Server-side conversation context for AI chat sessions"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import Config
+from app.services.cache_service import LRUCacheBackend
+from app.utils.metrics import metrics
+
+
+class SessionContextStore:
+    """
+    Recent message windows per chat session, cached in-process
+
+    Windows are loaded from the chats collection on a miss and kept up to
+    date as turns are persisted through this store. A hit is checked
+    against the session's newest message id (one indexed lookup), so
+    messages written by another worker or through /api/history trigger
+    a reload instead of serving a stale window.
+    """
+
+    def __init__(self, window: int = 40, max_sessions: int = 1000, ttl: int = 1800):
+        self.window = window
+        self.ttl = ttl
+        self._cache = LRUCacheBackend(max_entries=max_sessions)
+        self._chat_model = None
+        self._user_model = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'persisted': 0, 'discarded': 0}
+        metrics.register_collector('chat_sessions', self.stats)
+
+    @property
+    def chat_model(self):
+        if self._chat_model is None:
+            from app.config.database import get_database
+            from app.models.chat import Chat
+            self._chat_model = Chat(get_database())
+        return self._chat_model
+
+    @property
+    def user_model(self):
+        if self._user_model is None:
+            from app.config.database import get_database
+            from app.models.user import User
+            self._user_model = User(get_database())
+        return self._user_model
+
+    @staticmethod
+    def _key(user_id: str, session_id: str) -> str:
+        return f"{user_id}:{session_id}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _load_window(self, user_id: str, session_id: str) -> List[Dict[str, Any]]:
+        key = self._key(user_id, session_id)
+        window = self._cache.get(key)
+        if window is not None:
+            last_id = self.chat_model.get_last_message_id(user_id, session_id)
+            if (window[-1]['_id'] if window else None) == last_id:
+                self._count('hits')
+                return window
+            self._count('stale')
+        else:
+            self._count('misses')
+
+        window = [
+            {'_id': chat['_id'], 'role': chat['role'], 'content': chat['content']}
+            for chat in self.chat_model.get_session_chats(user_id, session_id, limit=self.window)
+        ]
+        self._cache.set(key, window, self.ttl)
+        return window
+
+    def get_history(self, user_id: str, session_id: str) -> List[Dict[str, str]]:
+        """Get the session's recent messages, oldest first"""
+        return [
+            {'role': message['role'], 'content': message['content']}
+            for message in self._load_window(user_id, session_id)
+        ]
+
+    def start_turn(
+        self,
+        user_id: str,
+        session_id: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, str]], str, bool]:
+        """
+        Persist the user's message and return the context that precedes it
+
+        A client that already saved the message through /api/history is
+        detected (the newest stored message is the same user text) and the
+        message is not stored twice.
+
+        Returns:
+            (history before this message, user message id, whether this call stored it)
+        """
+        window = self._load_window(user_id, session_id)
+        if window and window[-1]['role'] == 'user' and window[-1]['content'] == message:
+            user_message_id = window[-1]['_id']
+            window = window[:-1]
+            stored = False
+        else:
+            user_message_id = self.append(user_id, session_id, 'user', message, metadata)['_id']
+            stored = True
+
+        history = [{'role': m['role'], 'content': m['content']} for m in window]
+        return history, str(user_message_id), stored
+
+    def discard_turn(self, user_id: str, session_id: str, message_id: str) -> bool:
+        """
+        Remove a user message stored by start_turn whose turn got no reply
+
+        Keeps failed or rejected turns out of the session history and of the
+        context sent with later messages.
+        """
+        deleted = self.chat_model.delete_message(message_id, user_id)
+        if deleted:
+            self.user_model.increment_stat(user_id, 'total_chats', -1)
+            self._count('discarded')
+
+        key = self._key(user_id, session_id)
+        window = self._cache.get(key)
+        if window is not None:
+            self._cache.set(key, [m for m in window if str(m['_id']) != message_id], self.ttl)
+        return deleted
+
+    def append(
+        self,
+        user_id: str,
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Persist a message and add it to the cached window"""
+        message = self.chat_model.create_message(
+            user_id=user_id,
+            session_id=session_id,
+            role=role,
+            content=content,
+            metadata=metadata
+        )
+        self.user_model.increment_stat(user_id, 'total_chats')
+        self._count('persisted')
+
+        key = self._key(user_id, session_id)
+        window = self._cache.get(key)
+        if window is not None:
+            window.append({'_id': message['_id'], 'role': role, 'content': content})
+            self._cache.set(key, window[-self.window:], self.ttl)
+        return message
+
+    def stats(self) -> Dict[str, Any]:
+        """Get window cache counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['cached_sessions'] = len(self._cache)
+        return stats
+
+
+# Singleton instance
+_session_context: Optional[SessionContextStore] = None
+_session_context_lock = threading.Lock()
+
+def get_session_context() -> SessionContextStore:
+    """Get or create the session context store"""
+    global _session_context
+    if _session_context is None:
+        with _session_context_lock:
+            if _session_context is None:
+                _session_context = SessionContextStore(
+                    window=Config.CHAT_SESSION_WINDOW,
+                    max_sessions=Config.CHAT_SESSION_CACHE_MAX_ENTRIES,
+                    ttl=Config.CHAT_SESSION_CACHE_TTL
+                )
+    return _session_context
@@ -0,0 +1,207 @@
+"""Precomputed answers for the chat suggestion chips"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from app.config.settings import Config
+from app.services.cache_service import create_response_cache, make_cache_key
+from app.services.gemini_service import GeminiService, get_gemini_service
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+# Quick suggestion chips shown in the chat UI, per language
+CHAT_SUGGESTIONS = {
+    'english': [
+        "Best places to visit in Uttarakhand",
+        "Adventure activities",
+        "Best time to visit",
+        "Local food recommendations",
+        "Trekking routes",
+        "Temple information",
+        "Weather conditions"
+    ],
+    'hindi': [
+        "उत्तराखंड में घूमने की जगहें",
+        "रोमांचक गतिविधियाँ",
+        "सबसे अच्छा समय",
+        "स्थानीय भोजन",
+        "ट्रेकिंग रूट",
+        "मंदिर जानकारी",
+        "मौसम की स्थिति"
+    ],
+    'garhwali': [
+        "उत्तराखंड मा घूमण कि जगह",
+        "रोमांचक गतिविधि",
+        "सबसे अच्छा समय",
+        "स्थानीय खाना",
+        "ट्रेकिंग रूट",
+        "मंदिर जानकारी",
+        "मौसम"
+    ],
+    'kumaoni': [
+        "उत्तराखंड मा घूमण कि जगह",
+        "रोमांचक गतिविधि",
+        "सबसे अच्छा समय",
+        "स्थानीय खाना",
+        "ट्रेकिंग रूट",
+        "मंदिर जानकारी",
+        "मौसम"
+    ]
+}
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.casefold().split()).rstrip('?!.। ')
+
+
+class SuggestionAnswers:
+    """
+    Background-refreshed answers for first messages that match a chip
+
+    Answers are keyed on the full chat prompt (system prompt + chip), so a
+    change to _get_system_prompt or to language auto-detection produces new
+    keys and old answers simply stop matching. Refreshes go through the
+    scheduler as low-priority 'prewarm' calls.
+    """
+
+    def __init__(
+        self,
+        gemini_service: GeminiService,
+        suggestions: Dict[str, List[str]],
+        refresh_interval: int = 6 * 3600
+    ):
+        self.gemini_service = gemini_service
+        self.suggestions = suggestions
+        self.refresh_interval = refresh_interval
+        # Entries outlive one missed refresh, but not a stopped refresher
+        self.cache = create_response_cache(
+            'chat_suggestions',
+            backend=Config.SUGGESTION_ANSWERS_BACKEND,
+            default_ttl=2 * refresh_interval,
+            max_entries=256
+        )
+        self._chips = {
+            _normalize(chip): chip
+            for chips in suggestions.values()
+            for chip in chips
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'refreshes': 0, 'answered': 0, 'failed': 0, 'last_refresh': None}
+        self._lock = threading.Lock()
+        metrics.register_collector('suggestion_answers', self.stats)
+
+    def _prompt(self, chip: str, language: str):
+        prompt, language = self.gemini_service.build_chat_prompt(chip, language, None)
+        return prompt, language, make_cache_key({'prompt': prompt})
+
+    def lookup(self, message: str, language: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the precomputed answer for a first message, if it is a chip
+
+        Returns:
+            {'message', 'language'} or None
+        """
+        chip = self._chips.get(_normalize(message))
+        if chip is None:
+            return None
+
+        _, language, key = self._prompt(chip, language)
+        answer = self.cache.get(key)
+        if answer is None:
+            return None
+        return {'message': answer, 'language': language}
+
+    def refresh(self) -> int:
+        """
+        Answer every chip in every language
+
+        Returns:
+            Number of distinct prompts answered
+        """
+        answered = set()
+        for language, chips in self.suggestions.items():
+            for chip in chips:
+                if self._stop.is_set():
+                    return len(answered)
+
+                prompt, _, key = self._prompt(chip, language)
+                if key in answered:
+                    continue
+                try:
+                    response = self.gemini_service.generate_content(
+                        'prewarm',
+                        prompt,
+                        generation_config=GeminiService.CHAT_GENERATION_CONFIG
+                    )
+                    self.cache.set(key, response.text.strip())
+                    answered.add(key)
+                except Exception as e:
+                    logger.warning(f"Failed to precompute answer for '{chip}' ({language}): {str(e)}")
+                    with self._lock:
+                        self._stats['failed'] += 1
+
+        with self._lock:
+            self._stats['refreshes'] += 1
+            self._stats['answered'] = len(answered)
+            self._stats['last_refresh'] = time.time()
+        return len(answered)
+
+    def start(self) -> None:
+        """Start the background refresh thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='suggestion-answers', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['chips'] = len(self._chips)
+        return stats
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            count = self.refresh()
+            logger.info(f"Precomputed {count} suggestion chip answers")
+            if self._stop.wait(self.refresh_interval):
+                return
+
+
+# Singleton instance
+_suggestion_answers: Optional[SuggestionAnswers] = None
+_suggestion_answers_lock = threading.Lock()
+
+def get_suggestion_answers() -> Optional[SuggestionAnswers]:
+    """Get the precomputed answer store, or None if disabled or Gemini is not configured"""
+    global _suggestion_answers
+    if not Config.SUGGESTION_ANSWERS_ENABLED:
+        return None
+
+    with _suggestion_answers_lock:
+        if _suggestion_answers is None:
+            try:
+                gemini_service = get_gemini_service()
+            except ValueError:
+                return None
+            _suggestion_answers = SuggestionAnswers(
+                gemini_service,
+                CHAT_SUGGESTIONS,
+                refresh_interval=Config.SUGGESTION_ANSWERS_REFRESH_INTERVAL
+            )
+    return _suggestion_answers
+
+def start_suggestion_answers() -> Optional[SuggestionAnswers]:
+    """Create and start the background refresher once per process, if enabled"""
+    suggestion_answers = get_suggestion_answers()
+    if suggestion_answers is not None:
+        suggestion_answers.start()
+    return suggestion_answers
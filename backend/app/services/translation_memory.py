@@ -0,0 +1,111 @@
+"""Persistent translation memory in front of the LLM translator"""
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.config.settings import Config
+from app.services.cache_service import LRUCacheBackend, make_cache_key
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+def normalize_source(text: str) -> str:
+    """Canonical form of a source string: NFC, trimmed, single spaces"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class TranslationMemory:
+    """
+    Exact-match store of past translations
+
+    Lookups go to an in-process LRU first and then to the
+    translation_memory collection; Mongo hits are promoted into the LRU.
+    Entries never expire, since a translation of a fixed string does not
+    go stale. If Mongo is unavailable the memory tier keeps working alone.
+    """
+
+    def __init__(self, max_entries: int = 5000, collection_name: str = 'translation_memory'):
+        self.memory = LRUCacheBackend(max_entries=max_entries)
+        self.collection = None
+        try:
+            from app.config.database import get_collection
+            self.collection = get_collection(collection_name)
+        except Exception as e:
+            logger.warning(f"Translation memory running without Mongo tier: {str(e)}")
+
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'mongo_hits': 0, 'misses': 0, 'stored': 0, 'errors': 0}
+        metrics.register_collector('translation_memory', self.stats)
+
+    @staticmethod
+    def make_key(text: str, source_language: str, target_language: str) -> str:
+        """Key on (normalized source text, source language, target language)"""
+        return make_cache_key({
+            'text': normalize_source(text),
+            'source': source_language.lower(),
+            'target': target_language.lower()
+        })
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def lookup(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        """Get a stored translation, or None"""
+        key = self.make_key(text, source_language, target_language)
+
+        translated = self.memory.get(key)
+        if translated is not None:
+            self._count('memory_hits')
+            return translated
+
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one({'_id': key}, {'translated_text': 1})
+            except Exception as e:
+                logger.warning(f"Translation memory read failed: {str(e)}")
+                self._count('errors')
+                doc = None
+            if doc is not None:
+                self.memory.set(key, doc['translated_text'], Config.TRANSLATION_MEMORY_LRU_TTL)
+                self._count('mongo_hits')
+                return doc['translated_text']
+
+        self._count('misses')
+        return None
+
+    def store(self, text: str, source_language: str, target_language: str, translated_text: str) -> None:
+        """Record a translation in both tiers"""
+        key = self.make_key(text, source_language, target_language)
+        self.memory.set(key, translated_text, Config.TRANSLATION_MEMORY_LRU_TTL)
+        self._count('stored')
+
+        if self.collection is None:
+            return
+        try:
+            self.collection.update_one(
+                {'_id': key},
+                {
+                    '$set': {'translated_text': translated_text, 'updated_at': datetime.utcnow()},
+                    '$setOnInsert': {
+                        'source_text': normalize_source(text),
+                        'source_language': source_language.lower(),
+                        'target_language': target_language.lower(),
+                        'created_at': datetime.utcnow()
+                    }
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Translation memory write failed: {str(e)}")
+            self._count('errors')
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-tier hit counters and the overall hit ratio"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['memory_hits'] + stats['mongo_hits'] + stats['misses']
+        hits = stats['memory_hits'] + stats['mongo_hits']
+        stats['hit_ratio'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        return stats
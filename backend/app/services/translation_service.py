@@ -1,7 +1,12 @@
 """Translation service using Google Gemini API"""
-from typing import Dict, Optional, Any
+import json
+from typing import Dict, List, Optional, Any
+from app.config.settings import Config
 from app.services.gemini_service import get_gemini_service
+from app.services.translation_memory import TranslationMemory, normalize_source
+from app.utils.concurrency import OverloadedError
 from app.utils.logger import logger
+from app.utils.metrics import metrics
 
 class TranslationService:
     """Service for translating text between languages"""
@@ -15,6 +20,9 @@ class TranslationService:
             'garhwali': 'Garhwali',
             'kumaoni': 'Kumaoni'
         }
+        self.memory = TranslationMemory(
+            max_entries=Config.TRANSLATION_MEMORY_MAX_ENTRIES
+        ) if Config.TRANSLATION_MEMORY_ENABLED else None
     
     def translate(
         self, 
@@ -43,6 +51,19 @@ class TranslationService:
                     'target_language': target_language
                 }
             
+            # Strings translated before cost no LLM call
+            if self.memory is not None:
+                remembered = self.memory.lookup(text, source_language, target_language)
+                if remembered is not None:
+                    return {
+                        'success': True,
+                        'original_text': text,
+                        'translated_text': remembered,
+                        'source_language': source_language,
+                        'target_language': target_language,
+                        'cached': True
+                    }
+            
             # Use Gemini for translation
             prompt = f"""Translate the following text from {self.supported_languages.get(source_language, source_language)} to {self.supported_languages.get(target_language, target_language)}.
             
@@ -50,8 +71,10 @@ Text: {text}
 
 Provide only the translated text, nothing else."""
             
-            response = self.gemini_service.chat_model.generate_content(prompt)
+            response = self.gemini_service.generate_content('translation', prompt)
             translated_text = response.text.strip()
+            if self.memory is not None and translated_text:
+                self.memory.store(text, source_language, target_language, translated_text)
             
             return {
                 'success': True,
@@ -61,6 +84,11 @@ Provide only the translated text, nothing else."""
                 'target_language': target_language
             }
             
+        except OverloadedError as e:
+            logger.warning(f"Translation rejected: {str(e)}")
+            result = self.gemini_service.overloaded_result(e)
+            result.update({'original_text': text, 'translated_text': text})
+            return result
         except Exception as e:
             logger.error(f"Error in translate: {str(e)}")
             return {
@@ -71,6 +99,173 @@ Provide only the translated text, nothing else."""
                 'message': 'Translation failed. Original text returned.'
             }
     
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_language: str = 'english',
+        target_language: str = 'hindi'
+    ) -> Dict[str, Any]:
+        """
+        Translate many strings with as few LLM calls as possible
+        
+        Duplicates are translated once and remembered strings are served from
+        the translation memory; the rest are packed into JSON-structured
+        prompts of up to TRANSLATION_BATCH_MAX_ITEMS strings each.
+        
+        Args:
+            texts: Strings to translate
+            source_language: Source language code
+            target_language: Target language code
+            
+        Returns:
+            Result dictionary with translations in input order; indices that
+            could not be translated keep their original text and are listed in 'failed'
+        """
+        result = {
+            'success': True,
+            'translations': list(texts),
+            'source_language': source_language,
+            'target_language': target_language,
+            'cached_count': 0,
+            'upstream_calls': 0,
+            'failed': []
+        }
+        if source_language.lower() == target_language.lower() or not texts:
+            return result
+        
+        # One entry per distinct normalized string, remembering where it occurs
+        positions: Dict[str, List[int]] = {}
+        originals: Dict[str, str] = {}
+        for index, text in enumerate(texts):
+            normalized = normalize_source(text)
+            if not normalized:
+                continue
+            positions.setdefault(normalized, []).append(index)
+            originals.setdefault(normalized, text)
+        
+        translated: Dict[str, str] = {}
+        misses = []
+        for normalized, text in originals.items():
+            remembered = self.memory.lookup(text, source_language, target_language) if self.memory else None
+            if remembered is not None:
+                translated[normalized] = remembered
+                result['cached_count'] += len(positions[normalized])
+            else:
+                misses.append(normalized)
+        
+        calls = [0]
+        try:
+            for chunk in self._pack(misses):
+                translated.update(self._translate_packed(chunk, source_language, target_language, calls))
+        except OverloadedError as e:
+            logger.warning(f"Batch translation rejected: {str(e)}")
+            overloaded = self.gemini_service.overloaded_result(e)
+            overloaded['translations'] = list(texts)
+            return overloaded
+        result['upstream_calls'] = calls[0]
+        
+        for normalized, indices in positions.items():
+            if normalized in translated:
+                for index in indices:
+                    result['translations'][index] = translated[normalized]
+            else:
+                result['failed'].extend(indices)
+        result['failed'].sort()
+        
+        metrics.increment('translation.batch.strings', len(texts))
+        metrics.increment('translation.batch.upstream_calls', calls[0])
+        return result
+    
+    @staticmethod
+    def _pack(texts: List[str]) -> List[List[str]]:
+        """Split texts into chunks bounded by item count and total length"""
+        chunks, chunk, size = [], [], 0
+        for text in texts:
+            if chunk and (len(chunk) >= Config.TRANSLATION_BATCH_MAX_ITEMS
+                          or size + len(text) > Config.TRANSLATION_BATCH_MAX_CHARS):
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text)
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+    
+    def _translate_packed(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+        calls: List[int],
+        depth: int = 0
+    ) -> Dict[str, str]:
+        """
+        Translate one chunk in a single call, splitting on partial failure
+        
+        Items missing from (or unparseable in) the reply are retried in two
+        smaller packed calls, down to single strings, so one bad item never
+        costs a call per string. If the call itself fails the whole chunk is
+        left untranslated; splitting would only repeat the failure.
+        """
+        items = [{'id': i, 'text': text} for i, text in enumerate(texts)]
+        prompt = f"""Translate each "text" below from {self.supported_languages.get(source_language, source_language)} to {self.supported_languages.get(target_language, target_language)}.
+
+Input (JSON):
+{json.dumps(items, ensure_ascii=False)}
+
+Respond with only a JSON object mapping each id (as a string) to its translation, for example {{"0": "...", "1": "..."}}. Keep placeholders, numbers and punctuation as they are."""
+        
+        parsed = {}
+        calls[0] += 1
+        try:
+            response = self.gemini_service.generate_content(
+                'translation',
+                prompt,
+                generation_config={'temperature': 0.2, 'max_output_tokens': 8192}
+            )
+            parsed = self._parse_packed(response.text)
+        except OverloadedError:
+            raise
+        except Exception as e:
+            logger.warning(f"Packed translation of {len(texts)} strings failed: {str(e)}")
+            return {}
+        
+        translated = {}
+        missing = []
+        for i, text in enumerate(texts):
+            value = parsed.get(str(i))
+            if isinstance(value, str) and value.strip():
+                translated[text] = value.strip()
+                if self.memory is not None:
+                    self.memory.store(text, source_language, target_language, translated[text])
+            else:
+                missing.append(text)
+        
+        if missing and len(texts) > 1 and depth < Config.TRANSLATION_BATCH_MAX_SPLITS:
+            middle = (len(missing) + 1) // 2
+            for part in (missing[:middle], missing[middle:]):
+                if part:
+                    translated.update(self._translate_packed(
+                        part, source_language, target_language, calls, depth + 1
+                    ))
+        return translated
+    
+    @staticmethod
+    def _parse_packed(response_text: str) -> Dict[str, Any]:
+        """Pull the id -> translation object out of a packed reply"""
+        text = response_text.strip()
+        start = text.find('{')
+        end = text.rfind('}') + 1
+        if start == -1 or end <= start:
+            return {}
+        try:
+            parsed = json.loads(text[start:end])
+        except json.JSONDecodeError:
+            return {}
+        if isinstance(parsed, dict):
+            return {str(key): value for key, value in parsed.items()}
+        return {}
+    
     def detect_language(self, text: str) -> Dict[str, Any]:
         """
         Detect language of given text
@@ -86,7 +281,7 @@ Provide only the translated text, nothing else."""
             
 {text}"""
             
-            response = self.gemini_service.chat_model.generate_content(prompt)
+            response = self.gemini_service.generate_content('translation', prompt)
             detected = response.text.strip().lower()
             
             # Validate detected language
@@ -0,0 +1,156 @@
+"""Background pre-warming of weather for known Uttarakhand destinations"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from app.config.settings import Config
+from app.services.place_matcher import PlaceMatcher
+from app.services.weather_service import WeatherService, get_weather_service
+from app.utils.concurrency import RateBudget
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+class WeatherPrewarmer:
+    """
+    Keeps current weather and forecasts cached for a fixed set of locations
+
+    Each cycle spreads its refreshes evenly across the cycle interval and
+    takes a token from its own daily budget before every upstream call, so
+    upstream usage is bounded by the budget no matter how much traffic the
+    API gets. A location that fails is skipped with exponential backoff.
+    """
+
+    MAX_BACKOFF = 24 * 60 * 60
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        locations: List[str],
+        interval: int = 3600,
+        forecast_interval: int = 6 * 3600,
+        daily_budget: float = 720,
+        burst: int = 30
+    ):
+        self.weather_service = weather_service
+        self.locations = locations
+        self.interval = interval
+        self.forecast_interval = forecast_interval
+        self.budget = RateBudget(daily_budget, burst=burst)
+        # Prewarmed entries must outlive the gap between two refreshes
+        self.entry_ttl = max(Config.WEATHER_CACHE_STALE_TTL, 2 * max(interval, forecast_interval))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures: Dict[tuple, tuple] = {}
+        self._stats = {'cycles': 0, 'refreshed': 0, 'failed': 0, 'skipped': 0}
+        self._lock = threading.Lock()
+        metrics.register_collector('weather_prewarm', self.stats)
+
+        calls_per_day = len(locations) * (86400 / interval + 86400 / forecast_interval)
+        if calls_per_day > daily_budget:
+            logger.warning(
+                f"Weather prewarm needs ~{int(calls_per_day)} calls/day but the budget is "
+                f"{int(daily_budget)}; cycles will run slower than configured"
+            )
+
+    def start(self) -> None:
+        """Start the background thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='weather-prewarm', daemon=True)
+        self._thread.start()
+        logger.info(f"Weather prewarmer started for {len(self.locations)} locations")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cycle and refresh counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['backing_off'] = len(self._failures)
+        stats['locations'] = len(self.locations)
+        stats['budget'] = self.budget.stats()
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _run(self) -> None:
+        next_forecast = 0.0
+        first_cycle = True
+        while not self._stop.is_set():
+            cycle_start = time.time()
+            include_forecast = cycle_start >= next_forecast
+            kinds = ['weather', 'forecast'] if include_forecast else ['weather']
+            jobs = [(kind, location) for location in self.locations for kind in kinds]
+
+            # The first pass warms the cache as fast as the budget allows
+            spacing = 0 if first_cycle else self.interval / max(len(jobs), 1)
+            for kind, location in jobs:
+                if self._stop.is_set():
+                    return
+                self._refresh(kind, location, cycle_start)
+                if spacing and self._stop.wait(spacing):
+                    return
+
+            if include_forecast:
+                next_forecast = cycle_start + self.forecast_interval
+            first_cycle = False
+            self._count('cycles')
+
+            remaining = self.interval - (time.time() - cycle_start)
+            if remaining > 0 and self._stop.wait(remaining):
+                return
+
+    def _refresh(self, kind: str, location: str, now: float) -> None:
+        job = (kind, location)
+        failure = self._failures.get(job)
+        if failure and failure[1] > now:
+            self._count('skipped')
+            return
+
+        if not self.budget.acquire(self._stop):
+            return
+
+        if self.weather_service.refresh(kind, location, ttl=self.entry_ttl):
+            self._failures.pop(job, None)
+            self._count('refreshed')
+        else:
+            attempts = failure[0] + 1 if failure else 1
+            backoff = min(self.interval * 2 ** (attempts - 1), self.MAX_BACKOFF)
+            self._failures[job] = (attempts, time.time() + backoff)
+            self._count('failed')
+
+
+def known_destinations() -> List[str]:
+    """Names of every destination in the place catalogue"""
+    return [place['name'] for place in PlaceMatcher.KNOWN_PLACES.values()]
+
+
+# Singleton instance
+_prewarmer: Optional[WeatherPrewarmer] = None
+_prewarmer_lock = threading.Lock()
+
+def start_weather_prewarmer() -> Optional[WeatherPrewarmer]:
+    """Create and start the prewarmer once per process, if enabled"""
+    global _prewarmer
+    if not Config.WEATHER_PREWARM_ENABLED or not Config.WEATHER_API_KEY:
+        return None
+
+    with _prewarmer_lock:
+        if _prewarmer is None:
+            _prewarmer = WeatherPrewarmer(
+                get_weather_service(),
+                known_destinations(),
+                interval=Config.WEATHER_PREWARM_INTERVAL,
+                forecast_interval=Config.WEATHER_FORECAST_PREWARM_INTERVAL,
+                daily_budget=Config.WEATHER_API_DAILY_BUDGET * Config.WEATHER_PREWARM_BUDGET_SHARE,
+                burst=Config.WEATHER_API_BURST
+            )
+        _prewarmer.start()
+    return _prewarmer
@@ -1,8 +1,45 @@
 """Weather service using OpenWeather API"""
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Optional, Any, Tuple
 from app.config.settings import Config
+from app.services.cache_service import create_response_cache
+from app.services.place_matcher import PlaceMatcher
+from app.utils.concurrency import RateBudget, SingleFlight
 from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+# Uttarakhand cities mapping to OpenWeather query names
+CITY_MAPPING = {
+    'dehradun': 'Dehradun,IN',
+    'rishikesh': 'Rishikesh,IN',
+    'haridwar': 'Haridwar,IN',
+    'mussoorie': 'Mussoorie,IN',
+    'nainital': 'Nainital,IN',
+    'almora': 'Almora,IN',
+    'ranikhet': 'Ranikhet,IN',
+    'kedarnath': 'Kedarnath,IN',
+    'badrinath': 'Badrinath,IN',
+    'gangotri': 'Gangotri,IN',
+    'yamunotri': 'Yamunotri,IN',
+    'auli': 'Auli,IN',
+    'jim corbett': 'Ramnagar,IN',
+    # Destinations without their own weather station use the nearest town
+    'jim corbett national park': 'Ramnagar,IN',
+    'valley of flowers': 'Joshimath,IN',
+    'tungnath': 'Ukhimath,IN',
+    'chopta': 'Ukhimath,IN',
+    'jageshwar': 'Almora,IN'
+}
+
+
+class WeatherBudgetExceeded(Exception):
+    """Raised when the upstream API call budget is used up"""
+    pass
 
 class WeatherService:
     """Service for fetching weather data"""
@@ -10,9 +47,49 @@ class WeatherService:
     def __init__(self):
         """Initialize weather service"""
         self.api_key = Config.WEATHER_API_KEY
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.base_url = Config.WEATHER_API_BASE_URL.rstrip('/')
         if not self.api_key:
             logger.warning("WEATHER_API_KEY not found. Weather features will be limited.")
+        
+        # One keep-alive session for all upstream calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.WEATHER_HTTP_POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Entries live for the stale window; freshness is checked against fetched_at
+        self.fresh_ttl = Config.WEATHER_CACHE_TTL
+        self.cache = create_response_cache(
+            'weather',
+            backend='memory',
+            default_ttl=Config.WEATHER_CACHE_STALE_TTL,
+            max_entries=Config.WEATHER_CACHE_MAX_ENTRIES
+        )
+        self._inflight = SingleFlight()
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=Config.WEATHER_REFRESH_WORKERS,
+            thread_name_prefix='weather-refresh'
+        )
+        self._pending_refreshes = set()
+        # Keys kept fresh by the prewarmer; requests never refresh these themselves
+        self._managed_keys = set()
+        self._aliases = self._build_aliases()
+        
+        # Upstream calls made on behalf of requests; the prewarmer has its own share
+        share = Config.WEATHER_PREWARM_BUDGET_SHARE if Config.WEATHER_PREWARM_ENABLED else 0
+        self.budget = RateBudget(
+            Config.WEATHER_API_DAILY_BUDGET * (1 - share),
+            burst=Config.WEATHER_API_BURST
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            'upstream_calls': 0,
+            'upstream_errors': 0,
+            'stale_served': 0,
+            'background_refreshes': 0,
+            'budget_exhausted': 0
+        }
+        metrics.register_collector('weather', self.stats)
     
     def get_weather(self, location: str) -> Dict[str, Any]:
         """
@@ -32,60 +109,23 @@ class WeatherService:
             }
         
         try:
-            # Uttarakhand cities mapping
-            city_mapping = {
-                'dehradun': 'Dehradun,IN',
-                'rishikesh': 'Rishikesh,IN',
-                'haridwar': 'Haridwar,IN',
-                'mussoorie': 'Mussoorie,IN',
-                'nainital': 'Nainital,IN',
-                'almora': 'Almora,IN',
-                'ranikhet': 'Ranikhet,IN',
-                'kedarnath': 'Kedarnath,IN',
-                'badrinath': 'Badrinath,IN',
-                'gangotri': 'Gangotri,IN',
-                'yamunotri': 'Yamunotri,IN',
-                'auli': 'Auli,IN',
-                'jim corbett': 'Ramnagar,IN'
-            }
-            
-            city = location.lower()
-            query = city_mapping.get(city, f"{location},IN")
-            
-            # Get current weather
-            url = f"{self.base_url}/weather"
-            params = {
-                'q': query,
-                'appid': self.api_key,
-                'units': 'metric'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Format response
-            weather_data = {
-                'location': data.get('name', location),
-                'temperature': round(data['main']['temp']),
-                'feels_like': round(data['main']['feels_like']),
-                'description': data['weather'][0]['description'].title(),
-                'humidity': data['main']['humidity'],
-                'wind_speed': round(data['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
-                'pressure': data['main']['pressure'],
-                'visibility': data.get('visibility', 0) / 1000,  # Convert to km
-                'icon': data['weather'][0]['icon'],
-                'condition': data['weather'][0]['main']
-            }
-            
-            # Add travel advice based on weather
-            weather_data['travel_advice'] = self._get_travel_advice(weather_data)
+            weather_data, status = self._get_cached(
+                'weather', location, lambda: self._fetch_weather(location)
+            )
             
             return {
                 'success': True,
-                'data': weather_data
+                'data': weather_data,
+                'cached': status != 'miss'
             }
             
+        except WeatherBudgetExceeded:
+            logger.warning(f"Weather API budget exhausted; no data for {location}")
+            return {
+                'success': False,
+                'message': 'Weather data temporarily unavailable',
+                'data': self._get_default_weather(location)
+            }
         except requests.exceptions.RequestException as e:
             logger.error(f"Weather API error: {str(e)}")
             return {
@@ -119,58 +159,16 @@ class WeatherService:
             }
         
         try:
-            city_mapping = {
-                'dehradun': 'Dehradun,IN',
-                'rishikesh': 'Rishikesh,IN',
-                'haridwar': 'Haridwar,IN',
-                'mussoorie': 'Mussoorie,IN',
-                'nainital': 'Nainital,IN'
-            }
-            
-            city = location.lower()
-            query = city_mapping.get(city, f"{location},IN")
-            
-            url = f"{self.base_url}/forecast"
-            params = {
-                'q': query,
-                'appid': self.api_key,
-                'units': 'metric',
-                'cnt': min(days * 8, 40)  # 8 forecasts per day, max 40
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Group forecasts by day
-            forecasts = []
-            current_date = None
-            daily_forecast = None
-            
-            for item in data['list']:
-                date = item['dt_txt'].split(' ')[0]
-                if date != current_date:
-                    if daily_forecast:
-                        forecasts.append(daily_forecast)
-                    daily_forecast = {
-                        'date': date,
-                        'temp_min': item['main']['temp_min'],
-                        'temp_max': item['main']['temp_max'],
-                        'description': item['weather'][0]['description'],
-                        'icon': item['weather'][0]['icon']
-                    }
-                    current_date = date
-                else:
-                    daily_forecast['temp_min'] = min(daily_forecast['temp_min'], item['main']['temp_min'])
-                    daily_forecast['temp_max'] = max(daily_forecast['temp_max'], item['main']['temp_max'])
-            
-            if daily_forecast:
-                forecasts.append(daily_forecast)
+            # The full 5-day forecast is cached once and sliced per request
+            forecast, status = self._get_cached(
+                'forecast', location, lambda: self._fetch_forecast(location)
+            )
             
             return {
                 'success': True,
-                'location': data['city']['name'],
-                'forecasts': forecasts[:days]
+                'location': forecast['location'],
+                'forecasts': forecast['forecasts'][:days],
+                'cached': status != 'miss'
             }
             
         except Exception as e:
@@ -180,6 +178,211 @@ class WeatherService:
                 'message': 'Error fetching forecast'
             }
     
+    def refresh(self, kind: str, location: str, ttl: Optional[int] = None) -> bool:
+        """
+        Fetch and cache fresh data regardless of what is cached
+        
+        Used by the prewarmer, which has already taken its own budget, and
+        marks the location as managed so requests serve it without refreshing.
+        
+        Args:
+            kind: 'weather' or 'forecast'
+            location: Location name
+            ttl: How long the entry may be served (defaults to the stale TTL)
+            
+        Returns:
+            True if the refresh succeeded
+        """
+        fetch = self._fetch_weather if kind == 'weather' else self._fetch_forecast
+        key = self._cache_key(kind, location)
+        with self._lock:
+            self._managed_keys.add(key)
+        try:
+            self._fetch_and_store(key, lambda: fetch(location), ttl=ttl, use_budget=False)
+            return True
+        except Exception as e:
+            logger.warning(f"Weather refresh failed for {key}: {str(e)}")
+            return False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get upstream call and cache freshness counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['managed_keys'] = len(self._managed_keys)
+        stats.update(self._inflight.stats())
+        stats['pending_refreshes'] = len(self._pending_refreshes)
+        stats['budget'] = self.budget.stats()
+        return stats
+    
+    def _get_cached(self, kind: str, location: str, fetch: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """
+        Serve from cache with stale-while-revalidate
+        
+        Fresh entries are returned as is. Entries past the fresh TTL are
+        still returned immediately while a background refresh runs. Misses
+        fetch synchronously, with concurrent misses for the same location
+        sharing one upstream call.
+        
+        Returns:
+            (data, status) where status is 'fresh', 'stale' or 'miss'
+        """
+        key = self._cache_key(kind, location)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if time.time() - entry['fetched_at'] < self.fresh_ttl:
+                return entry['data'], 'fresh'
+            self._count('stale_served')
+            if key not in self._managed_keys:
+                self._refresh_in_background(key, fetch)
+            return entry['data'], 'stale'
+        
+        data = self._fetch_and_store(key, fetch)
+        return copy.deepcopy(data), 'miss'
+    
+    def _fetch_and_store(
+        self,
+        key: str,
+        fetch: Callable[[], Dict[str, Any]],
+        ttl: Optional[int] = None,
+        use_budget: bool = True
+    ) -> Dict[str, Any]:
+        def load():
+            if use_budget and not self.budget.try_acquire():
+                self._count('budget_exhausted')
+                raise WeatherBudgetExceeded(key)
+            self._count('upstream_calls')
+            try:
+                data = fetch()
+            except Exception:
+                self._count('upstream_errors')
+                raise
+            self.cache.set(key, {'data': data, 'fetched_at': time.time()}, ttl=ttl)
+            return data
+        
+        data, _ = self._inflight.do(key, load)
+        return data
+    
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Dict[str, Any]]):
+        with self._lock:
+            if key in self._pending_refreshes:
+                return
+            self._pending_refreshes.add(key)
+        
+        def refresh():
+            try:
+                self._fetch_and_store(key, fetch)
+                self._count('background_refreshes')
+            except Exception as e:
+                # Keep serving the stale entry until it ages out
+                logger.warning(f"Background weather refresh failed for {key}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._pending_refreshes.discard(key)
+        
+        self._refresh_executor.submit(refresh)
+    
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self._stats[name] += value
+    
+    @staticmethod
+    def _build_aliases() -> Dict[str, str]:
+        """Map known place names, aliases and slugs to one canonical name"""
+        aliases = {}
+        for slug, place in PlaceMatcher.KNOWN_PLACES.items():
+            canonical = place['name'].lower()
+            for name in [slug.replace('_', ' '), canonical] + place.get('aliases', []):
+                aliases.setdefault(name.lower(), canonical)
+        return aliases
+    
+    def _normalize_location(self, location: str) -> str:
+        name = ' '.join(location.lower().split())
+        return self._aliases.get(name, name)
+    
+    def _cache_key(self, kind: str, location: str) -> str:
+        return f"{kind}:{self._normalize_location(location)}"
+    
+    def _get_query(self, location: str) -> str:
+        city = self._normalize_location(location)
+        return CITY_MAPPING.get(city, f"{location},IN")
+    
+    def _fetch_weather(self, location: str) -> Dict[str, Any]:
+        """Fetch and format current weather from the API"""
+        # Get current weather
+        url = f"{self.base_url}/weather"
+        params = {
+            'q': self._get_query(location),
+            'appid': self.api_key,
+            'units': 'metric'
+        }
+        
+        response = self.session.get(url, params=params, timeout=Config.WEATHER_API_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Format response
+        weather_data = {
+            'location': data.get('name', location),
+            'temperature': round(data['main']['temp']),
+            'feels_like': round(data['main']['feels_like']),
+            'description': data['weather'][0]['description'].title(),
+            'humidity': data['main']['humidity'],
+            'wind_speed': round(data['wind']['speed'] * 3.6, 1),  # Convert m/s to km/h
+            'pressure': data['main']['pressure'],
+            'visibility': data.get('visibility', 0) / 1000,  # Convert to km
+            'icon': data['weather'][0]['icon'],
+            'condition': data['weather'][0]['main']
+        }
+        
+        # Add travel advice based on weather
+        weather_data['travel_advice'] = self._get_travel_advice(weather_data)
+        
+        return weather_data
+    
+    def _fetch_forecast(self, location: str) -> Dict[str, Any]:
+        """Fetch the full 5-day forecast from the API, grouped by day"""
+        url = f"{self.base_url}/forecast"
+        params = {
+            'q': self._get_query(location),
+            'appid': self.api_key,
+            'units': 'metric',
+            'cnt': 40  # 8 forecasts per day, 5 days
+        }
+        
+        response = self.session.get(url, params=params, timeout=Config.WEATHER_API_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Group forecasts by day
+        forecasts = []
+        current_date = None
+        daily_forecast = None
+        
+        for item in data['list']:
+            date = item['dt_txt'].split(' ')[0]
+            if date != current_date:
+                if daily_forecast:
+                    forecasts.append(daily_forecast)
+                daily_forecast = {
+                    'date': date,
+                    'temp_min': item['main']['temp_min'],
+                    'temp_max': item['main']['temp_max'],
+                    'description': item['weather'][0]['description'],
+                    'icon': item['weather'][0]['icon']
+                }
+                current_date = date
+            else:
+                daily_forecast['temp_min'] = min(daily_forecast['temp_min'], item['main']['temp_min'])
+                daily_forecast['temp_max'] = max(daily_forecast['temp_max'], item['main']['temp_max'])
+        
+        if daily_forecast:
+            forecasts.append(daily_forecast)
+        
+        return {
+            'location': data['city']['name'],
+            'forecasts': forecasts
+        }
+    
     def _get_travel_advice(self, weather_data: Dict[str, Any]) -> str:
         """Get travel advice based on weather conditions"""
         condition = weather_data.get('condition', '').lower()
@@ -3,18 +3,184 @@ Activity Helper Utilities
 Helper functions to easily log activities from anywhere in the app
 """
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.config.database import get_database
+from app.config.settings import Config
 from app.models.activity import Activity
+from app.utils.logger import logger as app_logger
+from app.utils.metrics import metrics
+import atexit
+import os
+import queue
+import threading
 import time
 
 
+# Queue marker telling the writer thread to flush and exit
+_STOP = object()
+
+
+class ActivityWriter:
+    """
+    Background writer that batches activity documents into insert_many calls
+    
+    Documents are queued by request threads and written by a single worker
+    thread once batch_size documents are waiting or flush_interval seconds
+    have passed since the first one arrived. When the queue is full, submit
+    waits up to enqueue_timeout and then drops the document rather than
+    stalling the request.
+    """
+    
+    def __init__(self, activity_model: Activity, max_queue_size: int = 10000,
+                 batch_size: int = 200, flush_interval: float = 1.0,
+                 enqueue_timeout: float = 0.05):
+        self.activity_model = activity_model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self._stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+        metrics.register_collector('activity_writer', self.stats)
+        atexit.register(self.close)
+    
+    def submit(self, activity: Dict[str, Any]) -> bool:
+        """
+        Queue an activity document for writing
+        
+        Returns:
+            False if the document was dropped
+        """
+        if self._closed:
+            self._count('dropped')
+            return False
+        
+        self._ensure_worker()
+        try:
+            if self.enqueue_timeout > 0:
+                self._queue.put(activity, timeout=self.enqueue_timeout)
+            else:
+                self._queue.put_nowait(activity)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        
+        self._count('enqueued')
+        return True
+    
+    def close(self, timeout: float = 5.0):
+        """Stop accepting documents and flush everything still queued"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                thread.join(timeout)
+            except queue.Full:
+                pass
+        
+        # Anything the worker did not get to is written from this thread
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            self._write(remaining[start:start + self.batch_size])
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get writer counters and current queue depth"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        stats['capacity'] = self._queue.maxsize
+        return stats
+    
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self._stats[name] += value
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use, and again in forked workers"""
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # Threads do not survive fork; start over with an empty queue
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._write(batch)
+    
+    def _write(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        start = time.time()
+        try:
+            inserted = self.activity_model.insert_activities(batch)
+        except Exception as e:
+            app_logger.error(f"Failed to write {len(batch)} activities: {str(e)}")
+            inserted = 0
+        
+        metrics.record_timing('activity_writer.flush', (time.time() - start) * 1000)
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['written'] += inserted
+            self._stats['failed'] += len(batch) - inserted
+
+
 class ActivityLogger:
     """Helper class to log activities easily"""
     
     def __init__(self):
         self.db = get_database()
         self.activity_model = Activity(self.db)
+        self.writer = None
+        if Config.ACTIVITY_ASYNC_WRITES:
+            self.writer = ActivityWriter(
+                self.activity_model,
+                max_queue_size=Config.ACTIVITY_QUEUE_SIZE,
+                batch_size=Config.ACTIVITY_BATCH_SIZE,
+                flush_interval=Config.ACTIVITY_FLUSH_INTERVAL,
+                enqueue_timeout=Config.ACTIVITY_ENQUEUE_TIMEOUT
+            )
     
     def log(self, user_id: str, service_type: str, action: str,
             details: Optional[Dict] = None,
@@ -23,17 +189,31 @@ class ActivityLogger:
             metadata: Optional[Dict] = None):
         """
         Quick log activity
+        
+        With async writes enabled this only queues the document, so the
+        returned activity may not be in the database yet; None means it
+        was dropped.
         """
         try:
-            return self.activity_model.log_activity(
-                user_id=user_id,
-                service_type=service_type,
-                action=action,
+            if self.writer is None:
+                return self.activity_model.log_activity(
+                    user_id=user_id,
+                    service_type=service_type,
+                    action=action,
+                    details=details,
+                    request_data=request_data,
+                    response_data=response_data,
+                    metadata=metadata
+                )
+            
+            activity = Activity.build_activity(
+                user_id, service_type, action,
                 details=details,
                 request_data=request_data,
                 response_data=response_data,
                 metadata=metadata
             )
+            return activity if self.writer.submit(activity) else None
         except Exception as e:
             print(f"Failed to log activity: {str(e)}")
             return None
@@ -0,0 +1,315 @@
+"""Concurrency helpers shared by services"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution
+
+    The first caller for a key runs the function; callers that arrive while
+    it is running wait for it and receive the same result (or exception).
+    Nothing is cached once the call finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._coalesced = 0
+        self._timed_out = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run fn once per key across concurrent callers
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable to execute
+            timeout: Longest a follower waits for the leader (None waits indefinitely)
+
+        Returns:
+            (result, shared) where shared is True if another caller's result was reused
+
+        Raises:
+            TimeoutError: If a follower gives up waiting; the leader keeps running
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    self._timed_out += 1
+                raise TimeoutError(f"Timed out after {timeout}s waiting for a shared call")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for key is currently running"""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict[str, int]:
+        """Get in-flight, coalesced and follower timeout counts"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'coalesced': self._coalesced,
+                'timed_out': self._timed_out
+            }
+
+
+class RateBudget:
+    """
+    Token bucket limiting how many calls may be made per day
+
+    Tokens refill continuously at per_day / 86400 per second up to burst,
+    so calls are spread over the day rather than spent all at once.
+    """
+
+    def __init__(self, per_day: float, burst: int = 1):
+        self.rate = per_day / 86400.0
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._granted = 0
+        self._denied = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._granted += 1
+                return True
+            self._denied += 1
+            return False
+
+    def acquire(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for a token
+
+        Args:
+            stop_event: Abandon the wait when this event is set
+
+        Returns:
+            False if the wait was abandoned
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._granted += 1
+                    return True
+                wait_seconds = (1 - self._tokens) / self.rate if self.rate > 0 else 60.0
+
+            if stop_event is not None:
+                if stop_event.wait(wait_seconds):
+                    return False
+            else:
+                time.sleep(wait_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get budget configuration and usage counters"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'per_day': round(self.rate * 86400),
+                'burst': self.burst,
+                'available': round(self._tokens, 2),
+                'granted': self._granted,
+                'denied': self._denied
+            }
+
+
+class OverloadedError(Exception):
+    """Raised when a call could not be admitted before its queue-time limit"""
+
+    def __init__(self, call_type: str, reason: str, retry_after: int = 1):
+        super().__init__(f"{call_type} call rejected: {reason}")
+        self.call_type = call_type
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """One queued call waiting for a slot"""
+
+    def __init__(self, call_type: str, priority: int, seq: int):
+        self.call_type = call_type
+        self.priority = priority
+        self.seq = seq
+        self.granted = threading.Event()
+
+
+class _Slot:
+    """Admission granted by PriorityLimiter; release exactly once"""
+
+    def __init__(self, limiter: 'PriorityLimiter', call_type: str):
+        self._limiter = limiter
+        self.call_type = call_type
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(self.call_type)
+
+    def __enter__(self) -> '_Slot':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class PriorityLimiter:
+    """
+    Admission control for a shared upstream with per-type caps and priorities
+
+    At most max_concurrency calls run at once, and each call type has its
+    own cap below that. When a slot frees up it goes to the waiting call with
+    the lowest priority number (FIFO within a priority) whose type is under
+    its cap, so low-priority bursts cannot hold back high-priority calls. A
+    call that waits longer than its type's max_wait, or arrives to a full
+    queue, is rejected with OverloadedError instead of piling up.
+    """
+
+    def __init__(self, max_concurrency: int, call_types: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            max_concurrency: Calls allowed in flight across all types
+            call_types: Per type {'priority', 'max_concurrency', 'max_wait', 'max_queue'}
+        """
+        self.max_concurrency = max(max_concurrency, 1)
+        self.call_types = call_types
+        self._lock = threading.Lock()
+        self._waiting: list = []
+        self._seq = 0
+        self._running = {name: 0 for name in call_types}
+        self._queued = {name: 0 for name in call_types}
+        self._admitted = {name: 0 for name in call_types}
+        self._rejected = {name: 0 for name in call_types}
+
+    def acquire(self, call_type: str) -> _Slot:
+        """
+        Wait for a slot for call_type
+
+        Returns:
+            A slot to release when the call finishes (usable as a context manager)
+
+        Raises:
+            OverloadedError: If the queue is full or max_wait elapses first
+        """
+        limits = self.call_types[call_type]
+        max_wait = limits.get('max_wait', 10)
+        retry_after = max(int(round(max_wait)), 1)
+
+        with self._lock:
+            if not self._waiting and self._has_capacity(call_type):
+                self._running[call_type] += 1
+                self._admitted[call_type] += 1
+                return _Slot(self, call_type)
+
+            if self._queued[call_type] >= limits.get('max_queue', 100):
+                self._rejected[call_type] += 1
+                raise OverloadedError(call_type, 'queue full', retry_after)
+
+            self._seq += 1
+            waiter = _Waiter(call_type, limits.get('priority', 0), self._seq)
+            self._waiting.append(waiter)
+            self._waiting.sort(key=lambda w: (w.priority, w.seq))
+            self._queued[call_type] += 1
+            # A slot may already be free for a higher-priority queued call
+            self._dispatch()
+
+        if waiter.granted.wait(max_wait):
+            return _Slot(self, call_type)
+
+        with self._lock:
+            # The grant can race the timeout; honour it if it landed
+            if waiter.granted.is_set():
+                return _Slot(self, call_type)
+            self._waiting.remove(waiter)
+            self._queued[call_type] -= 1
+            self._rejected[call_type] += 1
+        raise OverloadedError(call_type, f'no slot within {max_wait}s', retry_after)
+
+    def _has_capacity(self, call_type: str) -> bool:
+        cap = self.call_types[call_type].get('max_concurrency', self.max_concurrency)
+        return (sum(self._running.values()) < self.max_concurrency
+                and self._running[call_type] < cap)
+
+    def _dispatch(self) -> None:
+        # Caller holds the lock
+        for waiter in list(self._waiting):
+            if sum(self._running.values()) >= self.max_concurrency:
+                break
+            if not self._has_capacity(waiter.call_type):
+                continue
+            self._waiting.remove(waiter)
+            self._queued[waiter.call_type] -= 1
+            self._running[waiter.call_type] += 1
+            self._admitted[waiter.call_type] += 1
+            waiter.granted.set()
+
+    def _release(self, call_type: str) -> None:
+        with self._lock:
+            self._running[call_type] -= 1
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get running, queued, admitted and rejected counts per call type"""
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'running': sum(self._running.values()),
+                'queued': len(self._waiting),
+                'types': {
+                    name: {
+                        'running': self._running[name],
+                        'queued': self._queued[name],
+                        'admitted': self._admitted[name],
+                        'rejected': self._rejected[name]
+                    }
+                    for name in self.call_types
+                }
+            }
@@ -0,0 +1,190 @@
+"""Geographic helpers shared by location-aware services"""
+import heapq
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = EARTH_RADIUS_KM * math.pi / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geojson_point(lat: float, lon: float) -> Dict[str, Any]:
+    """GeoJSON point (note GeoJSON orders coordinates lon, lat)"""
+    return {'type': 'Point', 'coordinates': [lon, lat]}
+
+
+def point_coordinates(point: Dict[str, Any]) -> Tuple[float, float]:
+    """(lat, lon) of a GeoJSON point"""
+    lon, lat = point['coordinates']
+    return lat, lon
+
+
+def valid_coordinates(lat: Any, lon: Any) -> bool:
+    """Check that lat/lon are numbers within range"""
+    try:
+        return -90 <= float(lat) <= 90 and -180 <= float(lon) <= 180
+    except (TypeError, ValueError):
+        return False
+
+
+class GeoGrid:
+    """
+    Fixed-size lat/lon grid for "what covers this point" lookups
+
+    Each item is registered in every cell its bounding circle touches, so a
+    lookup only reads the one cell containing the query point and checks the
+    exact distance for the few items in it, independent of the total count.
+    """
+
+    def __init__(self, cell_degrees: float = 0.5):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], list] = {}
+        self._size = 0
+
+    def _cells_within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+        """Cells any point within radius_km of (lat, lon) can fall in"""
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        min_row = int(math.floor((lat - d_lat) / self.cell_degrees))
+        max_row = int(math.floor((lat + d_lat) / self.cell_degrees))
+        columns = int(round(360 / self.cell_degrees))  # cell_degrees should divide 360
+        # Longitude degrees shrink towards the poles, so size the span at the
+        # most poleward latitude the circle reaches
+        edge = math.cos(math.radians(min(abs(lat) + d_lat, 90.0)))
+        d_lon = radius_km / (KM_PER_DEGREE_LAT * edge) if edge > 1e-6 else 360.0
+        if 2 * d_lon >= 360 - self.cell_degrees:
+            cols = range(columns)
+        else:
+            # Columns wrap at the antimeridian
+            cols = range(int(math.floor((lon - d_lon) / self.cell_degrees)),
+                         int(math.floor((lon + d_lon) / self.cell_degrees)) + 1)
+        return [(row, col % columns) for row in range(min_row, max_row + 1) for col in cols]
+
+    def insert(self, lat: float, lon: float, radius_km: float, item: Any) -> None:
+        """Register item as covering radius_km around (lat, lon)"""
+        for cell in self._cells_within(lat, lon, radius_km):
+            self._cells.setdefault(cell, []).append((lat, lon, radius_km, item))
+        self._size += 1
+
+    def covering(self, lat: float, lon: float, extra_km: float = 0.0) -> Iterator[Tuple[Any, float]]:
+        """
+        Yield (item, distance_km) for items whose radius covers (lat, lon)
+
+        Args:
+            extra_km: Search radius around the point, added to every item's radius
+        """
+        seen = set()
+        for cell in self._cells_within(lat, lon, extra_km):
+            for item_lat, item_lon, radius_km, item in self._cells.get(cell, ()):
+                if id(item) in seen:
+                    continue
+                seen.add(id(item))
+                distance = haversine_km(lat, lon, item_lat, item_lon)
+                if distance <= radius_km + extra_km:
+                    yield item, distance
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere; straight-line distance between these orders like great-circle distance"""
+    phi, lam = math.radians(lat), math.radians(lon)
+    return math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi)
+
+
+def chord_to_km(chord: float) -> float:
+    """Great-circle distance for a straight-line distance between unit vectors"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class _KDNode:
+    __slots__ = ('point', 'item', 'axis', 'left', 'right')
+
+    def __init__(self, point, item, axis, left, right):
+        self.point = point
+        self.item = item
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class KDTree:
+    """
+    Static k-d tree for k-nearest-neighbour queries on lat/lon points
+
+    Points are stored as 3-d unit vectors, so nearest-by-chord is exactly
+    nearest-by-great-circle and there is no special case at the antimeridian.
+    Queries take O(log n) for a balanced tree and small k.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float, Any]]):
+        """
+        Args:
+            points: (lat, lon, item) tuples
+        """
+        vectors = [(unit_vector(lat, lon), item) for lat, lon, item in points]
+        self._size = len(vectors)
+        self._root = self._build(vectors, 0)
+
+    def _build(self, vectors: List[Tuple[Tuple[float, float, float], Any]], depth: int) -> Optional[_KDNode]:
+        if not vectors:
+            return None
+        axis = depth % 3
+        vectors.sort(key=lambda entry: entry[0][axis])
+        median = len(vectors) // 2
+        point, item = vectors[median]
+        return _KDNode(
+            point,
+            item,
+            axis,
+            self._build(vectors[:median], depth + 1),
+            self._build(vectors[median + 1:], depth + 1)
+        )
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[Any, float]]:
+        """Get up to k (item, distance_km) pairs, nearest first"""
+        if k <= 0 or self._root is None:
+            return []
+        target = unit_vector(lat, lon)
+        # Max-heap of the best k so far, as (-squared chord, tiebreak, item)
+        best: List[Tuple[float, int, Any]] = []
+        counter = 0
+        # (node, squared distance from the target to the region it covers)
+        stack: List[Tuple[_KDNode, float]] = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            # The far side of a split can only hold a closer point if its plane is within reach
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            d0 = node.point[0] - target[0]
+            d1 = node.point[1] - target[1]
+            d2 = node.point[2] - target[2]
+            squared = d0 * d0 + d1 * d1 + d2 * d2
+            counter += 1
+            if len(best) < k:
+                heapq.heappush(best, (-squared, counter, node.item))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, counter, node.item))
+
+            diff = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            if far is not None:
+                stack.append((far, diff * diff))
+            if near is not None:
+                stack.append((near, bound))
+
+        return [
+            (item, chord_to_km(math.sqrt(-negative)))
+            for negative, _, item in sorted(best, reverse=True)
+        ]
+
+    def __len__(self) -> int:
+        return self._size
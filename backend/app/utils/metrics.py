@@ -0,0 +1,68 @@
+"""In-process metrics registry for service counters and timings"""
+import threading
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, timings and stats collectors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Increment a named counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record_timing(self, name: str, value_ms: float) -> None:
+        """Record a duration sample (milliseconds) for a named timing"""
+        with self._lock:
+            timing = self._timings.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            timing['count'] += 1
+            timing['total_ms'] += value_ms
+            timing['max_ms'] = max(timing['max_ms'], value_ms)
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Register a callable whose stats are included in snapshots
+
+        Args:
+            name: Section name in the snapshot
+            collector: Zero-argument callable returning a stats dictionary
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a point-in-time copy of all metrics"""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                name: {
+                    'count': t['count'],
+                    'avg_ms': round(t['total_ms'] / t['count'], 2) if t['count'] else 0,
+                    'max_ms': round(t['max_ms'], 2)
+                }
+                for name, t in self._timings.items()
+            }
+            collectors = dict(self._collectors)
+
+        collected = {}
+        for name, collector in collectors.items():
+            try:
+                collected[name] = collector()
+            except Exception as e:
+                collected[name] = {'error': str(e)}
+
+        return {
+            'counters': counters,
+            'timings': timings,
+            'collectors': collected
+        }
+
+
+# Create default metrics registry
+metrics = MetricsRegistry()
@@ -0,0 +1,72 @@
+"""
+Keyset Pagination Helpers
+Opaque cursor tokens for newest-first (timestamp, _id) ordered listings
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+# Sort order every keyset-paginated listing must use
+KEYSET_SORT = [("timestamp", -1), ("_id", -1)]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+    pass
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """
+    Build a cursor pointing just past a document
+
+    Args:
+        doc: Last document of the current page (needs timestamp and _id)
+
+    Returns:
+        URL-safe opaque token
+    """
+    payload = {
+        't': doc['timestamp'].isoformat(),
+        'i': str(doc['_id'])
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor token
+
+    Returns:
+        (timestamp, _id) of the last document on the previous page
+
+    Raises:
+        InvalidCursorError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['t']), ObjectId(payload['i'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursorError('Invalid pagination cursor') from e
+
+
+def keyset_filter(token: str) -> Dict[str, Any]:
+    """
+    Build the query clause selecting documents after a cursor
+
+    Matches everything strictly older than the cursor position in
+    (timestamp desc, _id desc) order, so a page is an index range scan
+    of limit entries no matter how deep it is.
+    """
+    timestamp, last_id = decode_cursor(token)
+    return {
+        "$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "_id": {"$lt": last_id}}
+        ]
+    }
@@ -0,0 +1,22 @@
+"""Server-sent event formatting"""
+import json
+from typing import Any, Optional
+
+
+def sse_event(data: Any, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """Format one server-sent event"""
+    payload = json.dumps(data, ensure_ascii=False)
+    prefix = f"event: {event}\n" if event else ''
+    if event_id is not None:
+        prefix = f"id: {event_id}\n" + prefix
+    return f"{prefix}data: {payload}\n\n"
+
+
+def sse_comment(text: str = 'keepalive') -> str:
+    """Comment line; keeps idle connections open through proxies"""
+    return f": {text}\n\n"
+
+
+def sse_retry(milliseconds: int) -> str:
+    """Set the client's reconnect delay"""
+    return f"retry: {int(milliseconds)}\n\n"
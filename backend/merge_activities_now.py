@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from app.config.database import get_database
+from app.models.activity_rollup import ActivityRollup
 
 def merge_now():
     """Merge anonymous activities automatically"""
@@ -68,6 +69,10 @@ def merge_now():
         
         print(f"\n✅ Merged {result.modified_count} activities!")
         
+        # Rollups are keyed by user, so recompute them after moving activities
+        ActivityRollup(db).rebuild(activities)
+        print("✓ Activity rollups rebuilt")
+        
         # Show final stats
         total = activities.count_documents({"user_id": target_user_id})
         print(f"\nTotal activities for user {target_user_id}: {total}")
@@ -7,6 +7,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from app.config.database import get_database
+from app.models.activity_rollup import ActivityRollup
 
 def merge_anonymous_to_user(target_user_id: str):
     """
@@ -60,6 +61,10 @@ def merge_anonymous_to_user(target_user_id: str):
         
         print(f"\n✅ Successfully merged {result.modified_count} activities!")
         
+        # Rollups are keyed by user, so recompute them after moving activities
+        ActivityRollup(db).rebuild(activities)
+        print("✓ Activity rollups rebuilt")
+        
         # Show updated stats
         print("\n" + "=" * 70)
         print("UPDATED USER STATS")
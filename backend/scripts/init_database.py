@@ -4,7 +4,7 @@ Creates collections, indexes, and seed data
 """
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -12,6 +12,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from app.config.database import get_database, get_client
 from app.models.user import User
 from app.models.chat import Chat
+from app.models.alert import Alert
+from app.config.indexes import ensure_indexes
 
 
 def init_database():
@@ -34,16 +36,17 @@ def init_database():
         print(f"→ Existing collections: {existing_collections}")
         print()
         
+        # Reconcile registered indexes
+        ensure_indexes(db)
+        
         # Initialize Users collection
         print("→ Initializing Users collection...")
-        user_model = User(db)
         print("✓ Users collection ready")
         print("  - Indexes: email (unique), created_at")
         print()
         
         # Initialize Chats collection
         print("→ Initializing Chats collection...")
-        chat_model = Chat(db)
         print("✓ Chats collection ready")
         print("  - Indexes: (user_id, timestamp), session_id, feedback.rating, content (text)")
         print()
@@ -155,6 +158,53 @@ def seed_test_data():
         print(f"✓ Created {len(messages)} sample messages")
         print()
         
+        # Create sample travel alerts
+        print("→ Creating sample travel alerts...")
+        alert_model = Alert(db)
+        now = datetime.utcnow()
+        alerts = [
+            {
+                'type': 'weather', 'severity': 'high',
+                'title': 'Heavy Snowfall Alert',
+                'message': 'Heavy snowfall expected in higher altitude areas including Kedarnath, Badrinath, and Gangotri. Roads may be blocked. Carry warm clothing and emergency supplies.',
+                'location': 'Char Dham Region', 'lat': 30.80, 'lon': 79.10, 'radius_km': 60,
+                'valid_until': now + timedelta(days=7)
+            },
+            {
+                'type': 'road', 'severity': 'high',
+                'title': 'Road Closure - Landslide',
+                'message': 'NH-58 closed between Rishikesh and Devprayag due to landslide. Use alternate route via Chamba. Expected clearance in 48 hours.',
+                'location': 'Rishikesh-Devprayag', 'lat': 30.15, 'lon': 78.45, 'radius_km': 30,
+                'valid_until': now + timedelta(days=2)
+            },
+            {
+                'type': 'weather', 'severity': 'moderate',
+                'title': 'Dense Fog Warning',
+                'message': 'Dense fog expected in valley areas during early morning hours. Drive carefully and use fog lights. Visibility may drop below 50 meters.',
+                'location': 'Dehradun Valley', 'lat': 30.3165, 'lon': 78.0322, 'radius_km': 25,
+                'valid_until': now + timedelta(days=30)
+            },
+            {
+                'type': 'safety', 'severity': 'moderate',
+                'title': 'Wildlife Activity Alert',
+                'message': 'Increased wildlife movement reported in Jim Corbett National Park buffer zones. Avoid night travel and maintain safe distance from animals.',
+                'location': 'Jim Corbett Area', 'lat': 29.53, 'lon': 78.7747, 'radius_km': 20,
+                'valid_until': now + timedelta(days=14)
+            },
+            {
+                'type': 'event', 'severity': 'low',
+                'title': 'Festival Rush Expected',
+                'message': 'Heavy tourist influx expected during upcoming festivals. Book accommodations in advance. Traffic congestion likely in Haridwar and Rishikesh.',
+                'location': 'Haridwar-Rishikesh', 'lat': 30.02, 'lon': 78.22, 'radius_km': 20,
+                'valid_until': now + timedelta(days=10)
+            }
+        ]
+        for alert in alerts:
+            alert_model.create_alert(alert)
+        
+        print(f"✓ Created {len(alerts)} sample alerts")
+        print()
+        
         print("=" * 60)
         print("✓ Test data seeded successfully!")
         print("=" * 60)
@@ -195,6 +245,9 @@ def drop_database():
         db.chats.drop()
         print("✓ Dropped chats collection")
         
+        db.alerts.drop()
+        print("✓ Dropped alerts collection")
+        
         print()
         print("=" * 60)
         print("✓ All collections dropped successfully!")
@@ -10,7 +10,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.config.database import get_database, get_client
-from pymongo import ASCENDING, DESCENDING, TEXT
+from app.config.indexes import INDEXES, ensure_indexes
 
 
 def create_collections_and_indexes():
@@ -25,48 +25,19 @@ def create_collections_and_indexes():
         client.admin.command('ping')
         print("✓ Connected to MongoDB")
         
-        # Users Collection
-        print("\n📦 Setting up 'users' collection...")
-        users = db.users
-        users.create_index("email", unique=True)
-        users.create_index("created_at", name="idx_created_at")
-        users.create_index("is_active", name="idx_is_active")
-        print("  ✓ Created indexes: email (unique), created_at, is_active")
+        # Reconcile every index declared in the registry
+        print("\n📦 Reconciling indexes...")
+        created = ensure_indexes(db)
+        for name in INDEXES:
+            created_names = created.get(name, [])
+            existing_names = [index['name'] for index in db[name].list_indexes()]
+            print(f"  ✓ {name}: {len(existing_names)} indexes ({len(created_names)} created)")
+            for index_name in created_names:
+                print(f"    + {index_name}")
         
-        # Chats Collection
-        print("\n💬 Setting up 'chats' collection...")
+        users = db.users
         chats = db.chats
         
-        # Compound index for user queries (most common)
-        chats.create_index(
-            [("user_id", ASCENDING), ("timestamp", DESCENDING)],
-            name="idx_user_timestamp"
-        )
-        
-        # Session index for conversation grouping
-        chats.create_index("session_id", name="idx_session")
-        
-        # Feedback index for analytics
-        chats.create_index("feedback.rating", name="idx_feedback_rating")
-        
-        # Role index for filtering
-        chats.create_index("role", name="idx_role")
-        
-        # Text index for content search (for reinforcement learning)
-        try:
-            chats.create_index([("content", TEXT)], name="idx_content_text")
-            print("  ✓ Created text search index on content")
-        except Exception as e:
-            print(f"  ⚠ Text index might already exist: {e}")
-        
-        # Compound index for liked responses (reinforcement learning)
-        chats.create_index(
-            [("feedback.rating", ASCENDING), ("timestamp", DESCENDING)],
-            name="idx_feedback_timestamp"
-        )
-        
-        print("  ✓ Created indexes: user_id+timestamp, session_id, feedback.rating, role, content (text)")
-        
         # Get collection stats
         user_count = users.count_documents({})
         chat_count = chats.count_documents({})
@@ -83,6 +54,23 @@ def create_collections_and_indexes():
         return False
 
 
+def rebuild_activity_rollups():
+    """Recompute activity rollups from the raw activities collection"""
+    print("\n📈 Rebuilding activity rollups...")
+    
+    try:
+        from app.models.activity_rollup import ActivityRollup
+        
+        db = get_database()
+        processed = ActivityRollup(db).rebuild(db.activities)
+        print(f"  ✓ Rolled up {processed} activities into {db.activity_rollups.count_documents({})} daily rollups")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Rollup rebuild failed: {e}")
+        return False
+
+
 def seed_sample_data():
     """Seed sample data for testing (optional)"""
     print("\n🌱 Seeding sample data...")
@@ -212,6 +200,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='MongoDB Migration Script')
     parser.add_argument('--seed', action='store_true', help='Seed sample data')
     parser.add_argument('--schema', action='store_true', help='Show schema documentation')
+    parser.add_argument('--rebuild-rollups', action='store_true', help='Recompute activity rollups from raw activities')
     
     args = parser.parse_args()
     
@@ -223,6 +212,9 @@ if __name__ == "__main__":
         if success and args.seed:
             seed_sample_data()
         
+        if success and args.rebuild_rollups:
+            success = rebuild_activity_rollups()
+        
         if success:
             print("\n🎉 All done! You can now start the application.")
             print("\n📝 To see schema documentation, run:")
@@ -0,0 +1,129 @@
+"""
+OpenWeather Stub Server
+Serves deterministic /weather and /forecast responses so the weather cache
+can be exercised offline.
+
+Usage:
+    python scripts/weather_stub_server.py --port 8089 --delay 0.5
+
+Then start the backend with:
+    WEATHER_API_KEY=stub WEATHER_API_BASE_URL=http://localhost:8089/data/2.5 python run.py
+
+GET /stats returns how many upstream requests each endpoint has received.
+"""
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+_counts = {'weather': 0, 'forecast': 0}
+_counts_lock = threading.Lock()
+
+
+def _city_seed(query: str) -> int:
+    # Stable per-city numbers so repeated calls return identical payloads
+    return zlib.crc32(query.lower().encode('utf-8'))
+
+
+def _weather_payload(query: str) -> dict:
+    seed = _city_seed(query)
+    name = query.split(',')[0]
+    return {
+        'name': name,
+        'main': {
+            'temp': 5 + seed % 25,
+            'feels_like': 4 + seed % 25,
+            'humidity': 40 + seed % 50,
+            'pressure': 1000 + seed % 20
+        },
+        'weather': [{'main': 'Clear', 'description': 'clear sky', 'icon': '01d'}],
+        'wind': {'speed': (seed % 10) / 2},
+        'visibility': 10000
+    }
+
+
+def _forecast_payload(query: str, count: int) -> dict:
+    seed = _city_seed(query)
+    start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    items = []
+    for i in range(count):
+        slot = start + timedelta(hours=3 * i)
+        temp = 5 + (seed + i) % 25
+        items.append({
+            'dt_txt': slot.strftime('%Y-%m-%d %H:%M:%S'),
+            'main': {'temp_min': temp - 2, 'temp_max': temp + 2},
+            'weather': [{'description': 'scattered clouds', 'icon': '03d'}]
+        })
+    return {'city': {'name': query.split(',')[0]}, 'list': items}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Handles OpenWeather-shaped requests"""
+
+    delay = 0.0
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        query = params.get('q', ['Dehradun,IN'])[0]
+
+        if url.path.endswith('/stats'):
+            with _counts_lock:
+                return self._send(200, dict(_counts))
+
+        endpoint = url.path.rstrip('/').rsplit('/', 1)[-1]
+        if endpoint not in _counts:
+            return self._send(404, {'cod': '404', 'message': 'not found'})
+
+        with _counts_lock:
+            _counts[endpoint] += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        if endpoint == 'weather':
+            return self._send(200, _weather_payload(query))
+        count = int(params.get('cnt', ['40'])[0])
+        return self._send(200, _forecast_payload(query, count))
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(port: int = 8089, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stub server in a background thread and return it"""
+    StubHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='OpenWeather stub server')
+    parser.add_argument('--port', type=int, default=8089, help='Port to listen on')
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to wait before each response')
+
+    args = parser.parse_args()
+
+    server = run(args.port, args.delay)
+    print(f"🌤  Weather stub listening on http://127.0.0.1:{args.port}/data/2.5")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n✓ Stub server stopped")
@@ -0,0 +1,74 @@
+"""Test script comparing place autocomplete with the original substring scan"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+import string
+from app.services.place_matcher import PlaceMatcher
+
+
+def reference_suggestions(places, partial_name):
+    """Every place whose name or an alias contains the query, in table order"""
+    partial_lower = partial_name.lower().strip()
+    return [
+        place['name'] for place in places.values()
+        if partial_lower in place['name'].lower()
+        or any(partial_lower in alias.lower() for alias in place.get('aliases', []))
+    ]
+
+
+def test_same_places_as_scan(count=3000):
+    """Suggestions contain the same places as the scan, whatever the query length"""
+    print(f"\n=== Test 1: {count} queries against the substring scan ===")
+    matcher = PlaceMatcher()
+    places = PlaceMatcher.KNOWN_PLACES
+    terms = [term.lower() for place in places.values() for term in [place['name']] + place.get('aliases', [])]
+    rng = random.Random(5)
+
+    queries = ['ri', 'a', 'ot', 'kedar', 'dham', 'x']
+    for _ in range(count):
+        if rng.random() < 0.8:
+            term = rng.choice(terms)
+            start = rng.randrange(len(term))
+            # Blank queries are rejected outright rather than matching everything
+            query = term[start:start + rng.randint(1, 6)].strip()
+            if query:
+                queries.append(query)
+        else:
+            queries.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 3))))
+
+    failures = 0
+    for query in queries:
+        expected = reference_suggestions(places, query)
+        everything = [place['name'] for place in matcher.get_suggestions(query, len(places))]
+        top = [place['name'] for place in matcher.get_suggestions(query, 5)]
+        ok = (
+            sorted(everything) == sorted(expected)
+            and len(top) == min(5, len(expected))
+            and set(top) <= set(expected)
+        )
+        if not ok:
+            failures += 1
+            if failures <= 5:
+                print(f"❌ {query!r}: {everything}, expected {expected}")
+    print(f"{'✅' if failures == 0 else '❌'} {len(queries) - failures}/{len(queries)} queries match")
+    return failures == 0
+
+
+def test_prefix_first():
+    """Places starting with the query rank before those containing it"""
+    print("\n=== Test 2: Prefix matches first ===")
+    names = [place['name'] for place in PlaceMatcher().get_suggestions('ri', 10)]
+    ok = names[0] == 'Rishikesh' and 'Haridwar' in names and 'Badrinath' in names
+    print(f"{'✅' if ok else '❌'} 'ri': {names}")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING PLACE AUTOCOMPLETE")
+    print("=" * 70)
+    results = [test_same_places_as_scan(), test_prefix_first()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
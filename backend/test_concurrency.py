@@ -0,0 +1,200 @@
+"""Test script for the shared concurrency helpers (PriorityLimiter, SingleFlight, RateBudget)"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import threading
+import time
+from app.utils.concurrency import OverloadedError, PriorityLimiter, RateBudget, SingleFlight
+
+
+def wait_until(condition, timeout=2.0):
+    """Poll until condition() holds, so threads are queued in a known order"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('condition not reached')
+        time.sleep(0.005)
+
+
+def report(name, ok):
+    print(f"{'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def test_priority_ordering():
+    """Freed slots go to the highest-priority waiter, FIFO within a priority"""
+    print("\n=== Test 1: Priority ordering ===")
+    limiter = PriorityLimiter(1, {
+        'emergency': {'priority': 0, 'max_wait': 5},
+        'chat': {'priority': 1, 'max_wait': 5}
+    })
+    held = limiter.acquire('chat')
+    order = []
+
+    def call(call_type, name):
+        with limiter.acquire(call_type):
+            order.append(name)
+            time.sleep(0.01)
+
+    threads = []
+    for call_type, name in [('chat', 'chat-1'), ('chat', 'chat-2'), ('emergency', 'emergency-1')]:
+        thread = threading.Thread(target=call, args=(call_type, name))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda n=len(threads): limiter.stats()['queued'] == n)
+
+    held.release()
+    for thread in threads:
+        thread.join()
+    print(f"Order: {order}")
+    return report('Emergency first, then chat in arrival order', order == ['emergency-1', 'chat-1', 'chat-2'])
+
+
+def test_timeout_and_queue_full():
+    """Waiting past max_wait or into a full queue raises OverloadedError"""
+    print("\n=== Test 2: Timeout and full queue ===")
+    limiter = PriorityLimiter(1, {'chat': {'priority': 1, 'max_wait': 0.2, 'max_queue': 1}})
+    held = limiter.acquire('chat')
+
+    errors = []
+
+    def waiter():
+        try:
+            limiter.acquire('chat')
+        except OverloadedError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    wait_until(lambda: limiter.stats()['queued'] == 1)
+    try:
+        limiter.acquire('chat')
+        queue_full = False
+    except OverloadedError as e:
+        queue_full = e.reason == 'queue full'
+    thread.join()
+    held.release()
+
+    stats = limiter.stats()
+    timed_out = len(errors) == 1 and errors[0].retry_after >= 1 and 'no slot' in errors[0].reason
+    ok = report('Second waiter rejected as queue full', queue_full)
+    ok = report('Queued waiter rejected after max_wait', timed_out) and ok
+    ok = report('Nothing left running or queued', stats['running'] == 0 and stats['queued'] == 0) and ok
+    return report('Rejections counted', stats['types']['chat']['rejected'] == 2) and ok
+
+
+def test_per_type_cap():
+    """A type at its own cap waits even when the shared limit has room"""
+    print("\n=== Test 3: Per-type cap ===")
+    limiter = PriorityLimiter(2, {
+        'vision': {'priority': 1, 'max_concurrency': 1, 'max_wait': 0.1},
+        'chat': {'priority': 1, 'max_wait': 0.1}
+    })
+    vision = limiter.acquire('vision')
+    try:
+        limiter.acquire('vision')
+        capped = False
+    except OverloadedError:
+        capped = True
+    chat = limiter.acquire('chat')
+    vision.release()
+    chat.release()
+    return report('Second vision call rejected, chat admitted', capped)
+
+
+def test_single_flight_error():
+    """Followers receive the leader's exception and nothing is cached"""
+    print("\n=== Test 4: SingleFlight leader error ===")
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    outcomes = []
+
+    def failing():
+        calls.append(1)
+        release.wait(2)
+        raise ValueError('upstream failed')
+
+    def caller():
+        try:
+            flight.do('key', failing, timeout=2)
+            outcomes.append('ok')
+        except ValueError as e:
+            outcomes.append(str(e))
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    threads[0].start()
+    wait_until(lambda: flight.in_flight('key'))
+    for thread in threads[1:]:
+        thread.start()
+    wait_until(lambda: flight.stats()['coalesced'] == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    ok = report('Function ran once', len(calls) == 1)
+    ok = report('All four callers saw the error', outcomes == ['upstream failed'] * 4) and ok
+    result, shared = flight.do('key', lambda: 'fresh')
+    return report('Next call runs again', result == 'fresh' and not shared and not flight.in_flight('key')) and ok
+
+
+def test_single_flight_follower_timeout():
+    """A follower gives up after its timeout while the leader keeps running"""
+    print("\n=== Test 5: SingleFlight follower timeout ===")
+    flight = SingleFlight()
+    release = threading.Event()
+    results = []
+
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', lambda: release.wait(2) and 'done')))
+    leader.start()
+    wait_until(lambda: flight.in_flight('key'))
+    try:
+        flight.do('key', lambda: 'unused', timeout=0.05)
+        timed_out = False
+    except TimeoutError:
+        timed_out = True
+    release.set()
+    leader.join()
+
+    ok = report('Follower timed out', timed_out and flight.stats()['timed_out'] == 1)
+    return report('Leader finished', results == [('done', False)]) and ok
+
+
+def test_rate_budget_refill():
+    """Tokens refill at per_day / 86400 per second up to burst"""
+    print("\n=== Test 6: RateBudget refill ===")
+    budget = RateBudget(per_day=86400 * 20, burst=2)  # 20 tokens a second
+    first = [budget.try_acquire() for _ in range(3)]
+    ok = report('Burst of two, then denied', first == [True, True, False])
+
+    time.sleep(0.12)
+    ok = report('Refilled after waiting', budget.try_acquire()) and ok
+    time.sleep(0.5)
+    ok = report('Capped at burst', budget.stats()['available'] <= 2) and ok
+
+    stop = threading.Event()
+    stop.set()
+    empty = RateBudget(per_day=1, burst=1)
+    empty.try_acquire()
+    ok = report('acquire() gives up when stopped', empty.acquire(stop) is False) and ok
+    started = time.monotonic()
+    ok = report('acquire() waits for a token', budget.acquire() and budget.acquire() and budget.acquire()
+                and time.monotonic() - started < 1) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING CONCURRENCY HELPERS")
+    print("=" * 70)
+    results = [
+        test_priority_ordering(),
+        test_timeout_and_queue_full(),
+        test_per_type_cap(),
+        test_single_flight_error(),
+        test_single_flight_follower_timeout(),
+        test_rate_budget_refill(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
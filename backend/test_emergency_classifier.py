@@ -0,0 +1,52 @@
+"""Test script for the offline emergency situation classifier"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.services.emergency_advisor import EmergencyAdvisor
+
+# (situation text, expected situation type or None when nothing should match)
+CASES = [
+    ("There was a landslide on the road near Joshimath", 'landslide'),
+    ("Landslides blocked the highway", 'landslide'),
+    ("It has been snowing all night and we are stuck", 'snow'),
+    ("My friend feels dizzy and breathless at Kedarnath", 'altitude_sickness'),
+    ("The river is flooding the campsite", 'flood'),
+    ("A bear was seen near the trail", 'wildlife'),
+    ("We were chased by a black bear", 'wildlife'),
+    ("Two leopards near the village", 'wildlife'),
+    ("रास्ते में भूस्खलन हुआ है", 'landslide'),
+    ("बर्फबारी में फंस गए हैं", 'snow'),
+    # Closed roads are landslides unless snow is the stated cause
+    ("Road closed due to snow near Auli", 'snow'),
+    ("The road is blocked by snow after Harsil", 'snow'),
+    ("बर्फ से रास्ता बंद है", 'snow'),
+    ("Road closed after the hill collapsed", 'landslide'),
+    # Negative cases: short keywords must not match inside other words
+    ("We need to board the bus to Haridwar", None),
+    ("I cannot bear the cold", None),
+    ("Our car broke down and the driver left", None),
+    ("Where can I find a bank in Nainital", None),
+    ("The snowboard shop is closed", None),
+]
+
+def test_classifier():
+    """Check every case and print mismatches"""
+    advisor = EmergencyAdvisor()
+    failures = 0
+    
+    for text, expected in CASES:
+        situation_type, score = advisor.classify(text)
+        status = "✅" if situation_type == expected else "❌"
+        if situation_type != expected:
+            failures += 1
+        print(f"{status} {text!r}: {situation_type} (score {score}), expected {expected}")
+    
+    print(f"\n{len(CASES) - failures}/{len(CASES)} cases passed")
+    return failures == 0
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING EMERGENCY CLASSIFIER")
+    print("=" * 70)
+    sys.exit(0 if test_classifier() else 1)
@@ -0,0 +1,75 @@
+"""Test script comparing GeoGrid coverage lookups with a brute-force scan"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+from app.utils.geo import GeoGrid, haversine_km
+
+
+def random_point(rng, wide):
+    if wide:
+        return rng.uniform(-89, 89), rng.uniform(-180, 180)
+    # Uttarakhand and surroundings
+    return rng.uniform(28.5, 31.5), rng.uniform(77.5, 81.0)
+
+
+def check(seed, wide, items=300, queries=500):
+    """Return the number of queries whose covering set differs from brute force"""
+    rng = random.Random(seed)
+    grid = GeoGrid(cell_degrees=0.5)
+    circles = []
+    for index in range(items):
+        lat, lon = random_point(rng, wide)
+        radius_km = rng.choice([0.5, 5, 25, 80, 300])
+        grid.insert(lat, lon, radius_km, index)
+        circles.append((lat, lon, radius_km))
+
+    mismatches = 0
+    for _ in range(queries):
+        lat, lon = random_point(rng, wide)
+        extra_km = rng.choice([0.0, 0.0, 10.0, 50.0])
+        found = {item: distance for item, distance in grid.covering(lat, lon, extra_km)}
+        expected = {
+            index for index, (item_lat, item_lon, radius_km) in enumerate(circles)
+            if haversine_km(lat, lon, item_lat, item_lon) <= radius_km + extra_km
+        }
+        distances_ok = all(
+            abs(distance - haversine_km(lat, lon, circles[item][0], circles[item][1])) < 1e-9
+            for item, distance in found.items()
+        )
+        if set(found) != expected or not distances_ok:
+            mismatches += 1
+    return mismatches
+
+
+def test_against_brute_force():
+    """Covering sets and distances match a scan over every item"""
+    results = []
+    for seed in range(8):
+        for wide in (False, True):
+            mismatches = check(seed, wide)
+            label = 'worldwide' if wide else 'Uttarakhand'
+            status = "✅" if mismatches == 0 else "❌"
+            print(f"{status} seed {seed} ({label}): {mismatches} mismatching queries")
+            results.append(mismatches == 0)
+    return all(results)
+
+
+def test_len_counts_items_once():
+    """An item spanning many cells is still one item"""
+    grid = GeoGrid(cell_degrees=0.1)
+    grid.insert(30.0, 79.0, 100, 'wide')
+    grid.insert(30.0, 79.0, 1, 'narrow')
+    ok = len(grid) == 2 and len(list(grid.covering(30.0, 79.0))) == 2
+    print(f"{'✅' if ok else '❌'} len() counts each item once, lookups yield each once")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING GEO GRID")
+    print("=" * 70)
+    results = [test_against_brute_force(), test_len_counts_items_once()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,61 @@
+"""Test script for chat history compaction"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.services.history_compactor import HistoryCompactor
+
+LONG_QUESTION = ("We are a family of four with two children under ten, travelling from Delhi in May. "
+                 "Which of Nainital, Mussoorie or Auli would you suggest for a relaxed five day trip?")
+
+
+def roles(messages):
+    return [message['role'] for message in messages]
+
+
+def alternates(messages):
+    return all(a['role'] != b['role'] for a, b in zip(messages, messages[1:]))
+
+
+def test_short_replies_kept():
+    """Repeated short answers to different questions all stay"""
+    print("\n=== Test 1: Short repeated replies ===")
+    history = [
+        {'role': 'user', 'content': 'Plan Kedarnath'},
+        {'role': 'assistant', 'content': 'Are you fine with the 16 km trek?'},
+        {'role': 'user', 'content': 'yes'},
+        {'role': 'assistant', 'content': 'Do you want a helicopter for the return?'},
+        {'role': 'user', 'content': 'yes'},
+    ]
+    _, recent = HistoryCompactor(None).compact(history)
+    print(f"Roles: {roles(recent)}")
+    ok = recent == history
+    print("✅ Nothing dropped" if ok else "❌ Short replies were dropped")
+    return ok
+
+
+def test_long_question_deduplicated():
+    """An earlier turn repeating a long question is dropped whole"""
+    print("\n=== Test 2: Repeated long question ===")
+    history = [
+        {'role': 'user', 'content': LONG_QUESTION},
+        {'role': 'assistant', 'content': 'Nainital suits families best.'},
+        {'role': 'user', 'content': 'ok'},
+        {'role': 'assistant', 'content': 'Anything else?'},
+        {'role': 'user', 'content': LONG_QUESTION},
+        {'role': 'assistant', 'content': 'Mussoorie is also a good choice.'},
+    ]
+    _, recent = HistoryCompactor(None).compact(history)
+    print(f"Roles: {roles(recent)}")
+    ok = recent == history[2:] and alternates(recent)
+    print("✅ Earlier turn dropped, roles alternate" if ok else "❌ Unexpected result")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING CHAT HISTORY COMPACTION")
+    print("=" * 70)
+    results = [test_short_replies_kept(), test_long_question_deduplicated()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,91 @@
+"""Test script for invariants of the local itinerary planner"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+from app.services.itinerary_planner import ItineraryPlanner
+
+# The itinerary route rejects budgets below this per day
+MIN_BUDGET_PER_DAY = 1900
+
+INTERESTS = ['temples', 'trekking', 'wildlife safari', 'nature', 'adventure', 'rafting', 'yoga',
+             'hill stations', 'lakes', 'snow', 'photography', 'culture', 'family', 'Kedarnath']
+STARTS = ['Dehradun', 'Rishikesh', 'Haridwar', 'Nainital', 'Mussoorie', 'Joshimath', 'Atlantis']
+LANGUAGES = ['english', 'hindi', 'garhwali', 'kumaoni']
+
+
+def random_preferences(rng):
+    duration = rng.randint(1, 30)
+    return {
+        'duration': duration,
+        'budget': rng.randint(MIN_BUDGET_PER_DAY * duration, 20000 * duration),
+        'interests': rng.sample(INTERESTS, rng.randint(1, 3)),
+        'start_location': rng.choice(STARTS),
+        'travel_style': rng.choice(list(ItineraryPlanner.STYLES)),
+        'accommodation_type': rng.choice(list(ItineraryPlanner.ACCOMMODATION_FACTORS)),
+        'transport_mode': rng.choice(list(ItineraryPlanner.TRANSPORT))
+    }
+
+
+def problems(itinerary, preferences, language):
+    """Invariant violations for one plan"""
+    found = []
+    if len(itinerary['days']) != preferences['duration']:
+        found.append(f"{len(itinerary['days'])} days for a {preferences['duration']}-day trip")
+    if itinerary['total_estimated_cost'] > preferences['budget']:
+        found.append(f"cost ₹{itinerary['total_estimated_cost']} over budget ₹{preferences['budget']}")
+    if sum(day['total_cost'] for day in itinerary['days']) + itinerary['budget_breakdown']['miscellaneous'] \
+            != itinerary['total_estimated_cost']:
+        found.append('day totals do not add up to the estimated cost')
+    if sum(itinerary['budget_breakdown'].values()) != itinerary['total_estimated_cost']:
+        found.append('budget breakdown does not add up to the estimated cost')
+    if [day['day'] for day in itinerary['days']] != list(range(1, preferences['duration'] + 1)):
+        found.append('days are not numbered 1..duration')
+    if any(not day['places'] for day in itinerary['days']):
+        found.append('a day has nothing planned')
+    if itinerary['route'][0] != itinerary['route'][-1]:
+        found.append('the route does not return to its start')
+    if itinerary['language'] != language:
+        found.append(f"language {itinerary['language']}, expected {language}")
+    return found
+
+
+def test_random_requests(count=1500):
+    """Every valid request fits its duration and budget"""
+    print(f"\n=== Test 1: {count} random valid requests ===")
+    planner = ItineraryPlanner.from_sources()
+    rng = random.Random(25)
+    failures = 0
+    for _ in range(count):
+        preferences = random_preferences(rng)
+        language = rng.choice(LANGUAGES)
+        found = problems(planner.plan(preferences, language), preferences, language)
+        if found:
+            failures += 1
+            if failures <= 5:
+                print(f"❌ {preferences}: {'; '.join(found)}")
+    print(f"{'✅' if failures == 0 else '❌'} {count - failures}/{count} plans kept every invariant")
+    return failures == 0
+
+
+def test_deterministic():
+    """The same request always gives the same plan"""
+    print("\n=== Test 2: Deterministic plans ===")
+    planner = ItineraryPlanner.from_sources()
+    preferences = {'duration': 5, 'budget': 40000, 'interests': ['temples', 'trekking'], 'start_location': 'Rishikesh'}
+    first, second = planner.plan(preferences), planner.plan(preferences)
+    first.pop('planning_ms')
+    second.pop('planning_ms')
+    ok = first == second
+    print("✅ Identical plans" if ok else "❌ Plans differ")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING ITINERARY PLANNER")
+    print("=" * 70)
+    results = [test_random_requests(), test_deterministic()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,68 @@
+"""Test script comparing KDTree nearest-neighbour queries with a brute-force scan"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+from app.utils.geo import KDTree, haversine_km
+
+
+def check(seed, count, wide, queries=300):
+    """Return the number of queries whose k nearest differ from brute force"""
+    rng = random.Random(seed)
+
+    def point():
+        if wide:
+            return rng.uniform(-89, 89), rng.uniform(-180, 180)
+        return rng.uniform(28.5, 31.5), rng.uniform(77.5, 81.0)
+
+    points = [point() + (index,) for index in range(count)]
+    tree = KDTree(points)
+
+    mismatches = 0
+    for _ in range(queries):
+        lat, lon = point()
+        k = rng.choice([1, 3, 10])
+        found = tree.nearest(lat, lon, k)
+        expected = sorted(haversine_km(lat, lon, p_lat, p_lon) for p_lat, p_lon, _ in points)[:k]
+        distances = [distance for _, distance in found]
+        ok = (
+            len(found) == min(k, count)
+            and all(abs(a - b) < 1e-6 for a, b in zip(distances, expected))
+            and all(abs(distance - haversine_km(lat, lon, points[item][0], points[item][1])) < 1e-6
+                    for item, distance in found)
+        )
+        if not ok:
+            mismatches += 1
+    return mismatches
+
+
+def test_against_brute_force():
+    """k nearest items and their distances match a full scan"""
+    results = []
+    for seed, count, wide in [(0, 1, False), (1, 7, False), (2, 200, False), (3, 1000, False),
+                              (4, 500, True), (5, 2000, True)]:
+        mismatches = check(seed, count, wide)
+        label = 'worldwide' if wide else 'Uttarakhand'
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"{status} {count} points ({label}): {mismatches} mismatching queries")
+        results.append(mismatches == 0)
+    return all(results)
+
+
+def test_antimeridian_and_edges():
+    """Neighbours across 180° are found; empty trees and k <= 0 return nothing"""
+    tree = KDTree([(0.0, 179.9, 'east'), (0.0, -179.9, 'west'), (0.0, 170.0, 'far')])
+    nearest = [item for item, _ in tree.nearest(0.0, -179.95, 2)]
+    ok = nearest == ['west', 'east'] and KDTree([]).nearest(30, 79) == [] and tree.nearest(0, 0, 0) == []
+    print(f"{'✅' if ok else '❌'} Antimeridian and empty cases")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING K-D TREE")
+    print("=" * 70)
+    results = [test_against_brute_force(), test_antimeridian_and_edges()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,101 @@
+"""Test script comparing indexed PlaceMatcher results with the original full scan"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+import string
+from difflib import SequenceMatcher
+from app.services.place_matcher import PlaceMatcher
+
+
+def reference_match(places, recognized_name, description="", keywords=None):
+    """The matcher before indexing: score every place, first best in table order wins"""
+    if not recognized_name:
+        return None
+    name = recognized_name.lower().strip()
+    if name in places:
+        return places[name]['name']
+    for place_data in places.values():
+        for alias in place_data.get('aliases', []):
+            if alias.lower() in name or name in alias.lower():
+                return place_data['name']
+
+    best_match, best_score = None, 0
+    for place_data in places.values():
+        score = SequenceMatcher(None, name, place_data['name'].lower()).ratio()
+        for alias in place_data.get('aliases', []):
+            score = max(score, SequenceMatcher(None, name, alias.lower()).ratio())
+        if keywords:
+            score += sum(
+                1 for kw in keywords
+                if any(pk in kw.lower() for pk in place_data.get('keywords', []))
+            ) * 0.1
+        if description:
+            desc_lower = description.lower()
+            score += sum(1 for pk in place_data.get('keywords', []) if pk in desc_lower) * 0.05
+        if score > best_score:
+            best_score, best_match = score, place_data
+    return best_match['name'] if best_score >= 0.6 else None
+
+
+def misspell(rng, text):
+    """Drop, swap, replace or insert a few characters"""
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        op = rng.choice('dsri')
+        i = rng.randrange(len(chars)) if chars else 0
+        if op == 'd' and len(chars) > 1:
+            del chars[i]
+        elif op == 's' and len(chars) > 1:
+            j = rng.randrange(len(chars))
+            chars[i], chars[j] = chars[j], chars[i]
+        elif op == 'r' and chars:
+            chars[i] = rng.choice(string.ascii_lowercase)
+        else:
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+    return ''.join(chars)
+
+
+def test_matches_full_scan(count=5000):
+    """Indexed matching returns exactly what the full scan returned"""
+    print(f"\n=== Test 1: {count} queries against the full scan ===")
+    matcher = PlaceMatcher()
+    places = PlaceMatcher.KNOWN_PLACES
+    terms = [term for place in places.values() for term in [place['name']] + place.get('aliases', [])]
+    place_keywords = [pk for place in places.values() for pk in place.get('keywords', [])]
+    rng = random.Random(4)
+
+    queries = [('hkeard', '', None), ('laisvanxi', '', None)]
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            name = misspell(rng, rng.choice(terms).lower())
+        elif kind < 0.8:
+            name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 12)))
+        else:
+            name = rng.choice(terms)
+        keywords = rng.sample(place_keywords, rng.randint(1, 3)) if rng.random() < 0.3 else None
+        description = ' '.join(rng.sample(place_keywords, 2)) if rng.random() < 0.2 else ''
+        queries.append((name, description, keywords))
+
+    differences = 0
+    for name, description, keywords in queries:
+        matched = matcher.match_place(name, description, keywords)
+        got = matched['name'] if matched else None
+        expected = reference_match(places, name, description, keywords)
+        if got != expected:
+            differences += 1
+            if differences <= 5:
+                print(f"❌ {name!r}: {got}, expected {expected}")
+    print(f"{'✅' if differences == 0 else '❌'} {len(queries) - differences}/{len(queries)} queries match")
+    return differences == 0
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING PLACE MATCHER")
+    print("=" * 70)
+    results = [test_matches_full_scan()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,80 @@
+"""Test script for packed batch translation against a stubbed Gemini service"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import json
+from app.services.translation_service import TranslationService
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FailingGemini:
+    """Every call raises, as during an upstream outage"""
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_content(self, call_type, prompt, **kwargs):
+        self.calls += 1
+        raise RuntimeError('upstream unavailable')
+
+
+class DroppingGemini:
+    """Answers every call but leaves the last item of each packed prompt out"""
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_content(self, call_type, prompt, **kwargs):
+        self.calls += 1
+        items = json.loads(prompt[prompt.index('['):prompt.rindex(']') + 1])
+        kept = items[:-1] if len(items) > 1 else items
+        return StubResponse(json.dumps({str(item['id']): f"T:{item['text']}" for item in kept}))
+
+
+def make_service(gemini):
+    service = TranslationService.__new__(TranslationService)
+    service.gemini_service = gemini
+    service.supported_languages = {'english': 'English', 'hindi': 'Hindi'}
+    service.memory = None
+    return service
+
+
+def test_failing_upstream():
+    """A failing call must not be split and retried"""
+    print("\n=== Test 1: Failing upstream (200 strings) ===")
+    gemini = FailingGemini()
+    texts = [f"String number {i}" for i in range(200)]
+    result = make_service(gemini).translate_batch(texts, 'english', 'hindi')
+    
+    chunks = len(TranslationService._pack(texts))
+    print(f"Upstream calls: {gemini.calls} (chunks: {chunks})")
+    print(f"Failed: {len(result['failed'])}/{len(texts)}")
+    ok = gemini.calls == chunks and len(result['failed']) == len(texts) and result['translations'] == texts
+    print("✅ One call per chunk" if ok else "❌ Failed chunks were retried")
+    return ok
+
+
+def test_missing_items_split():
+    """Items left out of a parsed reply are retried in smaller calls"""
+    print("\n=== Test 2: Reply missing items ===")
+    gemini = DroppingGemini()
+    texts = [f"Place {i}" for i in range(10)]
+    result = make_service(gemini).translate_batch(texts, 'english', 'hindi')
+    
+    print(f"Upstream calls: {gemini.calls}")
+    print(f"Failed: {result['failed']}")
+    ok = gemini.calls > 1 and not result['failed'] and result['translations'][9] == 'T:Place 9'
+    print("✅ Missing items recovered" if ok else "❌ Missing items not recovered")
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING BATCH TRANSLATION")
+    print("=" * 70)
+    results = [test_failing_upstream(), test_missing_items_split()]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,71 @@
+"""Test script for the perceptual-hash vision result cache"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import random
+from app.services.image_cache import BKTree, VisionResultCache, hamming_distance
+
+
+def report(name, ok):
+    print(f"{'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def test_bk_tree_against_brute_force():
+    """BK-tree search returns exactly the hashes a full scan finds"""
+    print("\n=== Test 1: BK-tree vs brute force ===")
+    rng = random.Random(7)
+    hashes = list({rng.getrandbits(64) for _ in range(500)})
+    tree = BKTree()
+    for value in hashes:
+        tree.add(value, value)
+
+    ok = True
+    for _ in range(200):
+        query = rng.choice(hashes) ^ rng.getrandbits(64) & rng.getrandbits(64) & rng.getrandbits(64)
+        found = sorted(item for _, item in tree.search(query, 12))
+        expected = sorted(value for value in hashes if hamming_distance(query, value) <= 12)
+        if found != expected:
+            ok = False
+    return report('200 random queries match the full scan', ok)
+
+
+def test_replaced_hash():
+    """Storing the same hash again replaces the entry instead of adding one"""
+    print("\n=== Test 2: Replacing a hash ===")
+    cache = VisionResultCache(max_distance=2, max_entries=3)
+    for n in range(5):
+        cache.store(0b1010, 'english', 'multi', {'n': n})
+    ok = report('one entry per hash', cache.stats()['entries'] == 1)
+
+    cache.store(0xF0, 'english', 'multi', {'n': 'b'})
+    cache.store(0xF000, 'english', 'multi', {'n': 'c'})
+    ok = report('replaced entries do not take up room', cache.stats()['entries'] == 3) and ok
+    ok = report('latest result is served', cache.lookup(0b1010, 'english', 'multi')['n'] == 4) and ok
+    ok = report('other hashes are not evicted', cache.lookup(0xF0, 'english', 'multi') is not None) and ok
+    return ok
+
+
+def test_expired_entries_dropped():
+    """A lookup that finds an expired entry removes it"""
+    print("\n=== Test 3: Expired entries ===")
+    cache = VisionResultCache(max_distance=2, ttl=-1)
+    cache.store(0b1010, 'english', 'multi', {'n': 1})
+
+    ok = report('expired entry is a miss', cache.lookup(0b1010, 'english', 'multi') is None)
+    ok = report('expired entry is removed', cache.stats()['entries'] == 0) and ok
+    return ok
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("TESTING VISION RESULT CACHE")
+    print("=" * 70)
+    results = [
+        test_bk_tree_against_brute_force(),
+        test_replaced_hash(),
+        test_expired_entries_dropped(),
+    ]
+    print(f"\n{sum(results)}/{len(results)} tests passed")
+    sys.exit(0 if all(results) else 1)
@@ -65,31 +65,21 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ language }) => {
     // Update conversation history
     conversationHistoryRef.current.push({ role: 'user', content: text });
 
-    // Save user message to history (if authenticated)
+    // Signed-in users send only the new message; the server keeps the session's
+    // context and saves both sides of the turn
     const token = localStorage.getItem('authToken');
-    if (token) {
-      try {
-        const saveResult = await saveMessage({
-          session_id: sessionId,
-          role: 'user',
-          content: text,
-          metadata: { language }
-        });
-        if (saveResult.success && saveResult.data?.message?._id) {
-          messageIdsRef.current.set(userMessage.id, saveResult.data.message._id);
-        }
-      } catch (error) {
-        console.error('Failed to save user message:', error);
-      }
-    }
 
     try {
       const startTime = Date.now();
       const response = await sendChatMessage(
         text,
         language,
-        conversationHistoryRef.current
+        conversationHistoryRef.current,
+        sessionId
       );
+      if (response.message_ids?.user) {
+        messageIdsRef.current.set(userMessage.id, response.message_ids.user);
+      }
 
       if (response.success && response.response) {
         const responseTime = (Date.now() - startTime) / 1000;
@@ -107,9 +97,20 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ language }) => {
           content: response.response
         });
 
-        // Save assistant message to history (if authenticated)
-        if (token) {
+        if (response.message_ids?.assistant) {
+          messageIdsRef.current.set(assistantMessage.id, response.message_ids.assistant);
+        } else if (token && !response.message_ids) {
+          // Server could not use session mode; save both messages the old way
           try {
+            const userSave = await saveMessage({
+              session_id: sessionId,
+              role: 'user',
+              content: text,
+              metadata: { language }
+            });
+            if (userSave.success && userSave.data?.message?._id) {
+              messageIdsRef.current.set(userMessage.id, userSave.data.message._id);
+            }
             const saveResult = await saveMessage({
               session_id: sessionId,
               role: 'assistant',
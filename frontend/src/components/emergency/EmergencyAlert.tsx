@@ -4,7 +4,10 @@ import ReactMarkdown from 'react-markdown';
 import {
   getEmergencyContacts,
   getEmergencyAdvice,
+  getEnrichedEmergencyAdvice,
   getAlerts,
+  subscribeToAlerts,
+  type EmergencyAdviceEnrichment,
   type EmergencyContact,
   type TravelAlert
 } from '../../services/api';
@@ -23,6 +26,39 @@ const EmergencyAlert: React.FC = () => {
     loadData();
   }, []);
 
+  // Add the nearest police stations, hospitals, SDRF posts and helipads when location is allowed
+  useEffect(() => {
+    if (!navigator.geolocation) return;
+    navigator.geolocation.getCurrentPosition(
+      async (position) => {
+        try {
+          const response = await getEmergencyContacts({
+            lat: position.coords.latitude,
+            lon: position.coords.longitude,
+          });
+          if (response.success) {
+            setContacts(response.contacts || []);
+          }
+        } catch (err) {
+          console.error(err);
+        }
+      },
+      () => undefined,
+      { maximumAge: 10 * 60 * 1000, timeout: 10000 }
+    );
+  }, []);
+
+  // Live updates replace polling; the stream opens with a full snapshot
+  useEffect(() => {
+    return subscribeToAlerts({
+      onSnapshot: (snapshot) => setAlerts(snapshot),
+      onAlert: (alert) =>
+        setAlerts((current) => [alert, ...current.filter((existing) => existing.id !== alert.id)]),
+      onWithdrawn: (alertId) =>
+        setAlerts((current) => current.filter((existing) => existing.id !== alertId)),
+    });
+  }, []);
+
   const loadData = async () => {
     setIsLoading(true);
     setError(null);
@@ -34,7 +70,9 @@ const EmergencyAlert: React.FC = () => {
       ]);
 
       if (contactsRes.success) {
-        setContacts(contactsRes.contacts || []);
+        // Statewide numbers until the position is known (keep nearest results if they arrived first)
+        const statewide = (contactsRes.contacts || []).filter((contact) => !contact.district);
+        setContacts((current) => (current.length ? current : statewide));
       }
 
       if (alertsRes.success) {
@@ -48,6 +86,22 @@ const EmergencyAlert: React.FC = () => {
     }
   };
 
+  // Local advice is shown at once; AI advice for unrecognised situations is appended when ready
+  const pollEnrichedAdvice = async (localAdvice: string, enrichment: EmergencyAdviceEnrichment) => {
+    let current = enrichment;
+    for (let attempt = 0; attempt < 10 && current.status === 'pending'; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 3000));
+      try {
+        current = await getEnrichedEmergencyAdvice(current.id);
+      } catch {
+        return;
+      }
+    }
+    if (current.status === 'ready' && current.advice) {
+      setAdvice((shown) => (shown === localAdvice ? `${localAdvice}\n\n---\n\n${current.advice}` : shown));
+    }
+  };
+
   const handleGetAdvice = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!situation.trim()) return;
@@ -59,6 +113,9 @@ const EmergencyAlert: React.FC = () => {
       const response = await getEmergencyAdvice(situation, location);
       if (response.success && response.advice) {
         setAdvice(response.advice);
+        if (response.enrichment) {
+          pollEnrichedAdvice(response.advice, response.enrichment);
+        }
       } else {
         throw new Error(response.message || 'Failed to get advice');
       }
@@ -138,6 +195,9 @@ const EmergencyAlert: React.FC = () => {
               <div className="mb-3">
                 <h4 className="font-bold text-stone-800 text-base mb-1">{contact.name}</h4>
                 <p className="text-sm text-stone-600">{contact.description}</p>
+                {contact.distance_km !== undefined && (
+                  <p className="text-xs font-semibold text-emerald-700 mt-1">{contact.distance_km} km away</p>
+                )}
               </div>
               <a
                 href={`tel:${contact.number}`}
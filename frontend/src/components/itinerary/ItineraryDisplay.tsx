@@ -7,17 +7,21 @@ import {
   Hotel,
   Utensils,
   Luggage,
-  Lightbulb
+  Lightbulb,
+  Car
 } from 'lucide-react';
-import type { Itinerary } from '../../services/api';
+import type { Itinerary, ItineraryNarrative } from '../../services/api';
 import { formatCurrency } from '../../utils/helpers';
 
 interface ItineraryDisplayProps {
   itinerary: Itinerary;
+  narrative?: ItineraryNarrative['narrative'] | null;
 }
 
-const ItineraryDisplay: React.FC<ItineraryDisplayProps> = ({ itinerary }) => {
-  const totalCost = itinerary.days.reduce((sum, day) => sum + day.total_cost, 0);
+const ItineraryDisplay: React.FC<ItineraryDisplayProps> = ({ itinerary, narrative }) => {
+  const totalCost =
+    itinerary.total_estimated_cost ?? itinerary.days.reduce((sum, day) => sum + day.total_cost, 0);
+  const daySummary = (day: number) => narrative?.days.find((entry) => entry.day === day)?.summary;
 
   return (
     <div className="space-y-6">
@@ -38,6 +42,13 @@ const ItineraryDisplay: React.FC<ItineraryDisplayProps> = ({ itinerary }) => {
             <p className="text-2xl font-bold">{itinerary.duration} Days</p>
           </div>
         </div>
+        {itinerary.route && itinerary.route.length > 1 && (
+          <p className="mt-4 text-sm text-blue-100">
+            {itinerary.route.join(' → ')}
+            {itinerary.total_distance_km ? ` · about ${itinerary.total_distance_km} km by road` : ''}
+          </p>
+        )}
+        {narrative?.overview && <p className="mt-4 text-white/90">{narrative.overview}</p>}
       </div>
 
       {/* Days */}
@@ -66,6 +77,10 @@ const ItineraryDisplay: React.FC<ItineraryDisplayProps> = ({ itinerary }) => {
             </div>
 
             <div className="p-6 space-y-4">
+              {daySummary(day.day) && (
+                <p className="text-gray-700 italic">{daySummary(day.day)}</p>
+              )}
+
               {/* Places */}
               {day.places && day.places.length > 0 && (
                 <div>
@@ -120,6 +135,22 @@ const ItineraryDisplay: React.FC<ItineraryDisplayProps> = ({ itinerary }) => {
                 </div>
               )}
 
+              {/* Transport */}
+              {day.transport && (
+                <div className="p-4 bg-gray-50 rounded-lg border border-gray-200">
+                  <div className="flex items-center justify-between">
+                    <div className="flex items-center gap-2">
+                      <Car className="w-5 h-5 text-gray-600" />
+                      <div>
+                        <p className="font-medium text-gray-800">{day.transport.description}</p>
+                        <p className="text-sm text-gray-600">Transport</p>
+                      </div>
+                    </div>
+                    <p className="font-bold text-gray-700">{formatCurrency(day.transport.cost)}</p>
+                  </div>
+                </div>
+              )}
+
               {/* Meals */}
               {day.meals && (
                 <div className="p-4 bg-green-50 rounded-lg border border-green-200">
@@ -1,6 +1,12 @@
 import React, { useState } from 'react';
 import { Loader2, Calendar, DollarSign, MapPin, Heart } from 'lucide-react';
-import { generateItinerary, getItinerarySuggestions, type ItineraryPreferences } from '../../services/api';
+import {
+  generateItinerary,
+  getItineraryNarrative,
+  getItinerarySuggestions,
+  type ItineraryNarrative,
+  type ItineraryPreferences
+} from '../../services/api';
 import ItineraryDisplay from './ItineraryDisplay';
 import type { Itinerary } from '../../services/api';
 
@@ -12,6 +18,7 @@ const ItineraryForm: React.FC = () => {
   const [travelStyle, setTravelStyle] = useState('moderate');
   const [isGenerating, setIsGenerating] = useState(false);
   const [itinerary, setItinerary] = useState<Itinerary | null>(null);
+  const [narrative, setNarrative] = useState<ItineraryNarrative['narrative'] | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [suggestions, setSuggestions] = useState<any>(null);
 
@@ -74,6 +81,22 @@ const ItineraryForm: React.FC = () => {
     setInterests([suggestion.description]);
   };
 
+  // The plan is shown at once; the AI-written narrative is added when ready
+  const pollNarrative = async (pending: ItineraryNarrative) => {
+    let current = pending;
+    for (let attempt = 0; attempt < 10 && current.status === 'pending'; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 3000));
+      try {
+        current = await getItineraryNarrative(current.id);
+      } catch {
+        return;
+      }
+    }
+    if (current.status === 'ready' && current.narrative) {
+      setNarrative(current.narrative);
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (interests.length === 0) {
@@ -84,6 +107,7 @@ const ItineraryForm: React.FC = () => {
     setIsGenerating(true);
     setError(null);
     setItinerary(null);
+    setNarrative(null);
 
     try {
       const preferences: ItineraryPreferences = {
@@ -98,6 +122,9 @@ const ItineraryForm: React.FC = () => {
       const response = await generateItinerary(preferences);
       if (response.success && response.itinerary) {
         setItinerary(response.itinerary);
+        if (response.narrative) {
+          pollNarrative(response.narrative);
+        }
       } else {
         throw new Error(response.message || 'Failed to generate itinerary');
       }
@@ -118,13 +145,14 @@ const ItineraryForm: React.FC = () => {
         <button
           onClick={() => {
             setItinerary(null);
+            setNarrative(null);
             setError(null);
           }}
           className="mb-4 px-4 py-2 bg-gray-200 text-gray-700 rounded-lg hover:bg-gray-300 transition-colors"
         >
           ← Back to Form
         </button>
-        <ItineraryDisplay itinerary={itinerary} />
+        <ItineraryDisplay itinerary={itinerary} narrative={narrative} />
       </div>
     );
   }
@@ -31,6 +31,8 @@ export interface ActivityHistoryResponse {
     count: number;
     limit: number;
     skip: number;
+    next_cursor?: string | null;
+    has_more?: boolean;
     filters?: {
       service_type?: string;
       days?: string;
@@ -71,6 +73,7 @@ class ActivityService {
   async getHistory(params?: {
     limit?: number;
     skip?: number;
+    cursor?: string;
     service_type?: string;
     days?: number;
   }): Promise<ActivityHistoryResponse> {
@@ -78,6 +81,7 @@ class ActivityService {
     
     if (params?.limit) queryParams.append('limit', params.limit.toString());
     if (params?.skip) queryParams.append('skip', params.skip.toString());
+    if (params?.cursor) queryParams.append('cursor', params.cursor);
     if (params?.service_type) queryParams.append('service_type', params.service_type);
     if (params?.days) queryParams.append('days', params.days.toString());
     
@@ -18,21 +18,31 @@ async function handleResponse<T>(response: Response): Promise<T> {
 
 // ==================== Chat API ====================
 
+/**
+ * Send a chat message. Signed-in callers that pass a sessionId send only the
+ * new message: the server assembles context from the stored session and saves
+ * both the message and the reply.
+ */
 export async function sendChatMessage(
   message: string,
   language: Language = 'english',
-  conversationHistory?: ConversationHistory[]
+  conversationHistory?: ConversationHistory[],
+  sessionId?: string
 ): Promise<ChatResponse> {
+  const token = localStorage.getItem('authToken');
+  const useSession = Boolean(token && sessionId);
+
   const response = await fetch(`${API_BASE_URL}/chat/message`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
+      ...(token ? { 'Authorization': `Bearer ${token}` } : {})
     },
-    body: JSON.stringify({
-      message,
-      language,
-      conversation_history: conversationHistory || []
-    }),
+    body: JSON.stringify(
+      useSession
+        ? { message, language, session_id: sessionId }
+        : { message, language, conversation_history: conversationHistory || [] }
+    ),
   });
 
   return handleResponse<ChatResponse>(response);
@@ -128,6 +138,7 @@ export interface ItineraryDay {
     time: string;
     description: string;
     cost: number;
+    kind?: 'visit' | 'travel' | 'free';
   }>;
   accommodation: {
     name: string;
@@ -138,6 +149,10 @@ export interface ItineraryDay {
     lunch: number;
     dinner: number;
   };
+  transport?: {
+    description: string;
+    cost: number;
+  };
   total_cost: number;
 }
 
@@ -147,11 +162,28 @@ export interface Itinerary {
   days: ItineraryDay[];
   packing_list?: string[];
   travel_tips?: string[];
+  total_estimated_cost?: number;
+  budget_breakdown?: Record<string, number>;
+  route?: string[];
+  total_distance_km?: number;
+  tier?: string;
+  source?: 'local';
+}
+
+export interface ItineraryNarrative {
+  id: string;
+  status: 'ready' | 'pending' | 'unavailable';
+  narrative?: {
+    overview: string;
+    days: { day: number; summary: string }[];
+  };
+  generated_at?: number;
 }
 
 export interface ItineraryResponse {
   success: boolean;
   itinerary: Itinerary;
+  narrative?: ItineraryNarrative;
   language?: string;
   message?: string;
 }
@@ -170,6 +202,15 @@ export async function generateItinerary(
   return handleResponse<ItineraryResponse>(response);
 }
 
+export async function getItineraryNarrative(
+  narrativeId: string
+): Promise<ItineraryNarrative & { success: boolean }> {
+  const response = await fetch(
+    `${API_BASE_URL}/itinerary/narrative/${encodeURIComponent(narrativeId)}`
+  );
+  return handleResponse(response);
+}
+
 export async function getItinerarySuggestions() {
   const response = await fetch(`${API_BASE_URL}/itinerary/suggestions`);
   return handleResponse(response);
@@ -181,6 +222,11 @@ export interface EmergencyContact {
   name: string;
   number: string;
   description: string;
+  category?: string;
+  district?: string;
+  lat?: number;
+  lon?: number;
+  distance_km?: number;
 }
 
 export interface WeatherData {
@@ -203,20 +249,38 @@ export interface WeatherResponse {
   message?: string;
 }
 
+export interface EmergencyAdviceEnrichment {
+  id: string;
+  status: 'ready' | 'pending' | 'unavailable';
+  advice?: string;
+  generated_at?: number;
+}
+
 export interface EmergencyAdviceResponse {
   success: boolean;
   advice: string;
+  steps?: string[];
+  contacts?: { number: string; name: string }[];
+  situation_type?: string;
+  matched?: boolean;
+  confidence?: 'high' | 'medium' | 'low';
+  source?: 'local';
+  enrichment?: EmergencyAdviceEnrichment;
   language?: string;
   message?: string;
 }
 
 export interface TravelAlert {
-  id: number;
+  id: string;
   type: string;
   severity: 'low' | 'moderate' | 'high';
   title: string;
   message: string;
   location: string;
+  lat: number;
+  lon: number;
+  radius_km: number;
+  distance_km?: number;
   valid_until: string;
 }
 
@@ -240,12 +304,33 @@ export async function getEmergencyAdvice(
   return handleResponse<EmergencyAdviceResponse>(response);
 }
 
-export async function getEmergencyContacts(): Promise<{
+export async function getEnrichedEmergencyAdvice(
+  enrichmentId: string
+): Promise<EmergencyAdviceEnrichment & { success: boolean }> {
+  const response = await fetch(
+    `${API_BASE_URL}/emergency/advice/enriched/${encodeURIComponent(enrichmentId)}`
+  );
+  return handleResponse(response);
+}
+
+export async function getEmergencyContacts(options: {
+  category?: string;
+  district?: string;
+  location?: string;
+  lat?: number;
+  lon?: number;
+  k?: number;
+} = {}): Promise<{
   success: boolean;
   contacts: EmergencyContact[];
   count: number;
 }> {
-  const response = await fetch(`${API_BASE_URL}/emergency/contacts`);
+  const params = new URLSearchParams();
+  Object.entries(options).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') params.set(key, String(value));
+  });
+  const query = params.toString();
+  const response = await fetch(`${API_BASE_URL}/emergency/contacts${query ? `?${query}` : ''}`);
   return handleResponse(response);
 }
 
@@ -256,18 +341,93 @@ export async function getWeather(location: string): Promise<WeatherResponse> {
   return handleResponse<WeatherResponse>(response);
 }
 
-export async function getAlerts(location?: string): Promise<{
+export interface AlertRegion {
+  lat: number;
+  lon: number;
+  radiusKm?: number;
+}
+
+function alertQuery(location?: string, coords?: AlertRegion): string {
+  const params = new URLSearchParams();
+  if (location) params.set('location', location);
+  if (coords) {
+    params.set('lat', String(coords.lat));
+    params.set('lon', String(coords.lon));
+    if (coords.radiusKm !== undefined) params.set('radius_km', String(coords.radiusKm));
+  }
+  const query = params.toString();
+  return query ? `?${query}` : '';
+}
+
+export async function getAlerts(
+  location?: string,
+  coords?: AlertRegion
+): Promise<{
   success: boolean;
   alerts: TravelAlert[];
   count: number;
+  center?: { lat: number; lon: number };
 }> {
-  const url = location
-    ? `${API_BASE_URL}/emergency/alerts?location=${encodeURIComponent(location)}`
-    : `${API_BASE_URL}/emergency/alerts`;
-  const response = await fetch(url);
+  const response = await fetch(`${API_BASE_URL}/emergency/alerts${alertQuery(location, coords)}`);
   return handleResponse(response);
 }
 
+export interface AlertStreamHandlers {
+  onSnapshot: (alerts: TravelAlert[]) => void;
+  onAlert: (alert: TravelAlert) => void;
+  onWithdrawn: (alertId: string) => void;
+}
+
+const ALERT_RETRY_MS = 5000;
+const ALERT_RETRY_MAX_MS = 60000;
+
+/**
+ * Receive travel alerts for a region as they are published.
+ * The browser retries dropped connections itself; if it gives up (the stream
+ * answered with an error status), we open a new one with backoff.
+ * Each connection starts with a snapshot.
+ * Returns a function that closes the subscription.
+ */
+export function subscribeToAlerts(
+  handlers: AlertStreamHandlers,
+  location?: string,
+  coords?: AlertRegion
+): () => void {
+  const url = `${API_BASE_URL}/emergency/alerts/stream${alertQuery(location, coords)}`;
+  let source: EventSource | null = null;
+  let retryTimer: ReturnType<typeof setTimeout> | undefined;
+  let retryMs = ALERT_RETRY_MS;
+  let closed = false;
+
+  const connect = () => {
+    const stream = new EventSource(url);
+    source = stream;
+    stream.addEventListener('snapshot', (event) => {
+      retryMs = ALERT_RETRY_MS;
+      handlers.onSnapshot(JSON.parse((event as MessageEvent).data).alerts || []);
+    });
+    stream.addEventListener('alert', (event) => {
+      handlers.onAlert(JSON.parse((event as MessageEvent).data));
+    });
+    stream.addEventListener('withdrawn', (event) => {
+      handlers.onWithdrawn(JSON.parse((event as MessageEvent).data).id);
+    });
+    stream.onerror = () => {
+      if (closed || stream.readyState !== EventSource.CLOSED) return;
+      stream.close();
+      retryTimer = setTimeout(connect, retryMs);
+      retryMs = Math.min(retryMs * 2, ALERT_RETRY_MAX_MS);
+    };
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(retryTimer);
+    source?.close();
+  };
+}
+
 // ==================== Auth API ====================
 
 export interface SignupData {
@@ -22,6 +22,12 @@ export interface ChatResponse {
   response?: string;
   message?: string;
   language?: string;
+  cached?: boolean;
+  session_id?: string;
+  message_ids?: {
+    user: string;
+    assistant: string | null;
+  };
 }
 
 export interface TranslationRequest {